@@ -6,6 +6,7 @@ Multi-bank campaign performance analysis and reporting tool
 
 import streamlit as st
 import pandas as pd
+from concurrent.futures import as_completed
 from datetime import datetime
 from io import BytesIO
 
@@ -17,9 +18,14 @@ import plotly.express as px
 
 # Import custom modules
 from config import get_bank_config, get_google_sheet_url, get_all_bank_names
-from core import CampaignDataProcessor
+from config.bank_config import DATASET_IDLE_SECONDS
+from core import (
+   create_processor, mis_column_selector, submit_mis_parse, submit_mis_processing, process_mis, replay_messages,
+   get_processing_cache, get_dataset_registry,
+   get_result_store, get_overview, hash_bytes, processing_key, should_stream, process_mis_stream
+)
 from ui import get_custom_css, get_dashboard_css
-from utils import load_google_sheet, load_excel_file, get_extrape_logo
+from utils import load_google_sheet, get_extrape_logo
 
 
 # -------------------------
@@ -56,6 +62,182 @@ if 'clear_triggered' not in st.session_state:
    st.session_state.clear_triggered = False
 
 
+# -------------------------
+# Identifiers Loading
+# -------------------------
+def load_identifiers(bank):
+   """Load a bank's identifiers sheet (cached for 5 minutes) with parsed campaign dates"""
+   df_identifiers = load_google_sheet(get_google_sheet_url(bank))
+
+   if df_identifiers is not None:
+       import warnings
+       with warnings.catch_warnings():
+           warnings.filterwarnings("ignore", message="Could not infer format")
+           df_identifiers['Date'] = pd.to_datetime(df_identifiers['Date'], format='%d-%m-%Y', errors='coerce')
+
+   return df_identifiers
+
+
+def store_bank_result(bank, uploaded_file, file_hash, dataset_key, processor, bank_config):
+   """Keep a processed bank in the session; the dataset itself is shared by all sessions through the registry"""
+   processor = get_dataset_registry().put(dataset_key, processor)
+   st.session_state.bank_data[bank] = {
+       'file_name': uploaded_file.name,
+       'file_id': uploaded_file.file_id,
+       'file_hash': file_hash,
+       'dataset_key': dataset_key,
+       'summary': processor.df_summary,
+       'config': bank_config,
+       'memory_usage': dict(processor.memory_usage)
+   }
+   save_bank_result(bank, uploaded_file.name, processor)
+
+
+def get_bank_dataset(bank):
+   """
+   Processor and matched MIS records of a loaded bank
+
+   Uploaded banks are looked up in the shared dataset registry (reloaded from disk if spilled);
+   restored banks keep their own lazily loaded records. Returns (None, None) if the dataset is gone.
+   """
+   bank_data = st.session_state.bank_data[bank]
+   if 'dataset_key' not in bank_data:
+       return bank_data['processor'], bank_data['matched_mis']
+
+   processor = get_dataset_registry().get(bank_data['dataset_key'])
+   if processor is None:
+       return None, None
+   return processor, processor.df_matched_mis
+
+
+def bank_dataset_available(bank):
+   """Whether a loaded bank's dataset can still be looked up, without loading it"""
+   bank_data = st.session_state.bank_data[bank]
+   return 'dataset_key' not in bank_data or bank_data['dataset_key'] in get_dataset_registry()
+
+
+def refresh_bank(bank, uploaded_file, df_identifiers, bank_config):
+   """
+   Move a bank to the results for the current identifiers sheet and bank config
+
+   Results another session already produced are shared; otherwise the current
+   dataset is forked and refreshed, rerunning only the affected pipeline stages.
+   Streamed uploads keep no MIS in memory, so they are streamed again from the
+   uploaded file. If the results cannot be updated the user is told they are stale.
+   """
+   bank_data = st.session_state.bank_data[bank]
+   dataset_key = processing_key(bank_data['file_hash'], df_identifiers, bank_config)
+   if dataset_key == bank_data['dataset_key']:
+       return
+
+   stale_warning = f"⚠️ {bank} still shows results for the previous identifiers sheet or settings, re-upload the MIS file to update them"
+   if bank_data.get('failed_refresh_key') == dataset_key:
+       st.warning(stale_warning)  # Already failed for these inputs, don't reprocess on every rerun
+       return
+
+   registry = get_dataset_registry()
+   processor = registry.get(dataset_key)
+   if processor is None:
+       processor, _ = get_bank_dataset(bank)
+       if processor is None:
+           df_summary = None
+       elif processor.df_mis_source is not None:
+           processor = processor.fork()
+           df_summary, _ = processor.refresh(df_identifiers, bank_config)
+       else:
+           with st.spinner(f"Streaming {uploaded_file.name} again for the updated identifiers or settings..."):
+               try:
+                   processor, df_summary, _ = process_mis_stream(uploaded_file, df_identifiers, bank_config, label=bank)
+               except Exception as e:
+                   st.error(f"❌ Error loading file: {e}")
+                   df_summary = None
+
+       if df_summary is None:
+           bank_data['failed_refresh_key'] = dataset_key
+           st.warning(stale_warning)
+           return
+       processor = registry.put(dataset_key, processor)
+
+   summary_changed = processor.df_summary is not bank_data['summary']
+   bank_data.update(dataset_key=dataset_key, summary=processor.df_summary, config=bank_config)
+   if summary_changed:
+       save_bank_result(bank, bank_data['file_name'], processor)
+
+
+def save_bank_result(bank, file_name, processor):
+   """Write a processed bank to the result store so new sessions start with it"""
+   try:
+       get_result_store().save(
+           bank, file_name, processor.df_summary, processor.df_matched_mis, processor.status_columns
+       )
+   except Exception as e:
+       st.warning(f"⚠️ Could not save {bank} results for later sessions: {str(e)[:50]}")
+
+
+def restore_bank_results():
+   """Load the last stored result of every bank (matched MIS records are read on first use)"""
+   bank_data = {}
+   result_store = get_result_store()
+   for bank in result_store.banks():
+       if bank not in get_all_bank_names():
+           continue
+       result = result_store.load(bank)
+       if result is None:
+           continue
+
+       bank_config = get_bank_config(bank)
+       bank_data[bank] = {
+           'file_name': result['file_name'],
+           'file_id': None,
+           'summary': result['summary'],
+           'matched_mis': result['matched_mis'],
+           'processor': create_processor(bank_config),
+           'config': bank_config,
+           'restored_at': result['saved_at']
+       }
+   return bank_data
+
+
+def memory_usage_report(bank_data):
+   """Deep memory usage of each bank's MIS and summary before and after conversion to compact dtypes"""
+   rows = []
+   for bank, data in bank_data.items():
+       memory_usage = data.get('memory_usage', {})
+       if 'MIS' not in memory_usage:
+           continue  # Restored banks are held compact from the start
+       before = sum(usage[0] for usage in memory_usage.values())
+       after = sum(usage[1] for usage in memory_usage.values())
+       rows.append({
+           'Bank': bank,
+           'Before (MB)': round(before / 1024 ** 2, 1),
+           'After (MB)': round(after / 1024 ** 2, 1),
+           'Saved (%)': round((1 - after / before) * 100, 1) if before else 0.0
+       })
+   return pd.DataFrame(rows, columns=['Bank', 'Before (MB)', 'After (MB)', 'Saved (%)'])
+
+
+def show_view_details_button(bank):
+   """Button that opens the detail view of a freshly processed bank"""
+   bank_key = bank.replace(' ', '_').lower()
+   if st.button(f"View {bank} Details", key=f"view_{bank_key}_new", use_container_width=True):
+       st.session_state.view_mode = 'bank_detail'
+       st.session_state.selected_bank_detail = bank
+       st.rerun()
+
+
+# Warm start: a new session begins with the last stored result of every bank
+if 'results_restored' not in st.session_state:
+   st.session_state.bank_data.update(restore_bank_results())
+   st.session_state.results_restored = True
+
+# Idle banks: shared datasets are spilled to disk by the registry, restored records are released;
+# both are mapped back in when a detail view or export needs them
+get_dataset_registry().spill_idle()
+for data in st.session_state.bank_data.values():
+   if 'matched_mis' in data:  # Only restored banks hold their own records
+       data['matched_mis'].release_if_idle(DATASET_IDLE_SECONDS)
+
+
 # -------------------------
 # Sidebar - MIS Upload for Each Bank
 # -------------------------
@@ -66,6 +248,9 @@ with st.sidebar:
    st.markdown("---")
 
 
+   # Uploads that still need processing: bank -> (uploaded file, status container)
+   pending_uploads = {}
+
    for bank in get_all_bank_names():
        bank_key = bank.replace(' ', '_').lower()
 
@@ -84,59 +269,17 @@ with st.sidebar:
                if st.session_state.get('clear_triggered', False):
                    st.info("⚠️ Data cleared - Click 'Dismiss' below and re-upload if needed")
                elif bank not in st.session_state.bank_data or \
-                       st.session_state.bank_data.get(bank, {}).get('file_name') != uploaded_file.name:
-
-                   with st.spinner(f"Processing {bank}..."):
-                       try:
-                           # Get bank config first to check for specific sheet name
-                           bank_config = get_bank_config(bank)
-
-                           # Load MIS file with bank-specific sheet name if specified
-                           sheet_name = bank_config.get('sheet_name', 0)  # Default to first sheet
-                           df_mis = load_excel_file(uploaded_file, sheet_name=sheet_name)
-
-                           if df_mis is not None:
-                               # Load identifiers
-                               sheet_url = get_google_sheet_url(bank)
-                               df_identifiers = load_google_sheet(sheet_url)
-
-                               if df_identifiers is not None:
-                                   import warnings
-                                   with warnings.catch_warnings():
-                                       warnings.filterwarnings("ignore", message="Could not infer format")
-                                       df_identifiers['Date'] = pd.to_datetime(df_identifiers['Date'], format='%d-%m-%Y', errors='coerce')
-
-                                   # Process data
-                                   processor = CampaignDataProcessor(bank_config)
-                                   df_summary, df_matched_mis = processor.process_campaign_data(
-                                       df_identifiers, df_mis
-                                   )
-
-
-                                   if df_summary is not None:
-                                       st.session_state.bank_data[bank] = {
-                                           'file_name': uploaded_file.name,
-                                           'summary': df_summary,
-                                           'matched_mis': df_matched_mis,
-                                           'processor': processor,
-                                           'config': bank_config
-                                       }
-                                       st.success(f"✅ {len(df_summary)} campaigns")
-
-                                       # Show View Details button immediately after processing
-                                       if st.button(f"View {bank} Details", key=f"view_{bank_key}_new", use_container_width=True):
-                                           st.session_state.view_mode = 'bank_detail'
-                                           st.session_state.selected_bank_detail = bank
-                                           st.rerun()
-                                   else:
-                                       st.error("❌ Processing failed")
-                               else:
-                                   st.error("❌ Failed to load identifiers")
-                           else:
-                               st.error("❌ Failed to load MIS")
-                       except Exception as e:
-                           st.error(f"❌ Error: {str(e)[:50]}")
+                       st.session_state.bank_data.get(bank, {}).get('file_id') != uploaded_file.file_id or \
+                       not bank_dataset_available(bank):
+
+                   # Queue for concurrent processing below
+                   pending_uploads[bank] = (uploaded_file, st.status(f"Processing {bank}...", expanded=True))
                else:
+                   # Pick up identifiers sheet and config changes; only the affected pipeline stages rerun
+                   df_identifiers = load_identifiers(bank)
+                   if df_identifiers is not None:
+                       refresh_bank(bank, uploaded_file, df_identifiers, get_bank_config(bank))
+
                    st.success(f"✅ {uploaded_file.name}")
 
                    # View detail button
@@ -144,6 +287,16 @@ with st.sidebar:
                        st.session_state.view_mode = 'bank_detail'
                        st.session_state.selected_bank_detail = bank
                        st.rerun()
+           elif 'restored_at' in st.session_state.bank_data.get(bank, {}):
+               # Restored from the result store; kept until a new file is uploaded
+               bank_data = st.session_state.bank_data[bank]
+               saved_at = datetime.fromtimestamp(bank_data['restored_at']).strftime('%d-%m-%Y %H:%M')
+               st.success(f"💾 {bank_data['file_name']} (saved {saved_at})")
+
+               if st.button(f"View {bank} Details", key=f"view_{bank_key}", use_container_width=True):
+                   st.session_state.view_mode = 'bank_detail'
+                   st.session_state.selected_bank_detail = bank
+                   st.rerun()
            else:
                # Only remove if file was removed (not on initial load)
                if bank in st.session_state.bank_data:
@@ -153,11 +306,146 @@ with st.sidebar:
                st.info("No file uploaded")
 
 
+   # Serve queued uploads from the processing cache where possible; the rest run in the process pool.
+   # Several banks are each parsed and processed in a worker of their own, so they finish in about the
+   # time of the slowest one; a lone bank is only parsed there and matched here (sharded across the pool)
+   if pending_uploads:
+       processing_cache = get_processing_cache()
+       queued_jobs = []
+
+       for bank, (uploaded_file, status) in pending_uploads.items():
+           with status:
+               bank_config = get_bank_config(bank)
+               df_identifiers = load_identifiers(bank)
+
+               if df_identifiers is None:
+                   st.error("❌ Failed to load identifiers")
+                   status.update(label=f"{bank} failed", state="error")
+                   continue
+
+               # Same file bytes + identifiers + config → reuse the processed result (shared or on disk)
+               file_hash = hash_bytes(uploaded_file.getbuffer())  # No copy of large uploads
+               cache_key = processing_key(file_hash, df_identifiers, bank_config)
+               processor = get_dataset_registry().get(cache_key)
+
+               if processor is not None:
+                   store_bank_result(bank, uploaded_file, file_hash, cache_key, processor, bank_config)
+                   st.success(f"✅ {len(processor.df_summary)} campaigns (cached)")
+                   status.update(label=f"{bank} ready", state="complete")
+                   show_view_details_button(bank)
+                   continue
+
+               if should_stream(uploaded_file):
+                   # Too large to load whole: match and count chunk by chunk, matched records go to disk
+                   st.write("⏳ Streaming large MIS file in chunks...")
+                   try:
+                       processor, df_summary, _ = process_mis_stream(uploaded_file, df_identifiers, bank_config, label=bank)
+                   except Exception as e:
+                       st.error(f"❌ Error loading file: {e}")
+                       df_summary = None
+
+                   if df_summary is not None:
+                       processing_cache.put(cache_key, processor)
+                       store_bank_result(bank, uploaded_file, file_hash, cache_key, processor, bank_config)
+                       st.success(f"✅ {len(df_summary)} campaigns (streamed)")
+                       status.update(label=f"{bank} ready", state="complete")
+                       show_view_details_button(bank)
+                   else:
+                       st.error("❌ Processing failed")
+                       status.update(label=f"{bank} failed", state="error")
+                   continue
+
+               # A re-upload for a loaded bank is diffed against (a fork of) the previous file
+               previous_processor = None
+               if bank in st.session_state.bank_data:
+                   previous_processor, _ = get_bank_dataset(bank)
+
+               queued_jobs.append((bank, bank_config, df_identifiers, file_hash, cache_key, previous_processor))
+
+       process_in_workers = len(queued_jobs) > 1
+       job_futures = {}
+
+       for bank, bank_config, df_identifiers, file_hash, cache_key, previous_processor in queued_jobs:
+           uploaded_file, status = pending_uploads[bank]
+           parse_options = dict(
+               sheet_name=bank_config.get('sheet_name', 0),  # Default to first sheet
+               select_columns=mis_column_selector(bank_config),
+               header_keywords=bank_config["identifier_column"]
+           )
+
+           with status:
+               if process_in_workers:
+                   future = submit_mis_processing(
+                       uploaded_file, df_identifiers, bank_config, previous_processor, **parse_options
+                   )
+                   st.write("⏳ Parsing and matching MIS file...")
+               else:
+                   future = submit_mis_parse(uploaded_file, **parse_options)
+                   st.write("⏳ Parsing MIS file...")
+           job_futures[future] = (bank, bank_config, df_identifiers, file_hash, cache_key, previous_processor)
+
+       # Results are applied here, on the script thread, as each bank finishes
+       for future in as_completed(job_futures):
+           bank, bank_config, df_identifiers, file_hash, cache_key, previous_processor = job_futures[future]
+           uploaded_file, status = pending_uploads[bank]
+           processed = False
+
+           with status:
+               try:
+                   try:
+                       result = future.result()
+                   except Exception as e:
+                       st.error(f"❌ Error loading file: {e}")
+                       result = None
+
+                   if result is not None:
+                       if process_in_workers:
+                           processor, df_summary, mis_memory_usage, messages = result
+                           replay_messages(messages)
+                       else:
+                           df_mis, mis_memory_usage = result
+                           processor, df_summary = process_mis(
+                               df_identifiers, df_mis, bank_config, previous_processor
+                           )
+
+
+                       if df_summary is not None:
+                           processor.memory_usage['MIS'] = mis_memory_usage
+                           processing_cache.put(cache_key, processor)
+                           store_bank_result(bank, uploaded_file, file_hash, cache_key, processor, bank_config)
+                           processed = True
+                           st.success(f"✅ {len(df_summary)} campaigns")
+                           status.update(label=f"{bank} ready", state="complete")
+
+                           # Show View Details button immediately after processing
+                           show_view_details_button(bank)
+                       else:
+                           st.error("❌ Processing failed")
+                   else:
+                       st.error("❌ Failed to load MIS")
+               except Exception as e:
+                   st.error(f"❌ Error: {str(e)[:50]}")
+
+               if not processed:
+                   status.update(label=f"{bank} failed", state="error")
+
+
+   # Session memory per bank: frames as parsed vs in compact dtypes
+   df_memory = memory_usage_report(st.session_state.bank_data)
+   if len(df_memory) > 0:
+       with st.expander("💾 Memory usage", expanded=False):
+           st.dataframe(df_memory, hide_index=True, use_container_width=True)
+
    st.markdown("---")
 
    # Clear all data button - Always show if data exists
    if len(st.session_state.bank_data) > 0:
        st.markdown("### 🗑️ Clear Data")
+       # Stored results are shared: every new session warm-starts from them, so deleting them is opt-in
+       delete_stored = st.checkbox(
+           "Also delete stored results (all sessions)", key='clear_stored_results',
+           help="New sessions will no longer start with the last processed file of each bank"
+       )
        if st.button("Clear All Data", key='clear_all_button', type='secondary', use_container_width=True):
            # Store keys to delete
            keys_to_delete = list(st.session_state.bank_data.keys())
@@ -167,6 +455,10 @@ with st.sidebar:
                if key in st.session_state.bank_data:
                    del st.session_state.bank_data[key]
 
+           # Stored results only when asked for; otherwise this clears the current session alone
+           if delete_stored:
+               get_result_store().clear()
+
            # Clear all file uploader widgets
            for bank in get_all_bank_names():
                bank_key = bank.replace(' ', '_').lower()
@@ -424,10 +716,6 @@ if st.session_state.view_mode == 'overview':
                     </div>
                 """, unsafe_allow_html=True)
     else:
-        # Aggregate data from all banks
-        all_summaries = []
-        bank_wise_stats = []
-
         # Apply date filter if dates are selected
         date_filter_active = False
         if all_dates:
@@ -435,49 +723,25 @@ if st.session_state.view_mode == 'overview':
             filter_start = pd.Timestamp(start_date)
             filter_end = pd.Timestamp(end_date)
 
-        for bank, data in st.session_state.bank_data.items():
-            df = data['summary'].copy()
-
-            # Apply date filter
-            if date_filter_active and 'Date' in df.columns:
-                df = df[(df['Date'] >= filter_start) & (df['Date'] <= filter_end)]
-
-            df['Bank'] = bank
-            all_summaries.append(df)
-
-            # Calculate bank-wise stats
-            stats = data['processor'].get_summary_statistics(df)
-            stats['Bank'] = bank
-            bank_wise_stats.append(stats)
+        # Aggregate data from all banks (DuckDB or pandas, see ANALYTICS_BACKEND)
+        overview = get_overview(
+            st.session_state.bank_data,
+            (filter_start, filter_end) if date_filter_active else None
+        )
+        df_source_stats = overview.source_stats()
 
         # Show filter summary
         if date_filter_active:
-            total_campaigns = sum([len(df) for df in all_summaries])
+            total_campaigns = overview.campaign_count()
             st.success(f"✅ Showing {total_campaigns} campaigns within the selected date range")
 
-        # Combine all data
-        df_combined = pd.concat(all_summaries, ignore_index=True)
-
-        # Calculate overall metrics
-        total_applications = df_combined['Applications'].sum()
-        total_ipa_approved = df_combined['IPA Approved'].sum()
-        total_card_out = df_combined['Card Out'].sum()
-        total_declined = df_combined['Declined'].sum()
-        total_in_progress = df_combined['In Progress'].sum()
-        total_cost = df_combined['Total cost (₹)'].sum()
-
-        # Conversion rates
-        app_to_ipa = (total_ipa_approved / total_applications * 100) if total_applications > 0 else 0
-        ipa_to_card = (total_card_out / total_ipa_approved * 100) if total_ipa_approved > 0 else 0
-        app_to_card = (total_card_out / total_applications * 100) if total_applications > 0 else 0
-
         # -------------------------
         # Overall Metrics Dashboard
         # -------------------------
         st.markdown("### 📊 Performance Overview")
 
         # Create and normalize the bank_comparison DataFrame
-        bank_comparison = pd.DataFrame(bank_wise_stats)
+        bank_comparison = overview.bank_stats()
         bank_comparison = bank_comparison[[
             'Bank', 'total_apps', 'total_ipa_approved', 'total_card_out',
             'total_declined', 'total_cost', 'avg_cpa', 'app_to_ipa_rate', 'ipa_to_card_rate'
@@ -615,22 +879,14 @@ if st.session_state.view_mode == 'overview':
 
         with viz_row1_col1:
             # Card Out by Source & Bank (REPLACEMENT for Applications vs Card Out)
-            # Get source-wise card out data from all banks (USE FILTERED DATA FROM all_summaries)
-            source_cardout_data = []
-            for df in all_summaries:
-                if len(df) > 0 and 'Source' in df.columns and 'Bank' in df.columns:
-                    bank = df['Bank'].iloc[0]
-                    source_stats = df.groupby('Source').agg({'Card Out': 'sum'}).reset_index()
-                    source_stats['Bank'] = bank
-                    source_cardout_data.append(source_stats)
-
+            # Source-wise card out of all banks, within the date filter
             # Get top sources by card out and by bank
-            if source_cardout_data:
-                df_source_cardout = pd.concat(source_cardout_data, ignore_index=True)
+            if len(df_source_stats) > 0:
+                df_source_cardout = df_source_stats[['Source', 'Card Out', 'Bank']]
 
                 # Get unique banks and sources
                 banks = df_source_cardout['Bank'].unique()
-                sources = df_source_cardout.groupby('Source')['Card Out'].sum().sort_values(ascending=False).index
+                sources = df_source_cardout.groupby('Source', observed=True)['Card Out'].sum().sort_values(ascending=False).index
 
                 # Create stacked bar chart showing Source breakdown by Bank
                 fig_cardout_combined = go.Figure()
@@ -656,7 +912,7 @@ if st.session_state.view_mode == 'overview':
                     ))
 
                 # Calculate max value with extra padding for outside text labels
-                source_totals = df_source_cardout.groupby('Source')['Card Out'].sum()
+                source_totals = df_source_cardout.groupby('Source', observed=True)['Card Out'].sum()
                 cardout_y_max = source_totals.max() * 1.35
 
                 fig_cardout_combined.update_layout(
@@ -858,38 +1114,21 @@ if st.session_state.view_mode == 'overview':
                 bank_comparison.to_excel(writer, sheet_name="Bank Comparison", index=False)
 
                 # ====== SOURCE-WISE ANALYSIS ======
-                # Create comprehensive source-wise analysis
+                # Create comprehensive source-wise analysis from the per-bank source sums
                 source_analysis_data = []
 
-                for bank, data in st.session_state.bank_data.items():
-                    df = data['summary'].copy()
+                if len(df_source_stats) > 0:
+                    source_stats = df_source_stats.copy()
 
-                    # Apply date filter
-                    if date_filter_active and 'Date' in df.columns:
-                        df = df[(df['Date'] >= filter_start) & (df['Date'] <= filter_end)]
+                    # Calculate efficiency metrics per source
+                    source_stats['CTR (%)'] = (source_stats['Clicks'] / source_stats['Delivered'] * 100).round(2).fillna(0)
+                    source_stats['CPA (₹)'] = (source_stats['Total cost (₹)'] / source_stats['Applications']).round(2).fillna(0)
+                    source_stats['Cost per Card Out (₹)'] = (source_stats['Total cost (₹)'] / source_stats['Card Out']).round(2).fillna(0)
+                    source_stats['App→IPA (%)'] = (source_stats['IPA Approved'] / source_stats['Applications'] * 100).round(1).fillna(0)
+                    source_stats['IPA→Card (%)'] = (source_stats['Card Out'] / source_stats['IPA Approved'] * 100).round(1).fillna(0)
+                    source_stats['App→Card (%)'] = (source_stats['Card Out'] / source_stats['Applications'] * 100).round(1).fillna(0)
 
-                    # Group by source for this bank
-                    if 'Source' in df.columns:
-                        source_stats = df.groupby('Source').agg({
-                            'Applications': 'sum',
-                            'IPA Approved': 'sum',
-                            'Card Out': 'sum',
-                            'Declined': 'sum',
-                            'Total cost (₹)': 'sum',
-                            'Delivered': 'sum',
-                            'Clicks': 'sum'
-                        }).reset_index()
-
-                        # Calculate efficiency metrics per source
-                        source_stats['Bank'] = bank
-                        source_stats['CTR (%)'] = (source_stats['Clicks'] / source_stats['Delivered'] * 100).round(2).fillna(0)
-                        source_stats['CPA (₹)'] = (source_stats['Total cost (₹)'] / source_stats['Applications']).round(2).fillna(0)
-                        source_stats['Cost per Card Out (₹)'] = (source_stats['Total cost (₹)'] / source_stats['Card Out']).round(2).fillna(0)
-                        source_stats['App→IPA (%)'] = (source_stats['IPA Approved'] / source_stats['Applications'] * 100).round(1).fillna(0)
-                        source_stats['IPA→Card (%)'] = (source_stats['Card Out'] / source_stats['IPA Approved'] * 100).round(1).fillna(0)
-                        source_stats['App→Card (%)'] = (source_stats['Card Out'] / source_stats['Applications'] * 100).round(1).fillna(0)
-
-                        source_analysis_data.append(source_stats)
+                    source_analysis_data.append(source_stats)
 
                 # Combine all source analysis data
                 if source_analysis_data:
@@ -981,8 +1220,10 @@ elif st.session_state.view_mode == 'bank_detail':
         )
 
         df_summary = bank_data['summary']
-        df_matched_mis = bank_data['matched_mis']
-        processor = bank_data['processor']
+        processor, df_matched_mis = get_bank_dataset(selected_bank)
+        if df_matched_mis is None:
+            st.warning(f"⚠️ {selected_bank} MIS records are no longer available, re-upload the MIS file")
+            st.stop()
 
         # Add Filters Section
         st.markdown("### 🔍 Data Filters")
@@ -1041,11 +1282,11 @@ elif st.session_state.view_mode == 'bank_detail':
         )
 
         # Filter matched MIS data based on filtered campaigns
-        if len(df_matched_mis) > 0 and 'Matched_Identifier' in df_matched_mis.columns:
+        if len(df_matched_mis) > 0:
             # Get list of campaign identifiers that passed the filter
             filtered_identifiers = df_filtered['Campaign name'].unique().tolist()
-            # Filter matched MIS to only include records from filtered campaigns
-            df_matched_mis = df_matched_mis[df_matched_mis['Matched_Identifier'].isin(filtered_identifiers)]
+            # Filter matched MIS to only include records from filtered campaigns (index-only, no copy)
+            df_matched_mis = df_matched_mis.filter_identifiers(filtered_identifiers)
 
         # Show filter info
         if len(df_filtered) < len(df_summary):
@@ -1134,7 +1375,7 @@ elif st.session_state.view_mode == 'bank_detail':
         # Channel Performance Analysis
         st.markdown("### 📡 Channel-Wise Performance")
         # Group by channel
-        channel_analysis = df_summary.groupby('Channel').agg({
+        channel_analysis = df_summary.groupby('Channel', observed=True).agg({
             'Applications': 'sum',
             'IPA Approved': 'sum',
             'Card Out': 'sum',
@@ -1321,7 +1562,7 @@ elif st.session_state.view_mode == 'bank_detail':
                 # ====== SOURCE-WISE ANALYSIS FOR INDIVIDUAL BANK ======
                 if 'Source' in df_summary.columns and len(df_summary) > 0:
                     # Group by source
-                    source_stats = df_summary.groupby('Source').agg({
+                    source_stats = df_summary.groupby('Source', observed=True).agg({
                         'Applications': 'sum',
                         'IPA Approved': 'sum',
                         'Card Out': 'sum',
@@ -0,0 +1,105 @@
+"""
+Processing Engine Benchmark
+Times the pandas and Polars campaign processors on synthetic MIS files of
+growing size and checks that both produce identical results.
+
+Usage:
+    python benchmarks/bench_engines.py --rows 100000,1000000,5000000 --identifiers 2000
+    python benchmarks/bench_engines.py --unique-values
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import get_bank_config
+from core.data_processor import create_processor
+
+
+def make_synthetic_data(num_identifiers, num_rows, unique_values=False, seed=42):
+    """
+    Generate an identifiers sheet and an Axis Bank style MIS file
+
+    Args:
+        num_identifiers: Number of campaigns on the identifiers sheet
+        num_rows: Number of MIS rows
+        unique_values: Append a per-row click id so every MIS value is distinct
+        seed: Random seed
+
+    Returns:
+        Tuple of (identifiers DataFrame, MIS DataFrame)
+    """
+    rng = np.random.default_rng(seed)
+    identifiers = np.array([f"CMP{i:05d}" for i in range(num_identifiers)], dtype=object)
+    df_identifiers = pd.DataFrame({
+        "Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 31, num_identifiers), unit="D"),
+        "Identifiers": identifiers,
+        "Source": rng.choice(["Source A", "Source B", "Source C"], num_identifiers),
+        "Channel": rng.choice(["SMS", "RCS", "Whatsapp Marketing", "Email"], num_identifiers),
+        "Delivered": rng.integers(0, 10_000, num_identifiers),
+        "Clicks": rng.integers(0, 500, num_identifiers),
+        "Read": rng.integers(0, 2_000, num_identifiers)
+    })
+
+    # Most MIS values embed an identifier (UTM-style suffixes), the rest are organic traffic
+    campaign_values = pd.Series(identifiers[rng.integers(0, num_identifiers, num_rows)])
+    suffixes = pd.Series(rng.choice(["_sms", "_rcs", "_wa", "_email_" + "x" * 8], num_rows))
+    organic = pd.Series(rng.integers(0, 50_000, num_rows)).astype(str).radd("organic_")
+    values = (campaign_values + suffixes).where(rng.random(num_rows) < 0.8, organic)
+    if unique_values:
+        values = values + pd.Series(np.arange(num_rows)).astype(str).radd("_click")
+
+    df_mis = pd.DataFrame({
+        "CROSSCELLCODE": values,
+        "FINAL STATUS": rng.choice(["APPROVED", "DECLINED", "WIP", " approved "], num_rows),
+        "IPA STATUS": rng.choice(["APPROVED", "IPA APPROVED", "RCU", "NO"], num_rows),
+        "LOGIN DATE": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 45, num_rows), unit="D")
+    })
+    return df_identifiers, df_mis
+
+
+def time_engine(engine, bank_config, df_identifiers, df_mis):
+    """Process once with an engine and return (summary, matched view, seconds)"""
+    processor = create_processor(bank_config, engine=engine)
+    start = time.perf_counter()
+    df_summary, matched_view = processor.process_campaign_data(df_identifiers.copy(), df_mis.copy())
+    return df_summary, matched_view, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pandas and Polars processing engines")
+    parser.add_argument("--rows", default="100000,1000000,5000000", help="Comma-separated MIS row counts")
+    parser.add_argument("--identifiers", type=int, default=2000)
+    parser.add_argument("--match-mode", default="substring")
+    parser.add_argument("--unique-values", action="store_true", help="Make every MIS value distinct (click ids)")
+    args = parser.parse_args()
+
+    bank_config = dict(get_bank_config("Axis Bank"), match_mode=args.match_mode)
+
+    for num_rows in [int(rows) for rows in args.rows.split(",")]:
+        df_identifiers, df_mis = make_synthetic_data(args.identifiers, num_rows, args.unique_values)
+        summary_pandas, view_pandas, pandas_seconds = time_engine("pandas", bank_config, df_identifiers, df_mis)
+        summary_polars, view_polars, polars_seconds = time_engine("polars", bank_config, df_identifiers, df_mis)
+
+        print(f"{num_rows:>10,} rows: pandas {pandas_seconds:7.2f}s  polars {polars_seconds:7.2f}s  "
+              f"speed-up {pandas_seconds / polars_seconds:.1f}x  ({len(view_pandas):,} matched records)")
+
+        same_records = (
+            np.array_equal(view_pandas.row_positions, view_polars.row_positions)
+            and np.array_equal(view_pandas.campaign_positions, view_polars.campaign_positions)
+        )
+        if not (summary_pandas.equals(summary_polars) and same_records):
+            print("❌ Polars results differ from the pandas engine")
+            sys.exit(1)
+
+    print("✅ Results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Excel Reader Benchmark
+Times MIS file loading with the default engines (openpyxl / xlrd / pyxlsb)
+and with calamine on synthetic workbooks of growing size in every upload
+format, and checks that both readers give identical frames.
+
+Workbooks are generated once into --data-dir and reused. pandas writes only
+.xlsx and .csv; .xls and .xlsb copies are converted with LibreOffice when
+soffice is on the PATH, or can be placed in --data-dir by hand
+(mis_<rows>.<format>). .xls holds at most 65,535 data rows.
+
+Usage:
+    python benchmarks/bench_excel_readers.py --rows 50000,250000,1000000
+    python benchmarks/bench_excel_readers.py --formats xlsx,csv --rows 50000
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.helpers import CALAMINE_AVAILABLE, compact_dtypes, read_mis_file
+
+XLS_MAX_ROWS = 65_535
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / ".cache" / "benchmarks"
+
+
+def make_mis_frame(num_rows, seed=42):
+    """
+    Generate a MIS dump with the column mix of a bank export
+
+    Args:
+        num_rows: Number of MIS rows
+        seed: Random seed
+
+    Returns:
+        MIS DataFrame (dates, codes, statuses, amounts, sparse remarks)
+    """
+    rng = np.random.default_rng(seed)
+    codes = pd.Series(rng.integers(0, 2000, num_rows)).map("CMP{:05d}".format)
+    df_mis = pd.DataFrame({
+        "APPLICATION ID": np.arange(num_rows) + 10_000_000,
+        "LOGIN DATE": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 45, num_rows), unit="D"),
+        "CROSSCELLCODE": codes + pd.Series(rng.choice(["_sms", "_rcs", "_wa", "_email"], num_rows)),
+        "FINAL STATUS": rng.choice(["APPROVED", "DECLINED", "WIP", "CARD SETUP"], num_rows),
+        "IPA STATUS": rng.choice(["APPROVED", "IPA APPROVED", "RCU", "NO"], num_rows),
+        "CITY": rng.choice(["MUMBAI", "DELHI", "BENGALURU", "CHENNAI", "PUNE"], num_rows),
+        "CREDIT LIMIT": rng.integers(0, 500, num_rows) * 1000.0,
+        "SCORE": rng.random(num_rows) * 900,
+        "REMARKS": np.where(rng.random(num_rows) < 0.1, "Customer requested callback", None)
+    })
+    return df_mis
+
+
+def ensure_workbook(data_dir, num_rows, file_format):
+    """
+    Get the path of a benchmark workbook, generating or converting it if missing
+
+    Returns:
+        Path, or None when the format cannot be produced here
+    """
+    path = data_dir / f"mis_{num_rows}.{file_format}"
+    if path.exists():
+        return path
+
+    if file_format == "csv":
+        make_mis_frame(num_rows).to_csv(path, index=False)
+    elif file_format == "xlsx":
+        make_mis_frame(num_rows).to_excel(path, index=False, sheet_name="MIS")
+    else:
+        soffice = shutil.which("soffice") or shutil.which("libreoffice")
+        if soffice is None or (file_format == "xls" and num_rows > XLS_MAX_ROWS):
+            return None
+        source = ensure_workbook(data_dir, num_rows, "xlsx")
+        subprocess.run(
+            [soffice, "--headless", "--convert-to", file_format, "--outdir", str(data_dir), str(source)],
+            check=True, capture_output=True
+        )
+    return path if path.exists() else None
+
+
+def time_read(data, file_name, reader):
+    """Load a file from its bytes with one reader and return (DataFrame, seconds)"""
+    buffer = BytesIO(data)
+    buffer.name = file_name
+    start = time.perf_counter()
+    df = read_mis_file(buffer, reader=reader)
+    return df, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the default Excel engines against calamine")
+    parser.add_argument("--rows", default="50000,250000,1000000", help="Comma-separated MIS row counts")
+    parser.add_argument("--formats", default="xlsx,xls,xlsb,csv", help="Comma-separated file formats")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="Directory holding the workbooks")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    if not CALAMINE_AVAILABLE:
+        print("⚠️ python-calamine is not installed (or pandas < 2.2): timing the default engines only")
+
+    mismatches = 0
+    for num_rows in [int(rows) for rows in args.rows.split(",")]:
+        for file_format in args.formats.split(","):
+            path = ensure_workbook(data_dir, num_rows, file_format)
+            if path is None:
+                print(f"{num_rows:>10,} rows {file_format:>5}: skipped (no workbook, see --data-dir)")
+                continue
+
+            data = path.read_bytes()
+            df_default, default_seconds = time_read(data, path.name, "default")
+            line = f"{num_rows:>10,} rows {file_format:>5}: default {default_seconds:7.2f}s"
+
+            if CALAMINE_AVAILABLE and file_format != "csv":
+                df_calamine, calamine_seconds = time_read(data, path.name, "auto")
+                line += f"  calamine {calamine_seconds:7.2f}s  speed-up {default_seconds / calamine_seconds:.1f}x"
+                if not compact_dtypes(df_default).equals(compact_dtypes(df_calamine)):
+                    line += "  ❌ frames differ"
+                    mismatches += 1
+            print(line)
+
+    if mismatches:
+        sys.exit(1)
+    print("✅ Readers agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Streaming Ingestion Benchmark
+Processes one large synthetic MIS file loaded whole and streamed in
+chunks, each in a fresh process, and reports wall time and peak memory
+(which should follow the chunk size when streaming, not the file size).
+Checks that both summaries are identical.
+
+The .xlsb copy is converted from the CSV with LibreOffice when soffice is
+on the PATH (a sheet holds at most 1,048,575 data rows), or can be placed
+next to it by hand with --xlsb.
+
+Usage:
+    python benchmarks/bench_streaming.py --rows 2000000 --chunk-rows 200000
+    python benchmarks/bench_streaming.py --format xlsb --rows 1000000
+"""
+
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_engines import make_synthetic_data
+from config import get_bank_config
+from core.data_processor import create_processor
+from core.streaming import StreamingCampaignDataProcessor
+from utils.helpers import iter_mis_csv_chunks, iter_mis_xlsb_chunks, read_mis_file
+
+XLSB_MAX_ROWS = 1_048_575
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process (VmHWM on Linux; ru_maxrss, which survives exec, elsewhere)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(mode, mis_path, identifiers_path, chunk_rows, summary_path):
+    """Process the MIS file once in this process and print seconds and peak RSS as JSON"""
+    bank_config = dict(get_bank_config("Axis Bank"), skip_mis_date_filter=False)
+    df_identifiers = pd.read_pickle(identifiers_path)
+
+    start = time.perf_counter()
+    with open(mis_path, "rb") as file:
+        if mode == "batch":
+            processor = create_processor(bank_config)
+            df_summary, _ = processor.process_campaign_data(df_identifiers, read_mis_file(file, reader="default"))
+        else:
+            processor = StreamingCampaignDataProcessor(bank_config)
+            if mis_path.endswith(".xlsb"):
+                chunks = iter_mis_xlsb_chunks(file, chunk_rows)
+            else:
+                chunks = iter_mis_csv_chunks(file, chunk_rows)
+            df_summary, _ = processor.process_campaign_stream(df_identifiers, chunks, tempfile.mkdtemp())
+    seconds = time.perf_counter() - start
+
+    df_summary.to_pickle(summary_path)
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_memory_mb()}))
+
+
+def convert_to_xlsb(csv_path, num_rows):
+    """Convert the CSV to .xlsb next to it with LibreOffice, returning None when that is not possible"""
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None or num_rows > XLSB_MAX_ROWS:
+        return None
+    subprocess.run(
+        [soffice, "--headless", "--convert-to", "xlsb", "--outdir", str(csv_path.parent), str(csv_path)],
+        check=True, capture_output=True
+    )
+    xlsb_path = csv_path.with_suffix(".xlsb")
+    return xlsb_path if xlsb_path.exists() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark whole-file and streamed MIS processing")
+    parser.add_argument("--format", choices=["csv", "xlsb"], default="csv")
+    parser.add_argument("--xlsb", help="Hand-made .xlsb copy of the generated CSV (default: convert with soffice)")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--identifiers", type=int, default=2000)
+    parser.add_argument("--chunk-rows", type=int, default=200_000)
+    parser.add_argument("--worker", choices=["batch", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--mis", help=argparse.SUPPRESS)
+    parser.add_argument("--identifiers-file", help=argparse.SUPPRESS)
+    parser.add_argument("--summary", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.mis, args.identifiers_file, args.chunk_rows, args.summary)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        df_identifiers, df_mis = make_synthetic_data(args.identifiers, args.rows)
+        df_identifiers["Date"] = df_identifiers["Date"].dt.strftime("%Y-%m-%d")
+        csv_path = directory / "mis.csv"
+        df_mis.to_csv(csv_path, index=False)
+        df_identifiers.to_pickle(directory / "identifiers.pkl")
+        del df_mis
+
+        mis_path = csv_path
+        if args.format == "xlsb":
+            mis_path = Path(args.xlsb) if args.xlsb else convert_to_xlsb(csv_path, args.rows)
+            if mis_path is None:
+                print("❌ No .xlsb copy: install LibreOffice (soffice) or pass --xlsb, at most 1,048,575 rows")
+                sys.exit(1)
+        print(f"{args.rows:,} rows, {mis_path.stat().st_size / 1024 ** 2:,.0f} MB {args.format.upper()}, "
+              f"chunks of {args.chunk_rows:,} rows")
+
+        summaries = {}
+        for mode in ["batch", "stream"]:
+            summary_path = directory / f"{mode}.pkl"
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--mis", str(mis_path),
+                 "--identifiers-file", str(directory / "identifiers.pkl"),
+                 "--chunk-rows", str(args.chunk_rows), "--summary", str(summary_path)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>7}: {result['seconds']:7.2f}s  peak {result['peak_mb']:8,.0f} MB")
+            summaries[mode] = pd.read_pickle(summary_path)
+
+    if not summaries["batch"].equals(summaries["stream"]):
+        print("❌ Streamed summary differs from the whole-file summary")
+        sys.exit(1)
+    print("✅ Summaries identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Contains all bank-specific configurations including Google Sheet GIDs,
 column mappings, status definitions, and color schemes.
 """
 
+import os
+
 # Campaign costs by channel (shared across all banks)
 CAMPAIGN_COSTS = {
     "SMS": 0.10,
@@ -26,11 +28,86 @@ UNIFIED_COLOR_SCHEME = {
 # Google Sheets base URL
 GOOGLE_SHEETS_BASE_URL = "https://docs.google.com/spreadsheets/d/184yquIAWt0XyQEYhI3yv0djg9f6pUtZS7TZ4Un7NLXI/export?format=csv&gid="
 
+# Identifier match modes (per bank "match_mode" key):
+#   exact     - MIS value equals the campaign identifier (hash join)
+#   strict    - MIS value equals the campaign identifier as written (case and spaces count)
+#   prefix    - MIS value starts with the campaign identifier (sorted binary search)
+#   substring - MIS value contains the campaign identifier as literal text (Aho-Corasick)
+#   token     - campaign identifier is one of the delimiter-separated tokens in the MIS value
+#   regex     - campaign identifier is a regular expression (legacy str.contains behaviour)
+# All modes but strict are case-insensitive.
+#
+# Overlapping matches (per bank "match_attribution" key, defaults to "all"):
+#   all        - an MIS row counts in every campaign it matches (legacy, double counts)
+#   first      - an MIS row counts in the first matching campaign in sheet order
+#   longest    - an MIS row counts in the campaign with the longest identifier
+#   fractional - an MIS row is split evenly across its matching campaigns
+# Opting a bank into first / longest / fractional changes its Applications and status counts:
+# overlapping identifiers (ABC1, ABC12) and the same identifier on several sheet rows no longer
+# all count the shared MIS rows (with first / longest only one of those rows gets them)
+
+# Cumulative MIS re-uploads are diffed against the previous upload of the bank; rows are
+# paired by the optional per bank "application_key_column" (by row content when not set)
+
+# Banks with "project_mis_columns" set parse only the MIS columns processing reads (identifier,
+# statuses, date, secondary and application keys) plus any names listed in "export_columns";
+# other columns of wide MIS dumps are skipped at read time and left out of exports
+
+# Worker processes for identifier matching on large MIS files (per bank "match_workers" overrides, 1 = serial)
+MATCH_WORKERS = max((os.cpu_count() or 1) - 1, 1)
+
+# Worker processes for uploaded MIS files: one per bank queued in a run, at most this many.
+# When several banks are queued each worker parses and processes its bank (matching serially);
+# a single upload is only parsed there. Not tied to the core count (MATCH_WORKERS is 1 on
+# two-core hosts), so uploads for several banks still run side by side; workers are started
+# only as jobs are queued
+PARSE_WORKERS = 4
+
+# Processing engine per deployment: "pandas" or "polars" (needs the optional polars package)
+PROCESSING_ENGINE = "pandas"
+
+# Disk cache of processed results (keyed by upload bytes + identifiers + bank config)
+PROCESSING_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "processing")
+PROCESSING_CACHE_MAX_BYTES = 2 * 1024 ** 3  # Least recently used entries are evicted beyond 2 GB
+
+# Memory budget of the datasets shared by all sessions; least recently used datasets beyond it
+# are spilled to the processing cache and reloaded from there when a session asks for them
+DATASET_REGISTRY_MAX_BYTES = 2 * 1024 ** 3
+
+# Datasets (and restored matched MIS records) not accessed for this long are moved out of memory
+# to disk until a view or export needs them again
+DATASET_IDLE_SECONDS = 15 * 60
+
+# Excel reader: "auto" uses the Rust-based calamine engine when the optional python-calamine
+# package is installed (pandas >= 2.2), "default" always uses openpyxl / xlrd / pyxlsb by extension
+EXCEL_READER = "auto"
+
+# CSV and .xlsb uploads of at least this size (by file extension) are processed as a stream of chunks
+# instead of being loaded whole; .xlsb is compressed, so it holds the same rows in far fewer bytes
+STREAMING_MIN_BYTES = {"csv": 256 * 1024 ** 2, "xlsb": 48 * 1024 ** 2}
+STREAMING_CHUNK_ROWS = 200_000
+
+# Matched MIS records of streamed uploads are written here as they are found (read back on demand);
+# files older than the max age are removed when the next upload is streamed
+STREAMED_MATCHES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "streamed")
+STREAMED_MATCHES_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Engine for the cross-bank overview aggregations: "duckdb" (SQL, needs the optional duckdb package) or "pandas"
+ANALYTICS_BACKEND = "duckdb"
+
+# Parquet store of the last processed results per bank (restored into new sessions and after restarts)
+RESULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "results")
+
+# Text columns held as categoricals when at most this share of their values is distinct
+# (MIS status columns and the like; other text columns are held as Arrow strings)
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
 # Bank-specific configurations
 BANK_CONFIGS = {
     "Axis Bank": {
         "sheet_gid": "526829508",
         "identifier_column": "CROSSCELLCODE",
+        "match_mode": "substring",  # CROSSCELLCODE embeds the campaign code
         "status_column": "FINAL STATUS",
         "ipa_column": "IPA STATUS",
         "card_out_status": ["APPROVED"],
@@ -42,6 +119,7 @@ BANK_CONFIGS = {
     "AU Bank": {
         "sheet_gid": "1138241151",
         "identifier_column": "UTM_CAMPAIGN",
+        "match_mode": "substring",  # UTM_CAMPAIGN embeds the campaign code
         "status_column": "CURRENT_STATUS",
         "ipa_column": "BRE_OUTPUT",
         "card_out_status": ["DISBURSED"],
@@ -58,7 +136,9 @@ BANK_CONFIGS = {
     "RBL Bank": {
         "sheet_gid": "1119698657",
         "sheet_name": "Dump",  # RBL MIS has data in "Dump" sheet
+        "project_mis_columns": True,  # Wide dump: parse only the columns processing reads
         "identifier_column": "QUICK DATA ENTRY: CAMPAIGN SOURCE",  # Actual column name
+        "match_mode": "substring",  # Literal substring match
         "status_column": "disposition.1",  # Second Disposition column (column O) - pandas uses dot for duplicates
         "ipa_column": "FINAL OPS STATUS",  # Final OPS Status for IPA tracking
         "ops_status_column": "OPS STATUS TILL",  # OPS status for card out tracking (partial match for date flexibility)
@@ -79,7 +159,12 @@ BANK_CONFIGS = {
     "HDFC Bank": {
         "sheet_gid": "2141873222",
         "identifier_column": "LC1_CODE",  # HDFC uses LC1_CODE as primary identifier
-        "secondary_identifier": "LG_CODE",  # LG_Code as secondary identifier
+        "match_mode": "substring",  # Literal substring match
+        "secondary_identifiers": [
+            # Composite key: LG_CODE must equal the sheet's LG Code as well (strict, case-sensitive
+            # equality); a blank LG Code only matches blank LG_CODE rows, as in the archived HDFC dashboard
+            {"mis_column": "LG_CODE", "sheet_column": "LG Code", "match_mode": "strict", "blank_matches_any": False}
+        ],
         "status_column": "FINAL_DECISION",  # Final decision column for Card Out/Declined
         "ipa_column": "IPA_STATUS",  # IPA_STATUS column (only has APPROVE/DECLINE)
         "card_out_status": ["APPROVE", "Approve"],  # Card issued - from FINAL_DECISION (586+6=592 total)
@@ -92,7 +177,9 @@ BANK_CONFIGS = {
     "IDFC Bank": {
         "sheet_gid": "0",
         "sheet_name": "App Details",  # IDFC MIS has specific sheet name
+        "project_mis_columns": True,  # Wide dump: parse only the columns processing reads
         "identifier_column": "UTM CAMPAIGN",  # Campaign identifier column
+        "match_mode": "substring",  # Literal substring match
         "status_column": "SUB STAGE",  # Sub Stage column for card out status
         "ipa_column": "SOFT DECISION",  # Soft Decision column for IPA approval
         "card_out_status": ["CARD GENERATION COMPLETED"],  # Card issued (308 records)
@@ -113,6 +200,7 @@ BANK_CONFIGS = {
     "Scapia": {
         "sheet_gid": "713580679",
         "identifier_column": "first_utm_campaign",  # Campaign identifier (normalized to lowercase)
+        "match_mode": "exact",  # first_utm_campaign holds the campaign code as-is
         "status_column": "current_status",  # current_status column (normalized to lowercase)
         "ops_status_column": "card_issued",  # card_issued column for IPA logic (normalized to lowercase)
         "card_out_status": ["COMPLETED"],  # Card out = COMPLETED in current_status
@@ -125,6 +213,7 @@ BANK_CONFIGS = {
     "KIWI Bank": {
         "sheet_gid": "1085917805",
         "identifier_column": "term",  # Campaign identifier in term column (normalized to lowercase)
+        "match_mode": "substring",  # Literal substring match
         "status_column": "current_state",  # current_state column (normalized to lowercase)
         "ipa_column": "current_state",  # Use current_state for IPA tracking as well
         "card_out_status": ["KYC_DONE"],  # Card out = KYC_DONE in current_state
@@ -139,6 +228,7 @@ BANK_CONFIGS = {
     "IndusInd Bank": {
         "sheet_gid": "421802545",
         "identifier_column": "utm_content",  # Campaign identifier in utm_content column (normalized to lowercase)
+        "match_mode": "exact",  # utm_content holds the campaign code as-is
         "status_column": "stage",  # Stage column for status tracking (normalized to lowercase)
         "ipa_column": "stage",  # Use stage column for IPA tracking as well
         "card_out_status": ["APPROVED"],  # Card out = Approved in Stage
@@ -1,5 +1,33 @@
 """Core processing modules for Campaign Analysis Dashboard"""
 
-from .data_processor import CampaignDataProcessor
+from .data_processor import CampaignDataProcessor, create_processor, mis_column_selector
+from .matched_view import MatchedMISView
+from .ingestion import submit_mis_parse, submit_mis_processing, process_mis, replay_messages
+from .cache import ProcessingCache, get_processing_cache, hash_bytes, processing_key
+from .streaming import StreamingCampaignDataProcessor, process_mis_stream, should_stream
+from .registry import DatasetRegistry, get_dataset_registry
+from .result_store import ResultStore, get_result_store
+from .analytics import get_overview
 
-__all__ = ['CampaignDataProcessor']
+__all__ = [
+    'CampaignDataProcessor',
+    'create_processor',
+    'mis_column_selector',
+    'MatchedMISView',
+    'submit_mis_parse',
+    'submit_mis_processing',
+    'process_mis',
+    'replay_messages',
+    'ProcessingCache',
+    'get_processing_cache',
+    'hash_bytes',
+    'processing_key',
+    'StreamingCampaignDataProcessor',
+    'process_mis_stream',
+    'should_stream',
+    'DatasetRegistry',
+    'get_dataset_registry',
+    'ResultStore',
+    'get_result_store',
+    'get_overview'
+]
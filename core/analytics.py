@@ -0,0 +1,199 @@
+"""
+Analytics module
+Cross-bank aggregations for the overview, answered by pandas or by an embedded DuckDB
+"""
+
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from config.bank_config import ANALYTICS_BACKEND
+from core.data_processor import CampaignDataProcessor
+
+try:
+    import duckdb
+except ImportError:  # Optional dependency: fall back to pandas
+    duckdb = None
+
+# Summary columns summed per bank and source for the source chart and export sheets
+SOURCE_SUM_COLUMNS = [
+    'Applications', 'IPA Approved', 'Card Out', 'Declined', 'Total cost (₹)', 'Delivered', 'Clicks'
+]
+
+# Per-bank statistics, named like CampaignDataProcessor.get_summary_statistics()
+BANK_STAT_COLUMNS = [
+    'Bank', 'total_apps', 'total_cost', 'total_ipa_approved', 'total_card_out', 'total_declined',
+    'avg_cpa', 'avg_ctr', 'app_to_ipa_rate', 'ipa_to_card_rate', 'num_campaigns'
+]
+
+
+def _quote(column: str) -> str:
+    """Quote a column name for SQL"""
+    return '"' + column.replace('"', '""') + '"'
+
+
+class PandasOverview:
+    """
+    Overview aggregations over the session's bank summaries with pandas
+
+    Args:
+        bank_data: Session bank data (bank -> dict with 'summary')
+        date_range: Optional (start, end) Timestamps every summary is filtered to
+    """
+
+    def __init__(self, bank_data: Dict[str, Dict], date_range: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None):
+        self.bank_data = bank_data
+        self.summaries = {}
+        for bank, data in bank_data.items():
+            df = data['summary']
+            if date_range is not None and 'Date' in df.columns:
+                df = df[(df['Date'] >= date_range[0]) & (df['Date'] <= date_range[1])]
+            self.summaries[bank] = df
+
+    def campaign_count(self) -> int:
+        """Number of campaigns across all banks"""
+        return sum(len(df) for df in self.summaries.values())
+
+    def bank_stats(self) -> pd.DataFrame:
+        """
+        Per-bank totals and rates
+
+        Returns:
+            DataFrame with BANK_STAT_COLUMNS, one row per bank
+        """
+        bank_wise_stats = []
+        for bank, df in self.summaries.items():
+            stats = CampaignDataProcessor.get_summary_statistics(df)
+            stats['Bank'] = bank
+            bank_wise_stats.append(stats)
+        return pd.DataFrame(bank_wise_stats, columns=BANK_STAT_COLUMNS)
+
+    def source_stats(self) -> pd.DataFrame:
+        """
+        Per-bank, per-source sums of SOURCE_SUM_COLUMNS
+
+        Returns:
+            DataFrame with Bank, Source and SOURCE_SUM_COLUMNS, ordered by bank then source
+        """
+        source_stats = []
+        for bank, df in self.summaries.items():
+            if len(df) == 0 or 'Source' not in df.columns:
+                continue
+            stats = df.groupby('Source', observed=True).agg({column: 'sum' for column in SOURCE_SUM_COLUMNS}).reset_index()
+            stats['Source'] = stats['Source'].astype(str)  # Plain text, not the summary's categorical
+            stats.insert(0, 'Bank', bank)
+            source_stats.append(stats)
+
+        if not source_stats:
+            return pd.DataFrame(columns=['Bank', 'Source'] + SOURCE_SUM_COLUMNS)
+        return pd.concat(source_stats, ignore_index=True)
+
+
+class DuckDBOverview(PandasOverview):
+    """
+    Overview aggregations answered with SQL by an in-process DuckDB
+
+    The session's summaries are scanned in place (no conversion step) and
+    their date-filtered rows gathered once into a campaigns table, so every
+    aggregation is a single multi-threaded query across all banks.
+    """
+
+    def __init__(self, bank_data: Dict[str, Dict], date_range: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None):
+        self.bank_data = bank_data
+        self.banks = list(bank_data)
+        self.connection = duckdb.connect()
+
+        selects = []
+        for i, (bank, data) in enumerate(bank_data.items()):
+            self.connection.register(f"summary_{i}", data['summary'])
+            selects.append(f"SELECT ? AS Bank, {i} AS bank_order, * FROM summary_{i}")
+        where = ' WHERE "Date" BETWEEN ? AND ?' if date_range is not None else ''
+        parameters = self.banks + (list(date_range) if date_range is not None else [])
+
+        self.connection.execute(
+            "CREATE TEMP TABLE campaigns AS SELECT * FROM ("
+            + " UNION ALL BY NAME ".join(selects) + ")" + where,
+            parameters
+        )
+
+        # Sums of integer columns are cast back to integers, as pandas keeps them
+        self.integer_columns = {
+            column for column in SOURCE_SUM_COLUMNS
+            if all(pd.api.types.is_integer_dtype(data['summary'][column]) for data in bank_data.values())
+        }
+
+    def campaign_count(self) -> int:
+        """Number of campaigns across all banks"""
+        return self.connection.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+
+    def bank_stats(self) -> pd.DataFrame:
+        """
+        Per-bank totals and rates
+
+        Returns:
+            DataFrame with BANK_STAT_COLUMNS, one row per bank
+        """
+        df_stats = self.connection.execute("""
+            SELECT
+                bank_order,
+                CAST(TRUNC(SUM("Applications")) AS BIGINT) AS total_apps,
+                CAST(SUM("Total cost (₹)") AS DOUBLE) AS total_cost,
+                CAST(TRUNC(SUM("IPA Approved")) AS BIGINT) AS total_ipa_approved,
+                CAST(TRUNC(SUM("Card Out")) AS BIGINT) AS total_card_out,
+                CAST(TRUNC(SUM("Declined")) AS BIGINT) AS total_declined,
+                AVG("CTR (%)") AS avg_ctr,
+                COUNT(*) AS num_campaigns
+            FROM campaigns
+            GROUP BY bank_order
+        """).df().set_index('bank_order').reindex(range(len(self.banks)))
+
+        # Banks without campaigns in range report zeros, like get_summary_statistics()
+        df_stats = df_stats.fillna(0)
+        df_stats.insert(0, 'Bank', self.banks)
+        for column in ['total_apps', 'total_ipa_approved', 'total_card_out', 'total_declined', 'num_campaigns']:
+            df_stats[column] = df_stats[column].astype('int64')
+
+        apps = df_stats['total_apps'].where(df_stats['total_apps'] > 0)
+        ipa = df_stats['total_ipa_approved'].where(df_stats['total_ipa_approved'] > 0)
+        df_stats['avg_cpa'] = (df_stats['total_cost'] / apps).fillna(0.0)
+        df_stats['app_to_ipa_rate'] = (df_stats['total_ipa_approved'] / apps * 100).fillna(0.0)
+        df_stats['ipa_to_card_rate'] = (df_stats['total_card_out'] / ipa * 100).fillna(0.0)
+
+        return df_stats[BANK_STAT_COLUMNS].reset_index(drop=True)
+
+    def source_stats(self) -> pd.DataFrame:
+        """
+        Per-bank, per-source sums of SOURCE_SUM_COLUMNS
+
+        Returns:
+            DataFrame with Bank, Source and SOURCE_SUM_COLUMNS, ordered by bank then source
+        """
+        sums = ", ".join(
+            f"CAST(SUM({_quote(column)}) AS {'BIGINT' if column in self.integer_columns else 'DOUBLE'}) AS {_quote(column)}"
+            for column in SOURCE_SUM_COLUMNS
+        )
+        df_stats = self.connection.execute(f"""
+            SELECT Bank, CAST("Source" AS VARCHAR) AS "Source", {sums}
+            FROM campaigns
+            GROUP BY bank_order, Bank, "Source"
+            ORDER BY bank_order, "Source"
+        """).df()
+        return df_stats
+
+
+def get_overview(bank_data: Dict[str, Dict], date_range: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None,
+                 backend: str = ANALYTICS_BACKEND) -> PandasOverview:
+    """
+    Get the overview aggregations for the session's banks
+
+    Args:
+        bank_data: Session bank data (bank -> dict with 'summary')
+        date_range: Optional (start, end) Timestamps every summary is filtered to
+        backend: "duckdb" or "pandas" (DuckDB falls back to pandas when not installed)
+
+    Returns:
+        Overview with campaign_count(), bank_stats() and source_stats()
+    """
+    if backend == "duckdb" and duckdb is not None and bank_data:
+        return DuckDBOverview(bank_data, date_range)
+    return PandasOverview(bank_data, date_range)
@@ -0,0 +1,212 @@
+"""
+Processing cache module
+Disk-backed, size-bounded LRU cache of processed bank results keyed by content hashes
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from config.bank_config import CAMPAIGN_COSTS, PROCESSING_CACHE_DIR, PROCESSING_CACHE_MAX_BYTES
+
+# Bump when the layout of cached results changes so old entries are ignored
+CACHE_FORMAT_VERSION = 2
+
+# Array buffers in cache files start at multiples of this, so arrays mapped from them are aligned
+BUFFER_ALIGNMENT = 64
+
+
+def hash_bytes(data: bytes) -> str:
+    """Hash raw upload bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """Hash the contents of a DataFrame (values, column names and row order)"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    columns = json.dumps([str(col) for col in df.columns])
+    return hashlib.sha1(row_hashes.tobytes() + columns.encode("utf-8")).hexdigest()
+
+
+def hash_config(bank_config: Dict) -> str:
+    """Hash a bank configuration"""
+    return hashlib.sha1(json.dumps(bank_config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def processing_key(file_hash: str, df_identifiers: pd.DataFrame, bank_config: Dict) -> str:
+    """
+    Build the cache key of one processing run
+
+    Args:
+        file_hash: hash_bytes() of the uploaded MIS file
+        df_identifiers: Identifiers sheet used for the run
+        bank_config: Bank configuration used for the run
+
+    Returns:
+        Cache key (hex string)
+    """
+    # Channel costs are priced into the summary, so a cost edit is a different result too
+    parts = [
+        str(CACHE_FORMAT_VERSION), file_hash, hash_dataframe(df_identifiers), hash_config(bank_config),
+        hash_config(CAMPAIGN_COSTS)
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _align(offset: int) -> int:
+    return -(-offset // BUFFER_ALIGNMENT) * BUFFER_ALIGNMENT
+
+
+def dump_mapped(value: Any, file):
+    """
+    Pickle a value with its array buffers out of band, laid out to be memory-mapped
+
+    File layout: header length, pickled (payload, buffer layout) header, then
+    every NumPy/Arrow buffer at an aligned offset.
+
+    Args:
+        value: Picklable value
+        file: Binary file object to write to
+    """
+    buffers = []
+    payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    layout = []
+    offset = 0
+    for raw in raw_buffers:
+        offset = _align(offset)
+        layout.append((offset, raw.nbytes))
+        offset += raw.nbytes
+
+    header = pickle.dumps((payload, layout), protocol=5)
+    file.write(struct.pack("<Q", len(header)))
+    file.write(header)
+    position = 8 + len(header)
+    base = _align(position)
+    for (buffer_offset, _), raw in zip(layout, raw_buffers):
+        file.write(b"\0" * (base + buffer_offset - position))
+        file.write(raw)
+        position = base + buffer_offset + raw.nbytes
+
+
+def load_mapped(path: Path) -> Any:
+    """
+    Load a value written by dump_mapped, with its arrays backed by the memory-mapped file
+
+    Arrays are read-only and their pages are read on first touch; the mapping
+    stays valid after the file is deleted.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        Loaded value
+    """
+    with open(path, "rb") as mapped_file:
+        mapped = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    (header_length,) = struct.unpack_from("<Q", view)
+    payload, layout = pickle.loads(view[8:8 + header_length])
+    base = _align(8 + header_length)
+    return pickle.loads(payload, buffers=[view[base + offset:base + offset + size] for offset, size in layout])
+
+
+class ProcessingCache:
+    """
+    Pickled results on disk, evicted least recently used first
+
+    Every entry is one file named after its key, written by dump_mapped so a
+    hit maps the cached arrays instead of reading them in. A hit refreshes the
+    file's modification time, which is the recency used for eviction once the
+    directory grows past its size limit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize cache directory
+
+        Args:
+            directory: Directory holding the cache files
+            max_bytes: Total size the cache is trimmed back to after each write
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Load a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or an unreadable entry
+        """
+        path = self._path(key)
+        try:
+            value = load_mapped(path)
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry: drop it and treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, value: Any):
+        """
+        Store a value, then evict old entries beyond the size limit
+
+        Args:
+            key: Cache key
+            value: Picklable value
+        """
+        # Write to a temporary file first so readers never see a partial entry
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp_file:
+            dump_mapped(value, tmp_file)
+        os.replace(tmp_file.name, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue  # Still mapped by a reader on platforms that lock mapped files
+            total -= size
+
+
+@st.cache_resource
+def get_processing_cache() -> ProcessingCache:
+    """Get the process-wide processing cache"""
+    return ProcessingCache(PROCESSING_CACHE_DIR, PROCESSING_CACHE_MAX_BYTES)
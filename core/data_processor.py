@@ -3,20 +3,89 @@ Data processing module for campaign analytics
 Handles MIS data processing and campaign metric calculations
 """
 
+import copy
+import functools
+import hashlib
+import uuid
+import numpy as np
 import pandas as pd
 import streamlit as st
-from typing import Optional, Dict, Any, Tuple
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from utils.helpers import (
     find_column,
+    find_date_column,
     get_channel_cost,
     calculate_metrics,
-    normalize_dataframe_columns,
-    get_status_counts
+    round_array,
+    compact_dtypes,
+    memory_usage_bytes,
+    normalize_dataframe_columns
 )
+from core.matching import (
+    filter_pairs_by_key,
+    MISValueIndex,
+    MatchMatrix,
+    DEFAULT_MATCH_MODE,
+    DEFAULT_MATCH_ATTRIBUTION,
+    MATCH_ATTRIBUTIONS,
+    MATCH_STRATEGIES
+)
+from config.bank_config import CAMPAIGN_COSTS, MATCH_WORKERS, PROCESSING_ENGINE
+from core.parallel import build_match_pairs_parallel
+from core.cache import hash_config, hash_dataframe
+from core.delta import MISSnapshot, combine_hashes, hash_columns
+from core.matched_view import MatchedMISView
+from core.pipeline import StageCache, config_subset
+from core.status_codes import StatusCodebook, NUM_STATUS_CODES, bucket_counts
+
+
+# Bank config keys read by each pipeline stage: a config edit reruns the stages reading it and those downstream
+DATE_FILTER_CONFIG_KEYS = ("skip_mis_date_filter",)
+MATCH_CONFIG_KEYS = ("identifier_column", "match_mode", "secondary_identifiers")
+ATTRIBUTION_CONFIG_KEYS = ("match_attribution",)
+STATUS_CONFIG_KEYS = (
+    "status_column", "ipa_column", "ops_status_column",
+    "card_out_status", "declined_status", "ipa_approved_status", "inprogress_status", "ipa_card_issued_status"
+)
+
+# Summary text columns held as categoricals (few distinct values per bank)
+SUMMARY_CATEGORY_COLUMNS = ("Source", "Channel")
+
+
+def parse_mis_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse an MIS date column, trying common formats when inference fails
+
+    Args:
+        values: MIS date column
+
+    Returns:
+        Datetime Series (NaT where a value could not be parsed)
+    """
+    # Strategy 1: Try inferring format automatically
+    dates = pd.to_datetime(values, errors='coerce')
+
+    # Strategy 2: If most dates are invalid, try common formats
+    if dates.notna().sum() < len(values) * 0.5:  # Less than 50% parsed successfully
+        # Try DD-MM-YYYY format
+        dates = pd.to_datetime(dates, format='%d-%m-%Y', errors='coerce')
+
+        if dates.notna().sum() < len(values) * 0.5:
+            # Try DD/MM/YYYY format
+            dates = pd.to_datetime(dates, format='%d/%m/%Y', errors='coerce')
+
+    return dates
 
 
 class CampaignDataProcessor:
-    """Main class for processing campaign data"""
+    """
+    Main class for processing campaign data
+
+    Processing runs as a chain of cached stages (date filter → match →
+    attribution → status codes → counts → summary). Each stage is keyed by a
+    fingerprint of its inputs, so a refresh after an identifiers sheet or
+    bank config edit only reruns the stages downstream of the change.
+    """
 
     def __init__(self, bank_config):
         """
@@ -28,6 +97,22 @@ class CampaignDataProcessor:
         self.bank_config = bank_config
         self.df_summary = None
         self.df_matched_mis = None
+        self.match_matrix = None
+        self.status_codes = None
+        self.codebook = StatusCodebook(bank_config)
+        self.memory_usage = {}            # Frame name -> (bytes as built, bytes in compact dtypes)
+
+        # State kept between runs so refreshes can be incremental
+        self.df_mis_source = None         # Normalized upload (all rows)
+        self._upload_token = None         # Identifies the upload; roots the stage fingerprints
+        self._stages = StageCache()       # Last result of every pipeline stage
+        self._mis_fingerprints = {}       # Matching columns -> fingerprint of the upload
+        self._value_index = None          # (identifier column, MISValueIndex) of the upload
+        self._match_cache = {}            # Identifier row key -> matched upload row positions
+        self._match_cache_key = None      # (MIS fingerprint, match config fingerprint) of the match cache
+        self._match_keys = []             # (MIS column, match mode, blank matches any) of each secondary key in use
+        self._columns = None              # Identifier, status, IPA and OPS status columns found
+        self._snapshot = None             # Row hashes of the upload, for delta re-uploads
 
     def process_campaign_data(self, df_identifiers, df_mis):
         """
@@ -38,20 +123,303 @@ class CampaignDataProcessor:
             df_mis: DataFrame with MIS data
 
         Returns:
-            Tuple of (summary_df, matched_mis_df)
+            Tuple of (summary_df, matched_mis_view)
         """
-        # Normalize MIS columns
-        df_mis = normalize_dataframe_columns(df_mis)
+        # Normalize MIS columns; row positions in the upload identify MIS rows from here on
+        self.df_mis_source = normalize_dataframe_columns(df_mis).reset_index(drop=True)
+        self._upload_token = uuid.uuid4().hex
+        self._mis_fingerprints = {}
+        self._value_index = None
+        self._snapshot = None
 
-        # Filter MIS data by date range from identifiers (unless bank config skips this)
-        if not self.bank_config.get("skip_mis_date_filter", False):
-            df_mis = self._filter_mis_by_date_range(df_identifiers, df_mis)
+        return self._process(df_identifiers)
 
-            if df_mis is None or len(df_mis) == 0:
-                st.warning("⚠️ No MIS data found within the identifiers date range")
-                return None, None
+    def fork(self):
+        """
+        Copy of the processor that can be refreshed or fed a re-upload on its own
+
+        Processors shared between sessions are never modified; a session that
+        needs other results forks one instead. The upload, stage results and
+        cached matches are shared (they are replaced, never modified in place),
+        so only the containers of that state are copied.
+
+        Returns:
+            New processor with the same results
+        """
+        forked = copy.copy(self)
+        forked._stages = self._stages.copy()
+        forked._match_cache = dict(self._match_cache)
+        forked._mis_fingerprints = dict(self._mis_fingerprints)
+        forked.memory_usage = dict(self.memory_usage)
+        return forked
+
+    @property
+    def status_columns(self):
+        """Status, IPA and OPS status columns found in the MIS upload (None where missing)"""
+        return list(self._columns[1:]) if self._columns else []
+
+    def refresh(self, df_identifiers, bank_config=None):
+        """
+        Reprocess the current MIS upload after the identifiers sheet or bank config changed
+
+        Only stages whose inputs changed are rerun: identifier rows seen before
+        reuse their cached MIS matches, a status list edit only re-buckets the
+        upload, and a channel cost edit only rebuilds the summary.
+
+        Args:
+            df_identifiers: Current DataFrame with campaign identifiers
+            bank_config: Current bank configuration (None to keep the previous one)
+
+        Returns:
+            Tuple of (summary_df, matched_mis_view); current results if nothing changed
+        """
+        if self.df_mis_source is None:
+            return None, None
+
+        if bank_config is not None and bank_config != self.bank_config:
+            self.bank_config = bank_config
+            self.codebook = StatusCodebook(bank_config)
+
+        return self._process(df_identifiers)
+
+    def _process(self, df_identifiers):
+        """
+        Run the pipeline stages against the current MIS upload and build the summary
+        """
+        sheet_fingerprint = hash_dataframe(df_identifiers)
+
+        # Stage: filter MIS data by date range from identifiers (unless bank config skips this)
+        skip_date_filter = self.bank_config.get("skip_mis_date_filter", False)
+        date_range = None if skip_date_filter else self._identifier_date_range(df_identifiers)
+        df_mis, filter_fingerprint = self._stages.run(
+            "date_filter",
+            (self._upload_token, config_subset(self.bank_config, DATE_FILTER_CONFIG_KEYS), date_range),
+            lambda: self.df_mis_source if skip_date_filter else self._filter_mis_by_date_range(df_identifiers, self.df_mis_source)
+        )
+
+        if df_mis is None or len(df_mis) == 0:
+            st.warning("⚠️ No MIS data found within the identifiers date range")
+            return None, None
 
         # Find required columns
+        self._columns = self._find_columns(df_mis)
+        identifier_col, status_col, ipa_col, ops_status_col = self._columns
+
+        if not identifier_col:
+            st.error(f"❌ {self.bank_config['identifier_column']} column not found in MIS file")
+            return None, None
+
+        match_mode = self.bank_config.get("match_mode", DEFAULT_MATCH_MODE)
+        if match_mode not in MATCH_STRATEGIES:
+            st.error(f"❌ Unknown match mode '{match_mode}' in bank configuration")
+            return None, None
+
+        attribution = self.bank_config.get("match_attribution", DEFAULT_MATCH_ATTRIBUTION)
+        if attribution not in MATCH_ATTRIBUTIONS:
+            st.error(f"❌ Unknown match attribution '{attribution}' in bank configuration")
+            return None, None
+
+        identifiers = self._get_identifiers(df_identifiers)
+
+        # Stage: match against the whole upload (cached per identifier row)
+        pairs, match_fingerprint = self._stages.run(
+            "match", (self._upload_token, config_subset(self.bank_config, MATCH_CONFIG_KEYS), sheet_fingerprint),
+            lambda: self._match_campaigns(df_identifiers, identifiers, identifier_col, match_mode)
+        )
+        if pairs is None:
+            return None, None
+
+        # Stage: keep date-filtered matches and attribute shared MIS rows between campaigns
+        self.match_matrix, attribution_fingerprint = self._stages.run(
+            "attribution", (match_fingerprint, filter_fingerprint, attribution),
+            lambda: self._attribute(pairs, df_mis, identifiers, attribution)
+        )
+
+        # Stage: bucket every upload row once
+        source_status_codes, status_fingerprint = self._stages.run(
+            "status", self._status_stage_inputs(),
+            lambda: self._encode_statuses(self.df_mis_source)
+        )
+
+        # Stage: count all campaigns × codes in one bincount
+        counts, counts_fingerprint = self._stages.run(
+            "counts", (attribution_fingerprint, status_fingerprint, filter_fingerprint),
+            lambda: self._count_statuses(df_mis, source_status_codes, attribution)
+        )
+        self.status_codes = source_status_codes[df_mis.index.to_numpy()]
+
+        # Stage: build the whole summary column-wise (no per-campaign loop)
+        channel_costs = self._channel_costs(df_identifiers)
+        self.df_summary, _ = self._stages.run(
+            "summary", (counts_fingerprint, sheet_fingerprint, channel_costs),
+            lambda: self._build_summary(df_identifiers, identifiers, counts, channel_costs)
+        )
+
+        # Stage: matched MIS records stay as row positions into the base MIS until needed
+        self.df_matched_mis, _ = self._stages.run(
+            "matched_view", (attribution_fingerprint, sheet_fingerprint),
+            lambda: self._build_matched_view(df_identifiers, identifiers, df_mis, attribution)
+        )
+
+        return self.df_summary, self.df_matched_mis
+
+    def _status_stage_inputs(self):
+        """
+        Inputs of the status stage: the upload, the status columns and the status lists
+        """
+        return self._upload_token, self._columns[1:], config_subset(self.bank_config, STATUS_CONFIG_KEYS)
+
+    def _attribute(self, pairs, df_mis, identifiers, attribution):
+        """
+        Map upload-wide match pairs to date-filtered rows and attribute them
+        """
+        filtered_positions = np.full(len(self.df_mis_source), -1, dtype=np.int64)
+        filtered_positions[df_mis.index.to_numpy()] = np.arange(len(df_mis))
+        campaign_positions, mis_positions = pairs
+        mis_positions = filtered_positions[mis_positions]
+        in_range = mis_positions >= 0
+
+        return MatchMatrix(
+            campaign_positions[in_range], mis_positions[in_range], len(identifiers), len(df_mis)
+        ).attribute(attribution, identifiers)
+
+    def _count_statuses(self, df_mis, source_status_codes, attribution):
+        """
+        Count applications and status buckets per campaign from the attributed matches
+        """
+        status_codes = source_status_codes[df_mis.index.to_numpy()]
+        self._warn_missing_ipa_column(df_mis, *self._columns[2:], self.match_matrix.nnz)
+        buckets = bucket_counts(self.match_matrix.count_codes(status_codes, NUM_STATUS_CODES))
+        counts = {
+            'applications': self.match_matrix.row_sums(),
+            'card_out': buckets['card_out'],
+            'declined': buckets['declined'],
+            'ipa_approved': buckets['ipa_approved']
+        }
+        if attribution != "fractional":
+            counts = {name: values.astype(np.int64) for name, values in counts.items()}
+        return counts
+
+    def _build_matched_view(self, df_identifiers, identifiers, df_mis, attribution):
+        """
+        Build the lazy matched MIS view of the attributed matches
+        """
+        return MatchedMISView(
+            df_mis,
+            self.match_matrix.indices,
+            self.match_matrix.campaign_positions,
+            self._campaign_attributes(df_identifiers, identifiers),
+            self.match_matrix.data if attribution == "fractional" else None
+        )
+
+    def _campaign_attributes(self, df_identifiers, identifiers):
+        """
+        Build the per-campaign attribute table appended to matched MIS records
+        """
+        df_campaigns = pd.DataFrame({
+            'Matched_Identifier': identifiers,
+            'Campaign_Date': df_identifiers.get("Date", pd.Series("", index=df_identifiers.index)).to_numpy(),
+            'Campaign_Source': self._get_text_column(df_identifiers, "Source").to_numpy(),
+            'Campaign_Channel': self._get_text_column(df_identifiers, "Channel").to_numpy()
+        })
+        return compact_dtypes(
+            df_campaigns, category_columns=['Campaign_Source', 'Campaign_Channel'], downcast=False
+        )
+
+    def ingest_mis_delta(self, df_identifiers, df_mis):
+        """
+        Process a cumulative MIS re-upload by diffing it against the previous upload
+
+        Rows are paired with the previous upload by the bank's application key
+        (or by content when none is configured). Unchanged rows keep their
+        campaign matches and status codes; only added rows and rows whose
+        identifier, key or status columns changed are matched and bucketed.
+
+        Args:
+            df_identifiers: DataFrame with campaign identifiers
+            df_mis: DataFrame with the new (cumulative) MIS data
+
+        Returns:
+            Tuple of (summary_df, matched_mis_view)
+        """
+        df_new = normalize_dataframe_columns(df_mis).reset_index(drop=True)
+
+        # Without a previous run, or if the file layout changed, process from scratch
+        if (self.df_mis_source is None or self._columns is None or not self._columns[0]
+                or self._find_columns(df_new) != self._columns):
+            return self.process_campaign_data(df_identifiers, df_new)
+
+        identifier_col, status_col, ipa_col, ops_status_col = self._columns
+        snapshot_columns = [col for col in self._columns if col] + [key_mis_col for key_mis_col, _, _ in self._match_keys]
+        key_column = None
+        if self.bank_config.get("application_key_column"):
+            key_column = find_column(df_new, self.bank_config["application_key_column"])
+
+        if self._snapshot is None or self._snapshot.columns != snapshot_columns or self._snapshot.key_column != key_column:
+            self._snapshot = MISSnapshot(self.df_mis_source, snapshot_columns, key_column)
+        snapshot = MISSnapshot(df_new, snapshot_columns, key_column)
+
+        previous_positions = snapshot.align(self._snapshot)
+        kept_rows = np.flatnonzero(previous_positions >= 0)
+        delta_rows = np.flatnonzero(previous_positions < 0)
+
+        # Unchanged rows carry their status codes and matches over to their new positions
+        previous_status_codes, _ = self._stages.run(
+            "status", self._status_stage_inputs(),
+            lambda: self._encode_statuses(self.df_mis_source)
+        )
+        status_codes = np.zeros(len(df_new), dtype=np.int8)
+        status_codes[kept_rows] = previous_status_codes[previous_positions[kept_rows]]
+        status_codes[delta_rows] = self._encode_statuses(df_new.iloc[delta_rows])
+
+        new_positions = np.full(len(self.df_mis_source), -1, dtype=np.int64)
+        new_positions[previous_positions[kept_rows]] = kept_rows
+
+        # Match every cached identifier row against the delta rows only
+        row_keys = list(self._match_cache)
+        campaign_positions, mis_positions = self._match_pairs(
+            [row_key[0] for row_key in row_keys],
+            df_new[identifier_col].iloc[delta_rows],
+            self.bank_config.get("match_mode", DEFAULT_MATCH_MODE)
+        )
+        for i, (key_mis_col, key_mode, blank_matches_any) in enumerate(self._match_keys):
+            campaign_positions, mis_positions = filter_pairs_by_key(
+                campaign_positions, mis_positions,
+                [row_key[i + 1] for row_key in row_keys],
+                df_new[key_mis_col].iloc[delta_rows], key_mode, blank_matches_any
+            )
+        mis_positions = delta_rows[mis_positions]
+
+        bounds = np.searchsorted(campaign_positions, np.arange(len(row_keys) + 1))
+        match_cache = {}
+        for i, row_key in enumerate(row_keys):
+            carried = new_positions[self._match_cache[row_key]]
+            match_cache[row_key] = np.sort(np.concatenate([
+                carried[carried >= 0], mis_positions[bounds[i]:bounds[i + 1]]
+            ]))
+
+        # Swap in the new upload; everything derived from the old one is rebuilt lazily
+        self.df_mis_source = df_new
+        self._snapshot = snapshot
+        self._upload_token = uuid.uuid4().hex
+        self._stages.seed("status", self._status_stage_inputs(), status_codes)
+        self._mis_fingerprints = {}
+        self._value_index = None
+        self._match_cache = match_cache
+
+        # The snapshot already hashed the matching columns; fingerprint the new upload from them
+        match_columns = [identifier_col] + [key_mis_col for key_mis_col, _, _ in self._match_keys]
+        self._mis_fingerprints[tuple(match_columns)] = self._fingerprint_hashes(
+            combine_hashes(snapshot.column_hashes[column] for column in match_columns)
+        )
+        self._match_cache_key = (self._mis_fingerprint(match_columns), self._config_fingerprint())
+
+        return self._process(df_identifiers)
+
+    def _find_columns(self, df_mis):
+        """
+        Find the identifier, status, IPA and OPS status columns in an MIS DataFrame
+        """
         identifier_col = find_column(df_mis, self.bank_config["identifier_column"])
         status_col = find_column(df_mis, self.bank_config["status_column"])
         ipa_col = find_column(df_mis, self.bank_config.get("ipa_column", ""))
@@ -61,88 +429,223 @@ class CampaignDataProcessor:
         if "ops_status_column" in self.bank_config:
             ops_status_col = find_column(df_mis, self.bank_config["ops_status_column"])
 
-        if not identifier_col:
-            st.error(f"❌ {self.bank_config['identifier_column']} column not found in MIS file")
-            return None, None
+        return identifier_col, status_col, ipa_col, ops_status_col
 
-        output_rows = []
-        matched_mis_records = []
+    def _match_campaigns(self, df_identifiers, identifiers, identifier_col, match_mode):
+        """
+        Match identifier rows to upload rows, reusing cached matches for rows seen before
+
+        The cache is keyed by each row's matching values (identifier plus secondary
+        keys) and is dropped whenever the MIS upload or bank configuration changes.
 
-        # Process each campaign
-        for _, row in df_identifiers.iterrows():
-            campaign_data = self._process_single_campaign(
-                row, df_mis, identifier_col, status_col, ipa_col, ops_status_col
+        Returns:
+            Tuple of (campaign_positions, mis_positions) into the upload, or None on config errors
+        """
+        keys = self._secondary_keys(df_identifiers, self.df_mis_source)
+        if keys is None:
+            return None
+
+        self._match_keys = [key[1:] for key in keys]
+        mis_columns = [identifier_col] + [key_mis_col for key_mis_col, _, _ in self._match_keys]
+        cache_key = (self._mis_fingerprint(mis_columns), self._config_fingerprint())
+        if cache_key != self._match_cache_key:
+            self._match_cache = {}
+            self._match_cache_key = cache_key
+
+        row_keys = [
+            (identifier,) + tuple(key_values[position] for key_values, _, _, _ in keys)
+            for position, identifier in enumerate(identifiers)
+        ]
+        new_rows = [position for position, row_key in enumerate(row_keys) if row_key not in self._match_cache]
+
+        if new_rows:
+            campaign_positions, mis_positions = self._match_pairs(
+                [identifiers[position] for position in new_rows],
+                self.df_mis_source[identifier_col], match_mode, upload_column=True
             )
+            for key_values, key_mis_col, key_mode, blank_matches_any in keys:
+                campaign_positions, mis_positions = filter_pairs_by_key(
+                    campaign_positions, mis_positions,
+                    [key_values[position] for position in new_rows],
+                    self.df_mis_source[key_mis_col], key_mode, blank_matches_any
+                )
 
-            if campaign_data:
-                output_rows.append(campaign_data['summary'])
+            # Pairs are grouped by campaign, so each new row owns one contiguous slice
+            bounds = np.searchsorted(campaign_positions, np.arange(len(new_rows) + 1))
+            for i, position in enumerate(new_rows):
+                self._match_cache[row_keys[position]] = mis_positions[bounds[i]:bounds[i + 1]]
 
-                if campaign_data['matched_records'] is not None:
-                    matched_mis_records.append(campaign_data['matched_records'])
+        # Keep only rows still on the sheet
+        self._match_cache = {row_key: self._match_cache[row_key] for row_key in row_keys}
 
-        # Create summary DataFrame
-        self.df_summary = pd.DataFrame(output_rows)
-        self.df_summary['Date'] = pd.to_datetime(self.df_summary['Date'], format='%d-%m-%Y',errors='coerce')
+        matched_rows = [self._match_cache[row_key] for row_key in row_keys]
+        campaign_positions = np.repeat(
+            np.arange(len(row_keys), dtype=np.int64),
+            [len(rows) for rows in matched_rows]
+        )
+        mis_positions = np.concatenate(matched_rows) if matched_rows else np.empty(0, dtype=np.int64)
 
-        # Combine matched MIS records
-        if matched_mis_records:
-            self.df_matched_mis = pd.concat(matched_mis_records, ignore_index=True)
-            self.df_matched_mis = self._fix_duplicate_columns(self.df_matched_mis)
-        else:
-            self.df_matched_mis = pd.DataFrame()
+        return campaign_positions, mis_positions.astype(np.int64)
 
-        return self.df_summary, self.df_matched_mis
+    def _secondary_keys(self, df_identifiers, df_mis):
+        """
+        Resolve the composite key columns: each secondary identifier column must match as well
 
-    def _process_single_campaign(self, row, df_mis, identifier_col, status_col, ipa_col, ops_status_col):
+        Returns:
+            List of (sheet values, MIS column, match mode, blank matches any), or None on config errors
         """
-        Process a single campaign row
+        keys = []
+        for key in self.bank_config.get("secondary_identifiers", []):
+            key_mode = key.get("match_mode", DEFAULT_MATCH_MODE)
+            if key_mode not in MATCH_STRATEGIES:
+                st.error(f"❌ Unknown match mode '{key_mode}' for {key['mis_column']} in bank configuration")
+                return None
+
+            key_mis_col = find_column(df_mis, key["mis_column"])
+            key_sheet_col = find_column(df_identifiers, key["sheet_column"])
+            if not key_mis_col or not key_sheet_col:
+                st.warning(f"⚠️ {key['mis_column']} / {key['sheet_column']} not found, matching without it")
+                continue
+
+            # Strict keys compare the sheet value as written as well
+            if key_mode == "strict":
+                key_values = df_identifiers[key_sheet_col].map(str).tolist()
+            else:
+                key_values = self._get_text_column(df_identifiers, key_sheet_col).tolist()
+            keys.append((key_values, key_mis_col, key_mode, key.get("blank_matches_any", True)))
+        return keys
+
+    def _match_pairs(self, identifiers, mis_values, match_mode, upload_column=False):
         """
-        date = row.get("Date", "")
+        Match identifiers against an MIS identifier column
 
-        # Handle HDFC special case
-        if "LC Code" in row.index:
-            identifier = str(row.get("LC Code", "")).strip()
-        elif "Identifiers" in row.index:
-            identifier = str(row.get("Identifiers", "")).strip()
-        else:
-            identifier = ""
-
-        source = str(row.get("Source", "")).strip()
-        channel = str(row.get("Channel", "")).strip()
-        delivered = float(row.get("Delivered", 0))
-        clicks = float(row.get("Clicks", 0))
-        read_count = float(row.get("Read", 0))
-
-        cost_per_unit = get_channel_cost(channel)
-
-        # Filter MIS data
-        mask = df_mis[identifier_col].astype(str).str.contains(identifier, case=False, na=False)
-        df_filtered_mis = df_mis[mask]
-
-        matched_records = None
-        if len(df_filtered_mis) > 0:
-            matched_records = df_filtered_mis.copy()
-            matched_records['Matched_Identifier'] = identifier
-            matched_records['Campaign_Date'] = date
-            matched_records['Campaign_Source'] = source
-            matched_records['Campaign_Channel'] = channel
-
-        applications = len(df_filtered_mis)
-
-        status_metrics = self._calculate_status_metrics(
-            df_filtered_mis, status_col, ipa_col, ops_status_col
+        Args:
+            identifiers: Campaign identifiers
+            mis_values: MIS identifier column
+            match_mode: Name of the strategy in MATCH_STRATEGIES
+            upload_column: True when mis_values is a full column of the current upload,
+                whose distinct-value index is then built once and reused
+
+        Returns:
+            Tuple of (campaign_positions, mis_positions), grouped by campaign
+        """
+        value_index = None
+        if upload_column:
+            if self._value_index is None or self._value_index[0] != mis_values.name:
+                self._value_index = (mis_values.name, MISValueIndex(mis_values))
+            value_index = self._value_index[1]
+
+        return build_match_pairs_parallel(
+            identifiers, mis_values, match_mode,
+            workers=self.bank_config.get("match_workers", MATCH_WORKERS),
+            value_index=value_index
         )
 
+    def _encode_statuses(self, df_mis):
+        """
+        Encode every MIS row into a status bucket code
+
+        Args:
+            df_mis: MIS rows with the columns found by _find_columns()
+
+        Returns:
+            int8 array of bucket codes, one per row
+        """
+        return self.codebook.encode(df_mis, *self._columns[1:])
+
+    def _mis_fingerprint(self, columns):
+        """
+        Fingerprint the matching columns of the current MIS upload (hashed once per upload)
+        """
+        columns = tuple(columns)
+        if columns not in self._mis_fingerprints:
+            self._mis_fingerprints[columns] = self._fingerprint_hashes(hash_columns(self.df_mis_source, list(columns)))
+        return self._mis_fingerprints[columns]
+
+    @staticmethod
+    def _fingerprint_hashes(row_hashes):
+        """
+        Reduce per-row hashes to one fingerprint string
+        """
+        return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+    def _config_fingerprint(self):
+        """
+        Fingerprint the bank configuration keys that affect matching
+        """
+        return hash_config(config_subset(self.bank_config, MATCH_CONFIG_KEYS))
+
+    def _identifier_date_range(self, df_identifiers):
+        """
+        Get the (min, max) campaign date of the identifiers sheet, or None without valid dates
+        """
+        identifier_dates = pd.to_datetime(df_identifiers.get("Date", pd.Series(dtype=object)), errors='coerce').dropna()
+        return (identifier_dates.min(), identifier_dates.max()) if len(identifier_dates) else None
+
+    def _get_identifiers(self, df_identifiers):
+        """
+        Extract campaign identifiers from the identifiers sheet
+        """
+        # Handle HDFC special case
+        if "LC Code" in df_identifiers.columns:
+            return self._get_text_column(df_identifiers, "LC Code").tolist()
+        if "Identifiers" in df_identifiers.columns:
+            return self._get_text_column(df_identifiers, "Identifiers").tolist()
+        return [""] * len(df_identifiers)
+
+    def _get_text_column(self, df, column):
+        """
+        Get a stripped string column, or empty strings if it is missing
+        """
+        if column not in df.columns:
+            return pd.Series("", index=df.index)
+        return df[column].map(str).str.strip()
+
+    def _get_numeric_column(self, df, column):
+        """
+        Get a float column, or zeros if it is missing
+        """
+        if column not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        return df[column].astype(float)
+
+    def _channel_costs(self, df_identifiers):
+        """
+        Resolve the cost of every distinct channel on the identifiers sheet
+
+        The cost table is passed explicitly so edited costs are not served from the lookup cache.
+        """
+        channels = self._get_text_column(df_identifiers, "Channel").unique()
+        return {name: get_channel_cost(name, CAMPAIGN_COSTS) for name in channels}
+
+    def _build_summary(self, df_identifiers, identifiers, counts, channel_costs):
+        """
+        Build the campaign summary for all campaigns at once from attributed MIS counts
+        """
+        source = self._get_text_column(df_identifiers, "Source")
+        channel = self._get_text_column(df_identifiers, "Channel")
+        delivered = self._get_numeric_column(df_identifiers, "Delivered").to_numpy()
+        clicks = self._get_numeric_column(df_identifiers, "Clicks").to_numpy()
+        read_count = self._get_numeric_column(df_identifiers, "Read").to_numpy()
+
+        cost_per_unit = channel.map(channel_costs).to_numpy(dtype=float)
+
+        status_metrics = self._calculate_status_metrics(counts)
+
+        # Scapia's card-issued IPA count was a Python int (len), so its IPA metrics used round()
+        ops_status_col = self._columns[3] if self._columns else None
+        uses_card_issued_rule = self.codebook.uses_card_issued_rule and ops_status_col
         perf_metrics = calculate_metrics(
             delivered, clicks, read_count, cost_per_unit,
-            applications, status_metrics['ipa_approved'], status_metrics['card_out']
+            counts['applications'], status_metrics['ipa_approved'], status_metrics['card_out'],
+            ipa_round=round_array if uses_card_issued_rule else np.round
         )
 
-        summary = {
-            "Date": date,
-            "Campaign name": identifier,
-            "Source": source,
-            "Applications": applications,
+        df_summary = pd.DataFrame({
+            "Date": df_identifiers.get("Date", pd.Series("", index=df_identifiers.index)).to_numpy(),
+            "Campaign name": identifiers,
+            "Source": source.to_numpy(),
+            "Applications": counts['applications'],
             "IPA Approved": status_metrics['ipa_approved'],
             "Declined": status_metrics['declined'],
             "In Progress": status_metrics['in_progress'],
@@ -154,77 +657,41 @@ class CampaignDataProcessor:
             "Read Rate (%)": perf_metrics['read_rate'],
             "CPC (₹)": perf_metrics['cpc'],
             "Cost per unit (₹)": cost_per_unit,
-            "Total cost (₹)": float(perf_metrics['total_cost']),
-            "Cost per Application (₹)": float(perf_metrics['cost_per_app']),
-            "Cost per IPA (₹)": float(perf_metrics['cost_per_ipa']),
-            "Cost per Card Out (₹)": float(perf_metrics['cost_per_card']),
-            "Channel": channel
-        }
-
-        return {
-            'summary': summary,
-            'matched_records': matched_records
-        }
-
-    def _calculate_status_metrics(self, df_filtered, status_col, ipa_col, ops_status_col):
+            "Total cost (₹)": perf_metrics['total_cost'],
+            "Cost per Application (₹)": perf_metrics['cost_per_app'],
+            "Cost per IPA (₹)": perf_metrics['cost_per_ipa'],
+            "Cost per Card Out (₹)": perf_metrics['cost_per_card'],
+            "Channel": channel.to_numpy()
+        })
+        df_summary['Date'] = pd.to_datetime(df_summary['Date'], format='%d-%m-%Y', errors='coerce')
+
+        # Counts and costs keep their dtypes: the dashboard does arithmetic on them
+        memory_before = memory_usage_bytes(df_summary)
+        df_summary = compact_dtypes(df_summary, category_columns=SUMMARY_CATEGORY_COLUMNS, downcast=False)
+        self.memory_usage['Summary'] = (memory_before, memory_usage_bytes(df_summary))
+
+        return df_summary
+
+    def _warn_missing_ipa_column(self, df_mis, ipa_col, ops_status_col, num_matches):
         """
-        Calculate status-based metrics (card out, declined, IPA approved)
+        Warn once when the IPA column is missing (IPA Approved then stays 0)
         """
-        applications = len(df_filtered)
-        card_out = 0
-        declined = 0
-        ipa_approved = 0
-
-        # Card Out calculation
-        # For Scapia, always use status_column even if ops_status_column exists
-        if "ipa_card_issued_status" in self.bank_config:
-            # Scapia: Card Out from status_column
-            if status_col and status_col in df_filtered.columns:
-                card_out = get_status_counts(
-                    df_filtered, status_col, self.bank_config["card_out_status"]
-                )
-        elif ops_status_col and ops_status_col in df_filtered.columns:
-            # Other banks: Try ops_status_column first
-            card_out = get_status_counts(
-                df_filtered, ops_status_col, self.bank_config["card_out_status"]
-            )
-        elif status_col and status_col in df_filtered.columns:
-            # Fallback to status_column
-            card_out = get_status_counts(
-                df_filtered, status_col, self.bank_config["card_out_status"]
-            )
-
-        # Declined calculation
-        if status_col and status_col in df_filtered.columns:
-            declined = get_status_counts(
-                df_filtered, status_col, self.bank_config["declined_status"]
-            )
-
-        # IPA Approved calculation - Special logic for Scapia
-        # Scapia: IPA = card_issued = "ISSUED" AND current_status = "IN_PROGRESS"
-        if "ipa_card_issued_status" in self.bank_config and ops_status_col:
-            # This is Scapia - use special logic
-            # IPA = card_issued = "ISSUED" AND current_status = "IN_PROGRESS"
-            if status_col and status_col in df_filtered.columns and ops_status_col and ops_status_col in df_filtered.columns:
-                ipa_approved = len(df_filtered[
-                    (df_filtered[ops_status_col].astype(str).str.upper() == "ISSUED") &
-                    (df_filtered[status_col].astype(str).str.upper() == "IN_PROGRESS")
-                ])
-            else:
-                ipa_approved = 0
-        else:
-            # Standard IPA calculation for other banks
-            if ipa_col and ipa_col in df_filtered.columns:
-                ipa_approved = get_status_counts(
-                    df_filtered, ipa_col, self.bank_config["ipa_approved_status"]
-                )
-            else:
-                # FIX: If IPA column not found, set to 0 instead of card_out
-                # This prevents showing same numbers for Applications and Card Out
-                ipa_approved = 0
-                # Optionally log this for debugging
-                if len(df_filtered) > 0:
-                    st.warning(f"⚠️ IPA column '{self.bank_config.get('ipa_column', 'N/A')}' not found in MIS data. IPA Approved will be set to 0.")
+        if self.codebook.uses_card_issued_rule and ops_status_col:
+            return
+        if ipa_col and ipa_col in df_mis.columns:
+            return
+        # FIX: If IPA column not found, IPA stays 0 instead of card_out
+        # This prevents showing same numbers for Applications and Card Out
+        if num_matches > 0:
+            st.warning(f"⚠️ IPA column '{self.bank_config.get('ipa_column', 'N/A')}' not found in MIS data. IPA Approved will be set to 0.")
+
+    def _calculate_status_metrics(self, counts):
+        """
+        Calculate status-based metrics (card out, declined, IPA approved, in progress)
+        for all campaigns at once from per-campaign count arrays
+        """
+        card_out = counts['card_out']
+        declined = counts['declined']
 
         # CRITICAL FIX: In Progress calculation
         # Applications = Total count of MIS records
@@ -236,20 +703,18 @@ class CampaignDataProcessor:
         # The correct hierarchy is:
         # Applications = Card Out + Declined + In Progress
         # (IPA Approved overlaps with Card Out and In Progress, it's not a separate bucket)
-        in_progress = applications - card_out - declined
-
         # Ensure in_progress doesn't go negative (data quality issue)
-        if in_progress < 0:
-            in_progress = 0
+        in_progress = np.maximum(counts['applications'] - card_out - declined, 0)
 
         return {
             'card_out': card_out,
             'declined': declined,
-            'ipa_approved': ipa_approved,
+            'ipa_approved': counts['ipa_approved'],
             'in_progress': in_progress
         }
 
-    def get_summary_statistics(self, df_filtered: pd.DataFrame) -> Dict[str, Any]:
+    @staticmethod
+    def get_summary_statistics(df_filtered: pd.DataFrame) -> Dict[str, Any]:
         """
         Calculate aggregate statistics for filtered data (optimized)
 
@@ -260,7 +725,7 @@ class CampaignDataProcessor:
             Dictionary with summary statistics
         """
         if df_filtered is None or len(df_filtered) == 0:
-            return self._empty_statistics()
+            return CampaignDataProcessor._empty_statistics()
 
         # Work on a copy to avoid modifying original
         df_work = df_filtered.copy()
@@ -305,7 +770,8 @@ class CampaignDataProcessor:
             "num_campaigns": len(df_work)
         }
 
-    def _empty_statistics(self):
+    @staticmethod
+    def _empty_statistics():
         """Return empty statistics dictionary"""
         return {
             'total_apps': 0,
@@ -320,17 +786,6 @@ class CampaignDataProcessor:
             'num_campaigns': 0
         }
 
-    def _fix_duplicate_columns(self, df):
-        """
-        Fix duplicate column names in DataFrame
-        """
-        cols = pd.Series(df.columns)
-        for dup in cols[cols.duplicated()].unique():
-            indices = cols[cols == dup].index.values.tolist()
-            cols[indices] = [f"{dup}_{i}" if i != 0 else dup for i in range(len(indices))]
-        df.columns = cols
-        return df
-
     def _filter_mis_by_date_range(self, df_identifiers, df_mis):
         """
         Filter MIS data based on the date range present in identifiers sheet
@@ -362,23 +817,7 @@ class CampaignDataProcessor:
             st.info(f"📅 Filtering MIS data from {min_date.strftime('%d-%m-%Y')} to {max_date.strftime('%d-%m-%Y')}")
 
             # Find date column in MIS data
-            # Common date column names in MIS files
-            date_column_patterns = [
-                'date', 'application_date', 'app_date', 'created_date',
-                'submission_date', 'lead_date', 'application date',
-                'created date', 'app date', 'lead date', 'timestamp',
-                'created_at', 'application_timestamp', 'login date'
-            ]
-
-            mis_date_col = None
-            for col in df_mis.columns:
-                col_lower = str(col).lower().strip()
-                for pattern in date_column_patterns:
-                    if pattern in col_lower:
-                        mis_date_col = col
-                        break
-                if mis_date_col:
-                    break
+            mis_date_col = find_date_column(df_mis)
 
             if mis_date_col is None:
                 st.warning("⚠️ No date column found in MIS data, skipping date filtering. Processing all MIS records.")
@@ -386,25 +825,9 @@ class CampaignDataProcessor:
 
             # Convert MIS date column to datetime with multiple format attempts
             df_mis_copy = df_mis.copy()
-
-            # Try multiple date parsing strategies
-            date_parsed = False
-
-            # Strategy 1: Try inferring format automatically
-            df_mis_copy[mis_date_col] = pd.to_datetime(df_mis_copy[mis_date_col], errors='coerce')
+            df_mis_copy[mis_date_col] = parse_mis_dates(df_mis_copy[mis_date_col])
             valid_dates = df_mis_copy[mis_date_col].notna().sum()
 
-            # Strategy 2: If most dates are invalid, try common formats
-            if valid_dates < len(df_mis_copy) * 0.5:  # Less than 50% parsed successfully
-                # Try DD-MM-YYYY format
-                df_mis_copy[mis_date_col] = pd.to_datetime(df_mis_copy[mis_date_col], format='%d-%m-%Y', errors='coerce')
-                valid_dates = df_mis_copy[mis_date_col].notna().sum()
-
-                if valid_dates < len(df_mis_copy) * 0.5:
-                    # Try DD/MM/YYYY format
-                    df_mis_copy[mis_date_col] = pd.to_datetime(df_mis_copy[mis_date_col], format='%d/%m/%Y', errors='coerce')
-                    valid_dates = df_mis_copy[mis_date_col].notna().sum()
-
             # Check if we have any valid dates
             if valid_dates == 0:
                 st.warning(f"⚠️ Could not parse dates in column '{mis_date_col}'. Processing all MIS records.")
@@ -461,3 +884,67 @@ class CampaignDataProcessor:
             df_filtered = df_filtered[df_filtered['Campaign name'] == campaign]
 
         return df_filtered
+
+
+def create_processor(bank_config, engine=PROCESSING_ENGINE):
+    """
+    Create a campaign processor for the configured processing engine
+
+    Args:
+        bank_config: Bank-specific configuration dictionary
+        engine: "pandas" or "polars" (Polars falls back to pandas when not installed)
+
+    Returns:
+        CampaignDataProcessor (or its Polars subclass)
+    """
+    if engine == "polars":
+        from core.polars_processor import PolarsCampaignDataProcessor, pl
+        if pl is not None:
+            return PolarsCampaignDataProcessor(bank_config)
+    return CampaignDataProcessor(bank_config)
+
+
+def required_mis_columns(bank_config, columns) -> List:
+    """
+    Pick the MIS columns processing reads, resolved with the same rules as processing
+
+    Args:
+        bank_config: Bank-specific configuration dictionary
+        columns: Column names of the MIS header row
+
+    Returns:
+        Columns holding the identifier, statuses, date, secondary and
+        application keys, plus the bank's export_columns
+    """
+    df_header = pd.DataFrame(columns=columns)
+    keywords = [
+        bank_config["identifier_column"],
+        bank_config["status_column"],
+        bank_config.get("ipa_column", ""),
+    ]
+    if "ops_status_column" in bank_config:
+        keywords.append(bank_config["ops_status_column"])
+    keywords.extend(key["mis_column"] for key in bank_config.get("secondary_identifiers", []))
+    if bank_config.get("application_key_column"):
+        keywords.append(bank_config["application_key_column"])
+    keywords.extend(bank_config.get("export_columns", []))
+
+    selected = [find_column(df_header, keyword) for keyword in keywords]
+    selected.append(find_date_column(df_header))
+    return [col for col in selected if col is not None]
+
+
+def mis_column_selector(bank_config) -> Optional[Callable[[List], List]]:
+    """
+    Get the column selector for projected MIS parsing, if the bank enables it
+
+    Args:
+        bank_config: Bank-specific configuration dictionary
+
+    Returns:
+        Picklable function picking the columns to parse from the MIS header,
+        or None to parse every column
+    """
+    if not bank_config.get("project_mis_columns"):
+        return None
+    return functools.partial(required_mis_columns, bank_config)
@@ -0,0 +1,119 @@
+"""
+MIS delta module
+Diffs a re-uploaded (cumulative) MIS file against the previous upload of the same bank
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional
+
+
+# Hash of a missing value and the multiplier used to combine column hashes
+MISSING_HASH = np.uint64(0x9E3779B97F4A7C15)
+HASH_MULTIPLIER = np.uint64(1000003)
+
+
+def hash_column(values: pd.Series) -> np.ndarray:
+    """
+    Hash a column into one uint64 per row
+
+    Text columns are factorized first so only distinct values are hashed;
+    hashes depend on values alone, so they are comparable across uploads.
+
+    Args:
+        values: Column to hash
+
+    Returns:
+        uint64 array with one hash per row
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return pd.util.hash_array(values.to_numpy(), categorize=False)
+
+    codes, uniques = pd.factorize(values)
+    value_hashes = pd.util.hash_array(np.asarray(uniques, dtype=object), categorize=False)
+    return np.where(codes >= 0, value_hashes[codes], MISSING_HASH)
+
+
+def combine_hashes(column_hashes: Iterable[np.ndarray]) -> np.ndarray:
+    """Combine per-column row hashes into one hash per row (order sensitive)"""
+    combined = None
+    for hashes in column_hashes:
+        combined = hashes.copy() if combined is None else combined * HASH_MULTIPLIER ^ hashes
+    return combined
+
+
+def hash_columns(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Hash the values of some columns into one uint64 per row
+
+    Args:
+        df: DataFrame to hash
+        columns: Columns to include
+
+    Returns:
+        uint64 array with one hash per row
+    """
+    if not columns:
+        return np.zeros(len(df), dtype=np.uint64)
+    return combine_hashes(hash_column(df[column]) for column in columns)
+
+
+class MISSnapshot:
+    """
+    Row hashes of an MIS upload over the columns that affect campaign results
+
+    Rows are identified by the bank's application key column when one is
+    configured, otherwise by their content. Repeated keys are told apart by
+    their occurrence number, so duplicate rows pair up one to one.
+    """
+
+    def __init__(self, df_mis: pd.DataFrame, columns: List[str], key_column: Optional[str] = None):
+        """
+        Hash every row of an upload
+
+        Args:
+            df_mis: Normalized MIS DataFrame
+            columns: Columns whose changes affect results (identifier, keys, statuses)
+            key_column: Application key column (None to identify rows by content)
+        """
+        self.columns = list(columns)
+        self.key_column = key_column
+        self.column_hashes = {column: hash_column(df_mis[column]) for column in self.columns}
+        self.content = combine_hashes(self.column_hashes.values())
+
+        if key_column:
+            keys = hash_column(df_mis[key_column])
+        else:
+            keys = self.content
+
+        if pd.Index(keys).is_unique:
+            self.keys = keys
+        else:
+            occurrence = pd.Series(keys).groupby(keys).cumcount().to_numpy()
+            self.keys = keys * HASH_MULTIPLIER ^ pd.util.hash_array(occurrence, categorize=False)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def align(self, previous: "MISSnapshot") -> np.ndarray:
+        """
+        Find where every unchanged row of this upload sat in the previous upload
+
+        Args:
+            previous: Snapshot of the previous upload
+
+        Returns:
+            int64 array with one entry per row: its position in the previous
+            upload, or -1 for rows that were added or changed
+        """
+        previous_keys = pd.Index(previous.keys)
+        if not previous_keys.is_unique:
+            # Hash collision: treat every row as changed
+            return np.full(len(self), -1, dtype=np.int64)
+
+        positions = previous_keys.get_indexer(self.keys).astype(np.int64)
+        found = positions >= 0
+        unchanged = found.copy()
+        unchanged[found] = previous.content[positions[found]] == self.content[found]
+
+        return np.where(unchanged, positions, -1)
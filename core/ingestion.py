@@ -0,0 +1,177 @@
+"""
+Ingestion module
+Parses and processes uploaded MIS files for several banks concurrently in the shared process pool
+"""
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Callable, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from config.bank_config import PARSE_WORKERS
+from core.data_processor import create_processor
+from core.parallel import get_process_pool
+from utils.helpers import compact_dtypes, memory_usage_bytes, read_mis_file
+
+# Streamlit message calls made while processing; workers record them for the session to show
+MESSAGE_TYPES = ("error", "warning", "info")
+
+
+def _parse_mis_bytes(
+    data: bytes, file_name: str, sheet_name=0, select_columns: Optional[Callable[[List], List]] = None,
+    header_keywords=None
+) -> Tuple[pd.DataFrame, Tuple[int, int]]:
+    """
+    Worker task: parse an uploaded MIS file from its raw bytes into compact dtypes
+
+    Args:
+        data: File contents
+        file_name: Original file name (selects the reader engine)
+        sheet_name: Sheet name or index (only for Excel files)
+        select_columns: Optional function picking the columns to parse from the header (see mis_column_selector)
+        header_keywords: Keywords of a column the workbook header row must contain (locates sheet and header)
+
+    Returns:
+        Tuple of (parsed MIS DataFrame, (bytes as parsed, bytes after compacting))
+    """
+    buffer = BytesIO(data)
+    buffer.name = file_name
+    df_mis = read_mis_file(
+        buffer, sheet_name=sheet_name, select_columns=select_columns, header_keywords=header_keywords
+    )
+    memory_before = memory_usage_bytes(df_mis)
+    df_mis = compact_dtypes(df_mis)
+    return df_mis, (memory_before, memory_usage_bytes(df_mis))
+
+
+@contextmanager
+def _recorded_messages():
+    """Record Streamlit messages instead of showing them (worker processes have no session)"""
+    messages = []
+    originals = {kind: getattr(st, kind) for kind in MESSAGE_TYPES}
+    for kind in MESSAGE_TYPES:
+        setattr(st, kind, lambda *args, _kind=kind, **kwargs: messages.append((_kind, args, kwargs)))
+    try:
+        yield messages
+    finally:
+        for kind, function in originals.items():
+            setattr(st, kind, function)
+
+
+def replay_messages(messages: List[Tuple[str, tuple, dict]]):
+    """
+    Show messages recorded by a worker in the current container
+
+    Args:
+        messages: (message type, args, kwargs) in the order they were raised
+    """
+    for kind, args, kwargs in messages:
+        getattr(st, kind)(*args, **kwargs)
+
+
+def process_mis(df_identifiers: pd.DataFrame, df_mis: pd.DataFrame, bank_config, previous_processor=None):
+    """
+    Match a parsed MIS file against the identifiers sheet
+
+    A re-upload for a loaded bank is diffed against a fork of its previous
+    processor, so only changed rows are matched again.
+
+    Args:
+        df_identifiers: DataFrame with campaign identifiers
+        df_mis: Parsed MIS DataFrame
+        bank_config: Bank-specific configuration dictionary
+        previous_processor: Processor of the bank's previous upload, if any
+
+    Returns:
+        Tuple of (processor, summary DataFrame or None if processing failed)
+    """
+    if previous_processor is not None:
+        processor = previous_processor.fork()
+        df_summary, _ = processor.ingest_mis_delta(df_identifiers, df_mis)
+    else:
+        processor = create_processor(bank_config)
+        df_summary, _ = processor.process_campaign_data(df_identifiers, df_mis)
+    return processor, df_summary
+
+
+def _parse_and_process_mis_bytes(
+    data: bytes, file_name: str, sheet_name, select_columns, header_keywords,
+    df_identifiers: pd.DataFrame, bank_config, previous_processor
+):
+    """
+    Worker task: parse an uploaded MIS file and process it for one bank
+
+    Returns:
+        Tuple of (processor, summary DataFrame or None, MIS memory usage, recorded messages)
+    """
+    df_mis, mis_memory_usage = _parse_mis_bytes(data, file_name, sheet_name, select_columns, header_keywords)
+    with _recorded_messages() as messages:
+        processor, df_summary = process_mis(df_identifiers, df_mis, bank_config, previous_processor)
+    return processor, df_summary, mis_memory_usage, messages
+
+
+def submit_mis_parse(
+    uploaded_file, sheet_name=0, select_columns: Optional[Callable[[List], List]] = None, header_keywords=None
+) -> Future:
+    """
+    Start parsing an uploaded MIS file in the background
+
+    Excel parsing is pure Python and holds the GIL, so files are parsed in
+    worker processes. The pool starts a worker per queued job, up to
+    PARSE_WORKERS. Workers also convert the MIS to compact dtypes (Arrow
+    strings, categoricals, downcast numerics), which shrinks both the session
+    copy and the transfer. With a column selector only the columns it picks
+    are parsed at all. Workbooks are probed before the parse, so a missing
+    sheet or header column fails within milliseconds instead of after
+    parsing every cell.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile (or any file object with name and getvalue)
+        sheet_name: Sheet name or index (only for Excel files)
+        select_columns: Optional picklable function picking the columns to parse from the header
+        header_keywords: Keywords of a column the workbook header row must contain (e.g. the identifier column)
+
+    Returns:
+        Future resolving to (MIS DataFrame, (bytes as parsed, bytes compacted)); raises on parse errors
+    """
+    pool = get_process_pool(PARSE_WORKERS)
+    return pool.submit(
+        _parse_mis_bytes, uploaded_file.getvalue(), uploaded_file.name, sheet_name, select_columns, header_keywords
+    )
+
+
+def submit_mis_processing(
+    uploaded_file, df_identifiers: pd.DataFrame, bank_config, previous_processor=None, sheet_name=0,
+    select_columns: Optional[Callable[[List], List]] = None, header_keywords=None
+) -> Future:
+    """
+    Start parsing and processing an uploaded MIS file in the background
+
+    Used when several banks are uploaded together: each bank's whole job
+    (parse, match, bucket, summarize) runs in its own worker, so total wall
+    time tracks the slowest bank rather than the sum of their matching runs.
+    A worker matches its bank serially (see build_match_pairs_parallel).
+    Messages the processing raises are recorded and returned for
+    replay_messages; results are applied to the session by the caller.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile (or any file object with name and getvalue)
+        df_identifiers: DataFrame with campaign identifiers
+        bank_config: Bank-specific configuration dictionary
+        previous_processor: Processor of the bank's previous upload, if any (the re-upload is diffed against it)
+        sheet_name: Sheet name or index (only for Excel files)
+        select_columns: Optional picklable function picking the columns to parse from the header
+        header_keywords: Keywords of a column the workbook header row must contain (e.g. the identifier column)
+
+    Returns:
+        Future resolving to (processor, summary DataFrame or None, MIS memory usage, recorded messages);
+        raises on parse errors
+    """
+    pool = get_process_pool(PARSE_WORKERS)
+    return pool.submit(
+        _parse_and_process_mis_bytes, uploaded_file.getvalue(), uploaded_file.name, sheet_name, select_columns,
+        header_keywords, df_identifiers, bank_config, previous_processor
+    )
@@ -0,0 +1,115 @@
+"""
+Matched MIS view module
+Lazy, index-based view of the MIS records matched to campaigns
+"""
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+# Campaign attribute columns appended to every materialized MIS record
+CAMPAIGN_ATTRIBUTE_COLUMNS = ['Matched_Identifier', 'Campaign_Date', 'Campaign_Source', 'Campaign_Channel']
+
+
+class MatchedMISView:
+    """
+    Matched MIS records kept as row positions into the base MIS
+
+    Instead of copying every matched MIS row per campaign, the view stores the
+    match pairs (MIS row position, campaign position), a reference to the base
+    MIS and a small per-campaign attribute table. Records are only built when
+    the detail view or an export asks for them, and only with the requested
+    columns.
+    """
+
+    def __init__(self, df_mis: pd.DataFrame, row_positions: np.ndarray,
+                 campaign_positions: np.ndarray, df_campaigns: pd.DataFrame,
+                 weights: Optional[np.ndarray] = None):
+        """
+        Initialize view over the base MIS
+
+        Args:
+            df_mis: Base MIS DataFrame (shared, never copied)
+            row_positions: MIS row position of each matched record
+            campaign_positions: Campaign position of each matched record
+            df_campaigns: One row per campaign with CAMPAIGN_ATTRIBUTE_COLUMNS
+            weights: Optional attribution weight of each matched record
+        """
+        self.df_mis = df_mis
+        self.row_positions = row_positions
+        self.campaign_positions = campaign_positions
+        self.df_campaigns = df_campaigns
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.row_positions)
+
+    @property
+    def empty(self) -> bool:
+        """True when no MIS records are matched"""
+        return len(self) == 0
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns of the materialized records"""
+        columns = list(self.df_mis.columns) + CAMPAIGN_ATTRIBUTE_COLUMNS
+        if self.weights is not None:
+            columns.append('Match_Weight')
+        return columns
+
+    def _subset(self, mask: np.ndarray) -> "MatchedMISView":
+        """Create a view over a subset of the matched records"""
+        return MatchedMISView(
+            self.df_mis,
+            self.row_positions[mask],
+            self.campaign_positions[mask],
+            self.df_campaigns,
+            None if self.weights is None else self.weights[mask]
+        )
+
+    def filter_identifiers(self, identifiers) -> "MatchedMISView":
+        """
+        Keep only records matched by the given campaign identifiers
+
+        Args:
+            identifiers: Campaign identifiers to keep
+
+        Returns:
+            Filtered MatchedMISView (no data is copied)
+        """
+        campaign_mask = self.df_campaigns['Matched_Identifier'].isin(identifiers).to_numpy()
+        return self._subset(campaign_mask[self.campaign_positions])
+
+    def materialize(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Build the matched MIS records as a DataFrame
+
+        Args:
+            columns: Columns to include (defaults to all columns)
+
+        Returns:
+            DataFrame with one row per matched record
+        """
+        if columns is None:
+            columns = self.columns
+
+        column_positions = [i for i, col in enumerate(self.df_mis.columns) if col in columns]
+        df_records = self.df_mis.iloc[self.row_positions, column_positions].reset_index(drop=True)
+
+        attribute_columns = [col for col in CAMPAIGN_ATTRIBUTE_COLUMNS if col in columns]
+        df_attributes = self.df_campaigns[attribute_columns].take(self.campaign_positions)
+        for col in attribute_columns:
+            df_records[col] = df_attributes[col].to_numpy()
+
+        if self.weights is not None and 'Match_Weight' in columns:
+            df_records['Match_Weight'] = self.weights
+
+        return df_records
+
+    def to_csv(self, *args, columns: Optional[List[str]] = None, **kwargs):
+        """Materialize and write as CSV (same arguments as DataFrame.to_csv)"""
+        return self.materialize(columns).to_csv(*args, **kwargs)
+
+    def to_excel(self, *args, columns: Optional[List[str]] = None, **kwargs):
+        """Materialize and write to Excel (same arguments as DataFrame.to_excel)"""
+        return self.materialize(columns).to_excel(*args, **kwargs)
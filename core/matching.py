@@ -0,0 +1,564 @@
+"""
+Campaign matching module
+Builds campaign ↔ MIS row match pairs in a single pass over the MIS data
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Characters that give an identifier regex meaning in str.contains
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+# Separators between tokens in token mode (underscores and hyphens stay inside tokens)
+TOKEN_DELIMITERS = re.compile(r"[\s|,;/&?=:]+")
+
+# Sorts after any character, used to bound prefix ranges
+MAX_CHARACTER = chr(0x10FFFF)
+
+# Used when a bank config does not declare a match_mode
+DEFAULT_MATCH_MODE = "substring"
+
+# Identifier values treated as "not set" for secondary composite-key columns
+BLANK_IDENTIFIERS = frozenset(["", "nan", "None"])
+
+# How an MIS row matching several campaigns is counted (per bank "match_attribution" key):
+#   all        - counted in every matching campaign (legacy behaviour, double counts; the default)
+#   first      - counted in the first matching campaign in identifiers-sheet order
+#   longest    - counted in the campaign with the longest (most specific) identifier
+#   fractional - split evenly across all matching campaigns
+MATCH_ATTRIBUTIONS = ("all", "first", "longest", "fractional")
+DEFAULT_MATCH_ATTRIBUTION = "all"
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    """
+    Convert an MIS column to strings for comparison, keeping missing values missing
+
+    astype(str) alone turns NaN into the string "nan" on pandas < 3 but keeps
+    it missing from pandas 3, so missing values are masked back explicitly:
+    they never match an identifier or status on any pandas version.
+
+    Args:
+        values: MIS column of any dtype
+
+    Returns:
+        Series of strings, NaN where values is missing
+    """
+    return values.astype(str).where(values.notna())
+
+
+class MISValueIndex:
+    """
+    Index of the distinct values of an MIS identifier column
+
+    The MIS column is factorized once; every distinct value keeps the
+    (ascending) positions of the rows holding it, so matching only has to
+    look at distinct values and never rescans the full MIS.
+    """
+
+    def __init__(self, values: pd.Series):
+        """
+        Build the index from an MIS identifier column
+
+        Args:
+            values: MIS identifier column (any dtype, compared as strings)
+        """
+        codes, uniques = pd.factorize(as_text(values), sort=False)
+        self.codes = codes
+        self.uniques = pd.Series(uniques, dtype=object)
+        self.num_rows = len(codes)
+
+        # Group row positions by value code (CSR layout: indptr + row_order);
+        # missing values (code -1) never match, like str.contains(na=False)
+        valid_rows = np.flatnonzero(codes >= 0)
+        self.row_order = valid_rows[np.argsort(codes[valid_rows], kind='stable')]
+        counts = np.bincount(codes[valid_rows], minlength=len(uniques))
+        self.indptr = np.concatenate(([0], np.cumsum(counts)))
+
+    @classmethod
+    def from_uniques(cls, uniques: List[str]) -> "MISValueIndex":
+        """
+        Build an index over distinct values only (no row positions)
+
+        Used by worker processes, which only match values and leave the
+        expansion to rows to the parent process.
+
+        Args:
+            uniques: Distinct MIS values
+
+        Returns:
+            MISValueIndex whose rows_for() is not available
+        """
+        value_index = cls.__new__(cls)
+        value_index.uniques = pd.Series(uniques, dtype=object)
+        value_index.codes = None
+        value_index.num_rows = 0
+        value_index.row_order = None
+        value_index.indptr = None
+        return value_index
+
+    def rows_for(self, value_codes) -> np.ndarray:
+        """
+        Get MIS row positions (sorted) for a set of distinct value codes
+
+        Args:
+            value_codes: Array of distinct value codes
+
+        Returns:
+            Sorted int64 array of MIS row positions
+        """
+        if len(value_codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(value_codes) == 1:
+            code = value_codes[0]
+            return self.row_order[self.indptr[code]:self.indptr[code + 1]].astype(np.int64)
+        parts = [self.row_order[self.indptr[c]:self.indptr[c + 1]] for c in value_codes]
+        return np.sort(np.concatenate(parts)).astype(np.int64)
+
+
+class AhoCorasickMatcher:
+    """
+    Case-insensitive multi-pattern substring matcher (Aho-Corasick automaton)
+
+    All patterns are compiled into one automaton, so scanning a text costs
+    O(len(text) + matches) no matter how many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Compile patterns into the automaton
+
+        Args:
+            patterns: Patterns to search for; pattern ids are their positions
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self.num_patterns = 0
+
+        for pattern_id, pattern in enumerate(patterns):
+            self._add_pattern(pattern.lower(), pattern_id)
+            self.num_patterns += 1
+
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str, pattern_id: int):
+        """Insert a pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Set[int]:
+        """
+        Find every pattern occurring in a text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of pattern ids found in the text
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set(output[0])
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+def is_literal_identifier(identifier: str) -> bool:
+    """Check whether an identifier has no regex metacharacters"""
+    return not any(char in REGEX_METACHARACTERS for char in identifier)
+
+
+def match_value_codes(identifier: str, value_index: MISValueIndex) -> np.ndarray:
+    """
+    Find the distinct MIS values that contain an identifier
+
+    Keeps the original semantics of
+    ``df_mis[col].astype(str).str.contains(identifier, case=False, na=False)``
+    but evaluates it once per distinct value instead of once per row.
+
+    Args:
+        identifier: Campaign identifier
+        value_index: Index of distinct MIS values
+
+    Returns:
+        Array of matching distinct value codes
+    """
+    mask = value_index.uniques.str.contains(identifier, case=False, na=False)
+    return np.flatnonzero(mask.to_numpy(dtype=bool))
+
+
+def _scan_with_automaton(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """Scan every distinct MIS value once with an automaton of all identifiers"""
+    matches: List[List[int]] = [[] for _ in identifiers]
+    if identifiers:
+        matcher = AhoCorasickMatcher(identifiers)
+        for value_code, value in enumerate(value_index.uniques):
+            for pattern_id in matcher.find_all(value):
+                matches[pattern_id].append(value_code)
+
+    return {
+        identifier: np.asarray(codes, dtype=np.int64)
+        for identifier, codes in zip(identifiers, matches)
+    }
+
+
+def _group_codes_by_key(keys: Iterable[Iterable[str]]) -> Dict[str, np.ndarray]:
+    """Build a hash table of key -> distinct value codes"""
+    codes_by_key: Dict[str, List[int]] = {}
+    for value_code, value_keys in enumerate(keys):
+        for key in value_keys:
+            codes_by_key.setdefault(key, []).append(value_code)
+    return {key: np.asarray(codes, dtype=np.int64) for key, codes in codes_by_key.items()}
+
+
+def _lookup(identifiers: List[str], codes_by_key: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Look identifiers up in a key -> value codes hash table"""
+    empty = np.empty(0, dtype=np.int64)
+    return {identifier: codes_by_key.get(identifier.lower(), empty) for identifier in identifiers}
+
+
+def match_exact(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Exact mode: MIS value equals the identifier (case-insensitive hash join)
+    """
+    keys = ([value.strip().lower()] for value in value_index.uniques)
+    return _lookup(identifiers, _group_codes_by_key(keys))
+
+
+def match_strict(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Strict mode: MIS value text equals the identifier as is (legacy ``==``, case and spaces count)
+    """
+    codes_by_value = _group_codes_by_key([value] for value in value_index.uniques)
+    empty = np.empty(0, dtype=np.int64)
+    return {identifier: codes_by_value.get(identifier, empty) for identifier in identifiers}
+
+
+def match_prefix(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Prefix mode: MIS value starts with the identifier (binary search over sorted values)
+    """
+    lowered = [value.strip().lower() for value in value_index.uniques]
+    order = sorted(range(len(lowered)), key=lowered.__getitem__)
+    sorted_values = [lowered[code] for code in order]
+    order = np.asarray(order, dtype=np.int64)
+
+    codes_by_identifier = {}
+    for identifier in identifiers:
+        prefix = identifier.lower()
+        start = bisect_left(sorted_values, prefix)
+        end = bisect_left(sorted_values, prefix + MAX_CHARACTER, lo=start)
+        codes_by_identifier[identifier] = np.sort(order[start:end])
+    return codes_by_identifier
+
+
+def match_substring(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Substring mode: MIS value contains the identifier as literal text (Aho-Corasick)
+    """
+    return _scan_with_automaton(identifiers, value_index)
+
+
+def match_token(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Token mode: identifier equals one of the delimiter-separated tokens of the MIS value
+    """
+    keys = (
+        [token for token in TOKEN_DELIMITERS.split(value.lower()) if token]
+        for value in value_index.uniques
+    )
+    return _lookup(identifiers, _group_codes_by_key(keys))
+
+
+def match_regex(identifiers: List[str], value_index: MISValueIndex) -> Dict[str, np.ndarray]:
+    """
+    Regex mode: legacy ``str.contains`` semantics, identifiers are regular expressions
+
+    Identifiers without regex metacharacters still go through the automaton.
+    """
+    literal = [identifier for identifier in identifiers if is_literal_identifier(identifier)]
+    codes_by_identifier = _scan_with_automaton(literal, value_index)
+    for identifier in identifiers:
+        if not is_literal_identifier(identifier):
+            codes_by_identifier[identifier] = match_value_codes(identifier, value_index)
+    return codes_by_identifier
+
+
+# Match strategies selectable per bank through the "match_mode" config key
+MATCH_STRATEGIES = {
+    "exact": match_exact,
+    "strict": match_strict,
+    "prefix": match_prefix,
+    "substring": match_substring,
+    "token": match_token,
+    "regex": match_regex,
+}
+
+
+def match_distinct_values(identifiers: List[str], value_index: MISValueIndex,
+                          match_mode: str = DEFAULT_MATCH_MODE) -> Dict[str, np.ndarray]:
+    """
+    Match all identifiers against the distinct MIS values
+
+    Args:
+        identifiers: Campaign identifiers
+        value_index: Index of distinct MIS values
+        match_mode: Name of the strategy in MATCH_STRATEGIES
+
+    Returns:
+        Dictionary of identifier -> array of matching distinct value codes
+    """
+    if match_mode not in MATCH_STRATEGIES:
+        raise ValueError(f"Unknown match mode '{match_mode}', expected one of {list(MATCH_STRATEGIES)}")
+
+    distinct_identifiers = list(dict.fromkeys(identifiers))
+    return MATCH_STRATEGIES[match_mode](distinct_identifiers, value_index)
+
+
+def build_match_pairs(identifiers: List[str], mis_values: pd.Series,
+                      match_mode: str = DEFAULT_MATCH_MODE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build all campaign ↔ MIS row match pairs in one pass
+
+    Args:
+        identifiers: Campaign identifiers, one per identifiers-sheet row
+        mis_values: MIS identifier column
+        match_mode: Name of the strategy in MATCH_STRATEGIES
+
+    Returns:
+        Tuple of (campaign_positions, mis_positions) int64 arrays, grouped
+        by campaign in identifiers order and by MIS row order within a campaign
+    """
+    value_index = MISValueIndex(mis_values)
+    codes_by_identifier = match_distinct_values(identifiers, value_index, match_mode)
+    return expand_match_pairs(identifiers, value_index, codes_by_identifier)
+
+
+def expand_match_pairs(identifiers: List[str], value_index: MISValueIndex,
+                       codes_by_identifier: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expand identifier → distinct value matches into campaign ↔ MIS row pairs
+
+    Args:
+        identifiers: Campaign identifiers, one per identifiers-sheet row
+        value_index: Index of distinct MIS values
+        codes_by_identifier: Matching distinct value codes per identifier
+
+    Returns:
+        Tuple of (campaign_positions, mis_positions) int64 arrays
+    """
+    # Identical identifiers (e.g. a campaign repeated across dates) share one lookup
+    rows_by_identifier = {}
+    campaign_parts = []
+    mis_parts = []
+
+    for position, identifier in enumerate(identifiers):
+        if identifier not in rows_by_identifier:
+            rows_by_identifier[identifier] = value_index.rows_for(codes_by_identifier[identifier])
+
+        rows = rows_by_identifier[identifier]
+        if len(rows) > 0:
+            campaign_parts.append(np.full(len(rows), position, dtype=np.int64))
+            mis_parts.append(rows)
+
+    if not campaign_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    return np.concatenate(campaign_parts), np.concatenate(mis_parts)
+
+
+def filter_pairs_by_key(campaign_positions: np.ndarray, mis_positions: np.ndarray,
+                        identifiers: List[str], mis_values: pd.Series,
+                        match_mode: str = DEFAULT_MATCH_MODE,
+                        blank_matches_any: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep only the match pairs whose MIS row also matches on another key column
+
+    Used for composite keys (e.g. HDFC LC1_CODE + LG_CODE): the key column is
+    matched on distinct values only, then every pair is checked with a hashed
+    (campaign, value code) lookup. Campaigns with a blank value for this key
+    are not constrained by it, or, with blank_matches_any=False, only match
+    MIS rows whose key value is blank as well.
+
+    Args:
+        campaign_positions: Campaign position of each match pair
+        mis_positions: MIS row position of each match pair
+        identifiers: Campaign values for this key, one per campaign
+        mis_values: MIS column for this key
+        match_mode: Name of the strategy in MATCH_STRATEGIES
+        blank_matches_any: Whether a blank campaign value matches any MIS value (else only blank ones)
+
+    Returns:
+        Filtered (campaign_positions, mis_positions)
+    """
+    if len(mis_positions) == 0:
+        return campaign_positions, mis_positions
+
+    is_blank = np.array([identifier in BLANK_IDENTIFIERS for identifier in identifiers], dtype=bool)
+    value_index = MISValueIndex(mis_values)
+    num_values = max(len(value_index.uniques), 1)
+    codes_by_identifier = match_distinct_values(
+        [identifier for identifier in identifiers if identifier not in BLANK_IDENTIFIERS],
+        value_index, match_mode
+    )
+
+    # Allowed (campaign, value code) combinations as single int64 hash keys
+    allowed = [
+        position * num_values + codes_by_identifier[identifier]
+        for position, identifier in enumerate(identifiers)
+        if not is_blank[position]
+    ]
+    allowed_keys = pd.Index(np.concatenate(allowed) if allowed else np.empty(0, dtype=np.int64))
+
+    row_codes = value_index.codes[mis_positions]
+    pair_keys = campaign_positions * num_values + row_codes
+    matched = (row_codes >= 0) & pd.Index(pair_keys).isin(allowed_keys)
+    if blank_matches_any:
+        keep = is_blank[campaign_positions] | matched
+    else:
+        blank_codes = np.flatnonzero(value_index.uniques.str.strip().isin(BLANK_IDENTIFIERS))
+        row_is_blank = (row_codes < 0) | np.isin(row_codes, blank_codes)
+        keep = np.where(is_blank[campaign_positions], row_is_blank, matched)
+
+    return campaign_positions[keep], mis_positions[keep]
+
+
+class MatchMatrix:
+    """
+    Sparse campaign × MIS row match matrix in CSR layout
+
+    Row ``i`` holds the MIS row positions matched by campaign ``i``
+    (``indices[indptr[i]:indptr[i + 1]]``) with their attribution weights in
+    ``data``. Memory is proportional to the number of matches.
+    """
+
+    def __init__(self, campaign_positions: np.ndarray, mis_positions: np.ndarray,
+                 num_campaigns: int, num_rows: int, weights: np.ndarray = None):
+        """
+        Build the matrix from match pairs grouped by campaign
+
+        Args:
+            campaign_positions: Campaign position of each match pair (sorted)
+            mis_positions: MIS row position of each match pair
+            num_campaigns: Number of campaigns (matrix rows)
+            num_rows: Number of MIS rows (matrix columns)
+            weights: Weight of each match pair (defaults to 1.0)
+        """
+        self.num_campaigns = num_campaigns
+        self.num_rows = num_rows
+        self.campaign_positions = campaign_positions
+        self.indices = mis_positions
+        self.indptr = np.searchsorted(campaign_positions, np.arange(num_campaigns + 1))
+        self.data = np.ones(len(mis_positions)) if weights is None else weights
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored match pairs"""
+        return len(self.indices)
+
+    def campaign_rows(self, position: int) -> np.ndarray:
+        """Get the MIS row positions matched by one campaign"""
+        return self.indices[self.indptr[position]:self.indptr[position + 1]]
+
+    def dot(self, vector) -> np.ndarray:
+        """
+        Sparse matrix–vector product
+
+        Args:
+            vector: Per-MIS-row values (e.g. a 0/1 status indicator)
+
+        Returns:
+            Per-campaign weighted sums as a float array
+        """
+        products = self.data * np.asarray(vector, dtype=float)[self.indices]
+        return np.bincount(self.campaign_positions, weights=products, minlength=self.num_campaigns)
+
+    def count_codes(self, codes: np.ndarray, num_codes: int) -> np.ndarray:
+        """
+        Count matched rows per campaign and per row code in a single bincount
+
+        Args:
+            codes: Small integer code per MIS row (e.g. status bucket codes)
+            num_codes: Number of distinct codes
+
+        Returns:
+            Array of shape (num_campaigns, num_codes) with weighted counts
+        """
+        keys = self.campaign_positions * num_codes + codes[self.indices]
+        counts = np.bincount(keys, weights=self.data, minlength=self.num_campaigns * num_codes)
+        return counts.reshape(self.num_campaigns, num_codes)
+
+    def row_sums(self) -> np.ndarray:
+        """Per-campaign sum of match weights (attributed application counts)"""
+        return np.bincount(self.campaign_positions, weights=self.data, minlength=self.num_campaigns)
+
+    def attribute(self, attribution: str, identifiers: List[str]) -> "MatchMatrix":
+        """
+        Resolve MIS rows that match several campaigns
+
+        Args:
+            attribution: One of MATCH_ATTRIBUTIONS
+            identifiers: Campaign identifiers (used by longest-match)
+
+        Returns:
+            New MatchMatrix with the attribution applied
+        """
+        if attribution not in MATCH_ATTRIBUTIONS:
+            raise ValueError(f"Unknown match attribution '{attribution}', expected one of {list(MATCH_ATTRIBUTIONS)}")
+
+        if attribution == "all" or self.nnz == 0:
+            return self
+
+        if attribution == "fractional":
+            matches_per_row = np.bincount(self.indices, minlength=self.num_rows)
+            weights = self.data / matches_per_row[self.indices]
+            return MatchMatrix(self.campaign_positions, self.indices,
+                               self.num_campaigns, self.num_rows, weights)
+
+        # first / longest: keep the best campaign per MIS row (ties go to sheet order)
+        if attribution == "longest":
+            lengths = np.fromiter((len(identifier) for identifier in identifiers),
+                                  dtype=np.int64, count=len(identifiers))
+            order = np.lexsort((self.campaign_positions, -lengths[self.campaign_positions], self.indices))
+        else:
+            order = np.lexsort((self.campaign_positions, self.indices))
+
+        sorted_rows = self.indices[order]
+        is_best = np.ones(len(order), dtype=bool)
+        is_best[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        kept = np.sort(order[is_best])
+
+        return MatchMatrix(self.campaign_positions[kept], self.indices[kept],
+                           self.num_campaigns, self.num_rows, self.data[kept])
@@ -0,0 +1,205 @@
+"""
+Parallel matching module
+Shards identifier matching across a persistent, warm process pool
+"""
+
+import copy
+import multiprocessing
+import sys
+import tempfile
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.matching import (
+    MISValueIndex,
+    DEFAULT_MATCH_MODE,
+    expand_match_pairs,
+    match_distinct_values
+)
+
+# Below this many distinct MIS values the serial matcher is faster than shipping work to processes
+PARALLEL_MIN_VALUES = 50_000
+
+# Serializes worker starts across sessions: each start briefly swaps the process-wide __main__
+_MAIN_SWAP_LOCK = threading.Lock()
+
+
+@st.cache_resource
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the process-wide worker pool (created once and kept warm across reruns)
+
+    Args:
+        max_workers: Number of worker processes
+
+    Returns:
+        Shared ProcessPoolExecutor
+    """
+    # Forking the multi-threaded Streamlit server is unsafe; forkserver forks workers from a
+    # clean single-threaded server with the core modules already imported
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["core.parallel", "core.ingestion"])
+        worker_process = _ForkServerWorkerProcess
+    else:
+        context = multiprocessing.get_context("spawn")
+        worker_process = _SpawnWorkerProcess
+
+    context = copy.copy(context)
+    context.Process = worker_process
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+class _WithoutAppMain:
+    """
+    Process mixin: start the process without the app script as its main module
+
+    Spawned and forkserver workers re-run the parent's __main__ before their
+    first task, and under Streamlit that is app.py, whose module-level code
+    restores every stored result and spills idle datasets. Tasks only use
+    the core modules, so workers are started with an empty main module.
+    Sessions start workers from their own threads, so the swap is done under
+    a lock, and the app module is only put back if the empty one is still in
+    place (Streamlit sets a new __main__ for every script run).
+    """
+
+    def start(self):
+        with _MAIN_SWAP_LOCK:
+            app_main = sys.modules["__main__"]
+            worker_main = sys.modules["__main__"] = types.ModuleType("__main__")
+            try:
+                super().start()
+            finally:
+                if sys.modules["__main__"] is worker_main:
+                    sys.modules["__main__"] = app_main
+
+
+class _SpawnWorkerProcess(_WithoutAppMain, multiprocessing.context.SpawnProcess):
+    pass
+
+
+if hasattr(multiprocessing.context, "ForkServerProcess"):  # Not on Windows
+    class _ForkServerWorkerProcess(_WithoutAppMain, multiprocessing.context.ForkServerProcess):
+        pass
+
+
+class SharedValueBuffer:
+    """
+    Distinct MIS values written once to memory-mapped files
+
+    Workers map the files read-only and decode only their own shard, so the
+    values are shared through the page cache instead of being pickled per task.
+    """
+
+    def __init__(self, values: List[str]):
+        """
+        Write values as one UTF-8 blob plus an offsets array
+
+        Args:
+            values: Distinct MIS values
+        """
+        self._directory = tempfile.TemporaryDirectory(prefix="campaign_match_")
+        directory = Path(self._directory.name)
+        self.data_path = str(directory / "values.bin")
+        self.offsets_path = str(directory / "offsets.npy")
+
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded])
+
+        with open(self.data_path, "wb") as data_file:
+            data_file.write(b"".join(encoded))
+        np.save(self.offsets_path, offsets)
+
+    def close(self):
+        """Remove the backing files"""
+        self._directory.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _match_value_shard(data_path: str, offsets_path: str, start: int, end: int,
+                       identifiers: List[str], match_mode: str) -> Dict[str, np.ndarray]:
+    """
+    Worker task: match all identifiers against distinct values [start, end)
+
+    Returns:
+        Dictionary of identifier -> matching value codes (global numbering)
+    """
+    offsets = np.load(offsets_path, mmap_mode="r")
+    base = int(offsets[start])
+    data = np.memmap(data_path, dtype=np.uint8, mode="r") if offsets[-1] > 0 else np.empty(0, dtype=np.uint8)
+    raw = data[base:int(offsets[end])].tobytes()
+
+    shard_offsets = np.asarray(offsets[start:end + 1]) - base
+    values = [
+        raw[shard_offsets[i]:shard_offsets[i + 1]].decode("utf-8")
+        for i in range(end - start)
+    ]
+
+    codes_by_identifier = match_distinct_values(identifiers, MISValueIndex.from_uniques(values), match_mode)
+    return {identifier: codes + start for identifier, codes in codes_by_identifier.items()}
+
+
+def build_match_pairs_parallel(identifiers: List[str], mis_values: pd.Series,
+                               match_mode: str = DEFAULT_MATCH_MODE,
+                               workers: int = 2,
+                               value_index: Optional[MISValueIndex] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build campaign ↔ MIS row match pairs with distinct values sharded across processes
+
+    Every worker builds the full matcher for all identifiers and scans one
+    contiguous range of distinct MIS values; partial results are merged in
+    shard order, so the output is identical to the serial build_match_pairs.
+    Called from a pool worker (a bank processed alongside others, see
+    submit_mis_processing), matching stays serial: the banks already share
+    the cores, and workers do not start pools of their own.
+
+    Args:
+        identifiers: Campaign identifiers, one per identifiers-sheet row
+        mis_values: MIS identifier column
+        match_mode: Name of the strategy in MATCH_STRATEGIES
+        workers: Number of worker processes
+        value_index: Prebuilt index of mis_values (built when not given)
+
+    Returns:
+        Tuple of (campaign_positions, mis_positions) int64 arrays
+    """
+    if value_index is None:
+        value_index = MISValueIndex(mis_values)
+    distinct_identifiers = list(dict.fromkeys(identifiers))
+    num_values = len(value_index.uniques)
+
+    in_worker = multiprocessing.parent_process() is not None
+    if workers < 2 or num_values < PARALLEL_MIN_VALUES or in_worker:
+        codes_by_identifier = match_distinct_values(distinct_identifiers, value_index, match_mode)
+        return expand_match_pairs(identifiers, value_index, codes_by_identifier)
+
+    bounds = np.linspace(0, num_values, workers + 1).astype(int)
+    pool = get_process_pool(workers)
+
+    with SharedValueBuffer(value_index.uniques.tolist()) as buffer:
+        futures = [
+            pool.submit(_match_value_shard, buffer.data_path, buffer.offsets_path,
+                        int(start), int(end), distinct_identifiers, match_mode)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        shard_results = [future.result() for future in futures]
+
+    # Deterministic merge: shards cover ascending value ranges
+    codes_by_identifier = {
+        identifier: np.concatenate([result[identifier] for result in shard_results])
+        for identifier in distinct_identifiers
+    }
+    return expand_match_pairs(identifiers, value_index, codes_by_identifier)
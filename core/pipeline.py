@@ -0,0 +1,83 @@
+"""
+Pipeline stage cache module
+Fingerprinted, cached pipeline stages: a stage reruns only when one of its inputs changed
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+def fingerprint(*parts) -> str:
+    """
+    Fingerprint stage inputs (upstream fingerprints, config values, small lists)
+
+    Args:
+        *parts: JSON-serializable values (anything else is converted with str)
+
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def config_subset(bank_config: Dict, keys: Iterable[str]) -> Dict:
+    """Pick the bank config keys a stage reads (missing keys are left out)"""
+    return {key: bank_config[key] for key in keys if key in bank_config}
+
+
+class StageCache:
+    """
+    Last result of every pipeline stage, keyed by the fingerprint of its inputs
+
+    Stages are chained through fingerprints: each stage's inputs include the
+    fingerprints of the stages it reads from, so a changed input reruns that
+    stage and everything downstream while upstream results are reused.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+
+    def run(self, stage: str, inputs: Tuple, compute: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Get a stage result, computing it only when its inputs changed
+
+        Args:
+            stage: Stage name
+            inputs: Everything the stage result depends on
+            compute: Function producing the result
+
+        Returns:
+            Tuple of (result, stage fingerprint); a None result (failed stage) is not cached
+        """
+        stage_fingerprint = fingerprint(stage, *inputs)
+        entry = self._entries.get(stage)
+        if entry is not None and entry[0] == stage_fingerprint:
+            return entry[1], stage_fingerprint
+
+        result = compute()
+        if result is not None:
+            self._entries[stage] = (stage_fingerprint, result)
+        return result, stage_fingerprint
+
+    def seed(self, stage: str, inputs: Tuple, result: Any) -> str:
+        """
+        Store a result computed outside run() (e.g. patched incrementally)
+
+        Returns:
+            Stage fingerprint
+        """
+        stage_fingerprint = fingerprint(stage, *inputs)
+        self._entries[stage] = (stage_fingerprint, result)
+        return stage_fingerprint
+
+    def copy(self) -> "StageCache":
+        """Copy of the cache sharing the stage results (results are never modified in place)"""
+        stages = StageCache()
+        stages._entries = dict(self._entries)
+        return stages
+
+    def clear(self):
+        """Drop every cached stage result"""
+        self._entries.clear()
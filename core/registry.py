@@ -0,0 +1,159 @@
+"""
+Dataset registry module
+Process-wide, memory-bounded registry of processed bank datasets shared by every session
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import streamlit as st
+
+from config.bank_config import DATASET_IDLE_SECONDS, DATASET_REGISTRY_MAX_BYTES
+from core.cache import ProcessingCache, get_processing_cache
+from utils.helpers import memory_usage_bytes
+
+
+def dataset_bytes(processor) -> int:
+    """
+    Estimate the memory held by a processed dataset
+
+    Args:
+        processor: Processor holding the upload and its results
+
+    Returns:
+        Bytes of the compact MIS upload and summary (recorded at ingest when available)
+    """
+    memory_usage = getattr(processor, 'memory_usage', {})
+    if 'MIS' in memory_usage:
+        return sum(usage[1] for usage in memory_usage.values())
+
+    total = 0
+    for df in (processor.df_mis_source, processor.df_summary):
+        if df is not None:
+            total += memory_usage_bytes(df)
+    return total
+
+
+class DatasetRegistry:
+    """
+    Processed bank datasets shared by all sessions, keyed by content hash
+
+    Sessions keep only the key of their dataset (see processing_key) and look
+    it up on every use, so analysts working on the same upload share one
+    copy. Registered processors are treated as immutable: refreshes and
+    re-uploads run on a fork registered under its own key. Datasets not
+    looked up for max_idle_seconds, and the least recently used ones once the
+    datasets held exceed max_bytes, are dropped from memory and spilled to
+    the processing cache; the next lookup maps them back from disk.
+    """
+
+    def __init__(self, max_bytes: int, spill_cache: ProcessingCache, max_idle_seconds: Optional[float] = None):
+        """
+        Initialize registry
+
+        Args:
+            max_bytes: Memory budget of the datasets held
+            spill_cache: Disk cache evicted datasets are spilled to and reloaded from
+            max_idle_seconds: Spill datasets not looked up for this long (None to keep them)
+        """
+        self.max_bytes = max_bytes
+        self.spill_cache = spill_cache
+        self.max_idle_seconds = max_idle_seconds
+        self._datasets = OrderedDict()  # Key -> (processor, bytes, last lookup time), least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a dataset can be looked up (held in memory or spilled to disk)"""
+        with self._lock:
+            if key in self._datasets:
+                return True
+        return key in self.spill_cache
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the registered datasets"""
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a dataset, mapping it back from disk if it was spilled
+
+        Args:
+            key: Dataset key
+
+        Returns:
+            Shared processor (do not modify; fork it), or None if unknown
+        """
+        with self._lock:
+            processor = self._touch(key)
+        if processor is not None:
+            self.spill_idle()
+            return processor
+
+        processor = self.spill_cache.get(key)
+        if processor is None:
+            return None
+        return self.put(key, processor)
+
+    def put(self, key: str, processor) -> Any:
+        """
+        Register a dataset, spilling idle and least recently used ones beyond the budget
+
+        Args:
+            key: Dataset key
+            processor: Processor holding the dataset
+
+        Returns:
+            The registered processor: the one already held under the key if
+            another session registered it first, otherwise the given one
+        """
+        with self._lock:
+            registered = self._touch(key)
+            if registered is None:
+                size = dataset_bytes(processor)
+                self._datasets[key] = (processor, size, time.monotonic())
+                self._bytes += size
+                registered = processor
+        self.spill_idle()
+        return registered
+
+    def spill_idle(self):
+        """Spill datasets idle for longer than max_idle_seconds and the least recently used beyond max_bytes"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            # The most recent dataset stays even if it alone exceeds the budget
+            while len(self._datasets) > 1:
+                key, (processor, size, last_lookup) = next(iter(self._datasets.items()))
+                idle = self.max_idle_seconds is not None and now - last_lookup > self.max_idle_seconds
+                if not idle and self._bytes <= self.max_bytes:
+                    break
+                del self._datasets[key]
+                self._bytes -= size
+                evicted.append((key, processor))
+
+        # Spill outside the lock so lookups from other sessions are not held up by writing
+        for key, processor in evicted:
+            if key not in self.spill_cache:
+                self.spill_cache.put(key, processor)
+
+    def _touch(self, key: str) -> Optional[Any]:
+        """Mark a held dataset as just looked up (call with the lock held)"""
+        entry = self._datasets.get(key)
+        if entry is None:
+            return None
+        self._datasets[key] = (entry[0], entry[1], time.monotonic())
+        self._datasets.move_to_end(key)
+        return entry[0]
+
+
+@st.cache_resource
+def get_dataset_registry() -> DatasetRegistry:
+    """Get the process-wide dataset registry"""
+    return DatasetRegistry(DATASET_REGISTRY_MAX_BYTES, get_processing_cache(), DATASET_IDLE_SECONDS)
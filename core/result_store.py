@@ -0,0 +1,279 @@
+"""
+Result store module
+Parquet store of the last processed results per bank, restored lazily into new sessions
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config.bank_config import RESULT_STORE_DIR
+from core.matched_view import MatchedMISView, CAMPAIGN_ATTRIBUTE_COLUMNS
+from utils.helpers import compact_dtypes
+
+# Bump when the stored layout changes so old results are ignored
+STORE_FORMAT_VERSION = 1
+
+# Low-cardinality text columns stored dictionary-encoded (MIS status columns are passed per bank)
+SUMMARY_DICTIONARY_COLUMNS = ['Source', 'Channel']
+CAMPAIGN_DICTIONARY_COLUMNS = ['Campaign_Source', 'Campaign_Channel']
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert mixed-type object columns (common in Excel MIS files) to text so Arrow can write them"""
+    df = df.copy(deep=False)
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True).startswith("mixed"):
+            df[column] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+def _dictionary_encode(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """Turn text columns into categoricals, which Parquet stores as dictionary columns"""
+    df = df.copy(deep=False)
+    for column in columns:
+        if column and column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+class StoredMatchedMISView(MatchedMISView):
+    """
+    Matched MIS view backed by the result store
+
+    Only the record count is known up front; the MIS rows and match pairs
+    are read from Parquet (memory-mapped) the first time the records are
+    needed, and can be released again once they sit idle.
+    """
+
+    def __init__(self, bank_dir: Path, meta: Dict):
+        """
+        Initialize view over a stored result
+
+        Args:
+            bank_dir: Directory of the bank in the result store
+            meta: Stored result metadata
+        """
+        self._bank_dir = bank_dir
+        self._meta = meta
+        self._view = None
+        self._last_access = None
+
+    def _load(self) -> MatchedMISView:
+        """Read the stored records on first use"""
+        self._last_access = time.monotonic()
+        if self._view is None:
+            token = self._meta['token']
+            try:
+                df_mis = pd.read_parquet(self._bank_dir / f"{token}.mis.parquet", memory_map=True)
+                df_matches = pd.read_parquet(self._bank_dir / f"{token}.matches.parquet", memory_map=True)
+                df_campaigns = pd.read_parquet(self._bank_dir / f"{token}.campaigns.parquet", memory_map=True)
+            except FileNotFoundError:
+                # Replaced by a newer result since this session restored it
+                st.warning(f"⚠️ Stored MIS records for {self._meta['bank']} were replaced, re-upload to view them")
+                self._view = MatchedMISView(
+                    pd.DataFrame(), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                    pd.DataFrame(columns=CAMPAIGN_ATTRIBUTE_COLUMNS)
+                )
+                return self._view
+
+            # Read back in the compact dtypes fresh uploads are held in
+            self._view = MatchedMISView(
+                compact_dtypes(df_mis),
+                df_matches['row'].to_numpy(),
+                df_matches['campaign'].to_numpy(),
+                compact_dtypes(df_campaigns, category_columns=CAMPAIGN_DICTIONARY_COLUMNS, downcast=False),
+                df_matches['weight'].to_numpy() if 'weight' in df_matches.columns else None
+            )
+        return self._view
+
+    def __len__(self):
+        if self._view is None:
+            return self._meta['records']
+        return len(self._view)
+
+    def release_if_idle(self, max_idle_seconds: float) -> bool:
+        """
+        Drop the loaded records if unused for a while (they are read again on next use)
+
+        Args:
+            max_idle_seconds: Idle time after which the records are released
+
+        Returns:
+            True if the records were released
+        """
+        if self._view is None or time.monotonic() - self._last_access <= max_idle_seconds:
+            return False
+        self._view = None
+        return True
+
+    @property
+    def df_mis(self):
+        return self._load().df_mis
+
+    @property
+    def row_positions(self):
+        return self._load().row_positions
+
+    @property
+    def campaign_positions(self):
+        return self._load().campaign_positions
+
+    @property
+    def df_campaigns(self):
+        return self._load().df_campaigns
+
+    @property
+    def weights(self):
+        return self._load().weights
+
+
+class ResultStore:
+    """
+    Last processed result of every bank as Parquet files
+
+    Each bank has a directory whose meta.json names the current result. A new
+    result is written under fresh file names before meta.json is replaced, so
+    readers never see a partial result. Matched MIS is stored like
+    MatchedMISView keeps it: the matched MIS rows once, plus the match pairs
+    and the per-campaign attributes.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize store directory
+
+        Args:
+            directory: Directory holding one subdirectory per bank
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _bank_dir(self, bank: str) -> Path:
+        return self.directory / bank.replace(' ', '_').lower()
+
+    def _read_meta(self, bank_dir: Path) -> Optional[Dict]:
+        """Read a bank's metadata, or None if missing, unreadable or from an older layout"""
+        try:
+            meta = json.loads((bank_dir / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('version') == STORE_FORMAT_VERSION else None
+
+    def banks(self) -> List[str]:
+        """
+        Get the banks with a stored result
+
+        Returns:
+            Bank names
+        """
+        banks = []
+        for bank_dir in sorted(path for path in self.directory.iterdir() if path.is_dir()):
+            meta = self._read_meta(bank_dir)
+            if meta is not None:
+                banks.append(meta['bank'])
+        return banks
+
+    def save(self, bank: str, file_name: str, df_summary: pd.DataFrame,
+             matched_view: MatchedMISView, status_columns: Iterable[str] = ()):
+        """
+        Store a bank's processed result, replacing the previous one
+
+        Args:
+            bank: Bank name
+            file_name: Name of the MIS file the result was processed from
+            df_summary: Campaign summary
+            matched_view: Matched MIS records
+            status_columns: MIS status columns to store dictionary-encoded
+        """
+        bank_dir = self._bank_dir(bank)
+        bank_dir.mkdir(parents=True, exist_ok=True)
+        token = uuid.uuid4().hex
+
+        # Keep only the MIS rows that are matched, with positions remapped onto them
+        rows, row_positions = np.unique(matched_view.row_positions, return_inverse=True)
+        df_matches = pd.DataFrame({
+            'row': row_positions.astype(np.int64),
+            'campaign': matched_view.campaign_positions.astype(np.int64)
+        })
+        if matched_view.weights is not None:
+            df_matches['weight'] = matched_view.weights
+
+        frames = {
+            'summary': _dictionary_encode(df_summary, SUMMARY_DICTIONARY_COLUMNS),
+            'mis': _dictionary_encode(
+                _arrow_safe(matched_view.df_mis.iloc[rows].reset_index(drop=True)), status_columns
+            ),
+            'matches': df_matches,
+            'campaigns': _dictionary_encode(_arrow_safe(matched_view.df_campaigns), CAMPAIGN_DICTIONARY_COLUMNS)
+        }
+        for name, df in frames.items():
+            df.to_parquet(bank_dir / f"{token}.{name}.parquet", index=False)
+
+        meta = {
+            'version': STORE_FORMAT_VERSION,
+            'bank': bank,
+            'file_name': file_name,
+            'token': token,
+            'saved_at': time.time(),
+            'records': len(matched_view)
+        }
+        meta_path = bank_dir / f"{token}.meta.json"
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(meta_path, bank_dir / "meta.json")
+
+        # Drop the files of older results
+        for path in bank_dir.glob("*.parquet"):
+            if not path.name.startswith(token):
+                path.unlink(missing_ok=True)
+
+    def load(self, bank: str) -> Optional[Dict]:
+        """
+        Load a bank's stored result (matched MIS records are read on first use)
+
+        Args:
+            bank: Bank name
+
+        Returns:
+            Dictionary with file_name, saved_at, summary and matched_mis, or None if nothing is stored
+        """
+        bank_dir = self._bank_dir(bank)
+        meta = self._read_meta(bank_dir)
+        if meta is None:
+            return None
+
+        try:
+            df_summary = pd.read_parquet(bank_dir / f"{meta['token']}.summary.parquet")
+        except FileNotFoundError:
+            return None
+
+        return {
+            'file_name': meta['file_name'],
+            'saved_at': meta['saved_at'],
+            'summary': compact_dtypes(df_summary, category_columns=SUMMARY_DICTIONARY_COLUMNS, downcast=False),
+            'matched_mis': StoredMatchedMISView(bank_dir, meta)
+        }
+
+    def delete(self, bank: str):
+        """Remove a bank's stored result"""
+        shutil.rmtree(self._bank_dir(bank), ignore_errors=True)
+
+    def clear(self):
+        """Remove every stored result"""
+        for bank in self.banks():
+            self.delete(bank)
+
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """Get the process-wide result store"""
+    return ResultStore(RESULT_STORE_DIR)
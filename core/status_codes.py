@@ -0,0 +1,130 @@
+"""
+Status codebook module
+Factorizes MIS status columns once and maps every distinct value to an int8 bucket code
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from core.matching import as_text
+
+# Bucket flags; a row's code is the OR of every bucket it falls in (0 = unknown)
+STATUS_UNKNOWN = 0
+STATUS_CARD_OUT = 1
+STATUS_DECLINED = 2
+STATUS_IPA = 4
+STATUS_IN_PROGRESS = 8
+
+# Number of distinct codes (all flag combinations)
+NUM_STATUS_CODES = 16
+
+STATUS_BUCKETS = {
+    'card_out': STATUS_CARD_OUT,
+    'declined': STATUS_DECLINED,
+    'ipa_approved': STATUS_IPA,
+    'in_progress': STATUS_IN_PROGRESS,
+}
+
+
+def normalize_status(values) -> pd.Series:
+    """Normalize status values the way status lists are compared (stripped, upper case)"""
+    return pd.Series(values, dtype=object).astype(str).str.strip().str.upper()
+
+
+class StatusCodebook:
+    """
+    Bank-specific mapping from MIS status values to bucket codes
+
+    Status lists from the bank config are upper-cased once when the codebook
+    is built. Encoding factorizes each status column once, classifies only
+    its distinct values and broadcasts the result back to rows.
+    """
+
+    def __init__(self, bank_config: Dict):
+        """
+        Build the codebook from bank configuration
+
+        Args:
+            bank_config: Bank-specific configuration dictionary
+        """
+        self.bank_config = bank_config
+        self.card_out_status = self._status_set("card_out_status")
+        self.declined_status = self._status_set("declined_status")
+        self.ipa_approved_status = self._status_set("ipa_approved_status")
+        self.inprogress_status = self._status_set("inprogress_status")
+        self.ipa_card_issued_status = self._status_set("ipa_card_issued_status")
+
+        # Scapia: IPA = card_issued in ipa_card_issued_status AND status in ipa_approved_status
+        self.uses_card_issued_rule = "ipa_card_issued_status" in bank_config
+
+    def _status_set(self, key: str) -> frozenset:
+        """Upper-case a status list from the config"""
+        return frozenset(str(status).strip().upper() for status in self.bank_config.get(key, []))
+
+    @staticmethod
+    def _flag_column(df_mis: pd.DataFrame, column: Optional[str], status_set: frozenset, flag: int) -> np.ndarray:
+        """
+        Flag rows whose value in a column belongs to a status set
+
+        The column is factorized so string normalization runs on distinct values only.
+        """
+        if not column or column not in df_mis.columns or not status_set:
+            return np.zeros(len(df_mis), dtype=np.int8)
+
+        codes, uniques = pd.factorize(as_text(df_mis[column]), sort=False)
+        unique_flags = np.where(normalize_status(uniques).isin(status_set).to_numpy(), flag, 0).astype(np.int8)
+
+        # Missing values (code -1) never match a status
+        return np.where(codes >= 0, unique_flags[codes], 0).astype(np.int8)
+
+    def encode(self, df_mis: pd.DataFrame, status_col: Optional[str], ipa_col: Optional[str],
+               ops_status_col: Optional[str]) -> np.ndarray:
+        """
+        Encode every MIS row into an int8 bucket code
+
+        Args:
+            df_mis: MIS DataFrame
+            status_col: Final status column (card out / declined / in progress)
+            ipa_col: IPA status column
+            ops_status_col: OPS status column (RBL card out, Scapia card_issued)
+
+        Returns:
+            int8 array of bucket codes, one per MIS row
+        """
+        # Card Out: Scapia always uses status_column, other banks prefer ops_status_column
+        if self.uses_card_issued_rule or not (ops_status_col and ops_status_col in df_mis.columns):
+            card_out_col = status_col
+        else:
+            card_out_col = ops_status_col
+
+        codes = self._flag_column(df_mis, card_out_col, self.card_out_status, STATUS_CARD_OUT)
+        codes |= self._flag_column(df_mis, status_col, self.declined_status, STATUS_DECLINED)
+        codes |= self._flag_column(df_mis, status_col, self.inprogress_status, STATUS_IN_PROGRESS)
+
+        if self.uses_card_issued_rule and ops_status_col:
+            # Scapia: both conditions must hold
+            issued = self._flag_column(df_mis, ops_status_col, self.ipa_card_issued_status, STATUS_IPA)
+            in_progress = self._flag_column(df_mis, status_col, self.ipa_approved_status, STATUS_IPA)
+            codes |= issued & in_progress
+        else:
+            codes |= self._flag_column(df_mis, ipa_col, self.ipa_approved_status, STATUS_IPA)
+
+        return codes
+
+
+def bucket_counts(code_counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Collapse per-code counts into per-bucket counts
+
+    Args:
+        code_counts: Array of shape (n, NUM_STATUS_CODES) with counts per code
+
+    Returns:
+        Dictionary of bucket name -> array of n counts
+    """
+    all_codes = np.arange(NUM_STATUS_CODES)
+    return {
+        name: code_counts[:, (all_codes & flag) != 0].sum(axis=1)
+        for name, flag in STATUS_BUCKETS.items()
+    }
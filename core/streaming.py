@@ -0,0 +1,367 @@
+"""
+Streaming ingestion module
+Processes very large CSV and .xlsb MIS files chunk by chunk, merging per-campaign partial counts
+"""
+
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from config.bank_config import (
+    STREAMED_MATCHES_DIR, STREAMED_MATCHES_MAX_AGE_SECONDS, STREAMING_CHUNK_ROWS, STREAMING_MIN_BYTES
+)
+from core.data_processor import CampaignDataProcessor, mis_column_selector, parse_mis_dates
+from core.matched_view import MatchedMISView
+from core.matching import (
+    filter_pairs_by_key,
+    MatchMatrix,
+    DEFAULT_MATCH_MODE,
+    DEFAULT_MATCH_ATTRIBUTION,
+    MATCH_ATTRIBUTIONS,
+    MATCH_STRATEGIES
+)
+from core.result_store import StoredMatchedMISView
+from core.status_codes import NUM_STATUS_CODES, bucket_counts
+from utils.helpers import (
+    TEXT_DTYPE, find_date_column, iter_mis_csv_chunks, iter_mis_xlsb_chunks, normalize_dataframe_columns
+)
+
+# Pair batches read at a time when the final match file is written
+PAIR_BATCH_ROWS = 1_000_000
+
+
+def should_stream(uploaded_file) -> bool:
+    """Whether an upload is a CSV or .xlsb file large enough to be processed as a stream (see STREAMING_MIN_BYTES)"""
+    file_extension = uploaded_file.name.split('.')[-1].lower()
+    return file_extension in STREAMING_MIN_BYTES and uploaded_file.size >= STREAMING_MIN_BYTES[file_extension]
+
+
+class MatchedRecordWriter:
+    """
+    Matched MIS rows and their match pairs appended to Parquet chunk by chunk
+
+    Files are written in the result store layout ({token}.mis/matches/campaigns.parquet),
+    so the finished records are served by a lazy, memory-mapped StoredMatchedMISView.
+    MIS values other than parsed dates are stored as text, since chunks can
+    infer different types for one column.
+    """
+
+    def __init__(self, directory: str, label: str):
+        """
+        Open the files of a new streamed result
+
+        Args:
+            directory: Directory holding streamed results (stale files in it are removed)
+            label: Name shown if the records are gone when read back (e.g. the bank)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.label = label
+        self.token = uuid.uuid4().hex
+        self._rows_writer = None
+        self._pairs_writer = None
+        self._stored_rows = 0
+        self._remove_stale()
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{self.token}.{name}.parquet"
+
+    def _remove_stale(self):
+        """Delete streamed results older than STREAMED_MATCHES_MAX_AGE_SECONDS"""
+        cutoff = time.time() - STREAMED_MATCHES_MAX_AGE_SECONDS
+        for path in self.directory.glob("*.parquet"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue  # Removed by another session, or still mapped on platforms that lock mapped files
+
+    def write(self, df_chunk: pd.DataFrame, match_matrix: MatchMatrix, in_range: np.ndarray):
+        """
+        Append the matched rows of one chunk and their attributed match pairs
+
+        Args:
+            df_chunk: MIS chunk
+            match_matrix: Attributed matches of the chunk (MIS positions into the chunk)
+            in_range: Per chunk row, whether it is within the identifiers date range
+        """
+        rows = np.unique(match_matrix.indices)
+        if len(rows) == 0:
+            return
+
+        df_rows = df_chunk.iloc[rows].reset_index(drop=True)
+        text_columns = [col for col in df_rows.columns if not pd.api.types.is_datetime64_any_dtype(df_rows[col])]
+        table = pa.Table.from_pandas(df_rows.astype(dict.fromkeys(text_columns, TEXT_DTYPE)), preserve_index=False)
+        if self._rows_writer is None:
+            self._rows_writer = pq.ParquetWriter(self._path("mis"), table.schema)
+        self._rows_writer.write_table(table.cast(self._rows_writer.schema))
+
+        pairs = pa.table({
+            'row': self._stored_rows + np.searchsorted(rows, match_matrix.indices).astype(np.int64),
+            'campaign': match_matrix.campaign_positions.astype(np.int64),
+            'weight': match_matrix.data.astype(np.float64),
+            'in_range': in_range[match_matrix.indices]
+        })
+        if self._pairs_writer is None:
+            self._pairs_writer = pq.ParquetWriter(self._path("pairs"), pairs.schema)
+        self._pairs_writer.write_table(pairs)
+        self._stored_rows += len(rows)
+
+    def finish(self, columns, df_campaigns: pd.DataFrame, date_filtered: bool, weighted: bool) -> StoredMatchedMISView:
+        """
+        Close the files and build the view over them
+
+        Args:
+            columns: MIS column names (for the empty file when nothing matched)
+            df_campaigns: Per-campaign attribute table
+            date_filtered: Keep only pairs of rows within the date range
+            weighted: Keep attribution weights (fractional attribution)
+
+        Returns:
+            StoredMatchedMISView over the written records
+        """
+        pair_columns = ['row', 'campaign', 'weight'] if weighted else ['row', 'campaign']
+        records = 0
+
+        if self._rows_writer is None:
+            pd.DataFrame(columns=list(columns)).astype(TEXT_DTYPE).to_parquet(self._path("mis"), index=False)
+            pd.DataFrame({name: pd.Series(dtype=np.int64) for name in pair_columns}).to_parquet(
+                self._path("matches"), index=False
+            )
+        else:
+            self._rows_writer.close()
+            self._pairs_writer.close()
+
+            # Copy the pairs to the final match file batch by batch, dropping out-of-range rows if filtered
+            pairs_path = self._path("pairs")
+            pairs_schema = pq.read_schema(pairs_path)
+            with pq.ParquetWriter(self._path("matches"), pa.schema([pairs_schema.field(name) for name in pair_columns])) as writer:
+                for batch in pq.ParquetFile(pairs_path).iter_batches(batch_size=PAIR_BATCH_ROWS):
+                    if date_filtered:
+                        batch = batch.filter(batch.column('in_range'))
+                    table = pa.Table.from_batches([batch]).select(pair_columns)
+                    writer.write_table(table)
+                    records += table.num_rows
+            pairs_path.unlink()
+
+        df_campaigns.to_parquet(self._path("campaigns"), index=False)
+        return StoredMatchedMISView(self.directory, {'token': self.token, 'bank': self.label, 'records': records})
+
+
+class StreamingCampaignDataProcessor(CampaignDataProcessor):
+    """
+    Campaign processor for MIS files too large to load whole
+
+    Each chunk is normalized, date-checked, matched, attributed and bucketed
+    on its own; only per-campaign status counts (for all rows and for rows in
+    the identifiers date range) are kept and summed across chunks, so peak
+    memory follows the chunk size rather than the file size. Attribution
+    resolves each MIS row independently, so chunked counts equal a full load.
+    The date filter's whole-file fallbacks (no parseable dates, too few rows
+    in range) are applied to the merged counts at the end.
+
+    Matched rows can be written to disk as they are found (MatchedRecordWriter);
+    otherwise only the summary is kept. The upload is never held, so refresh()
+    has nothing to rerun: after identifiers sheet or config edits the file is
+    streamed again.
+    """
+
+    def process_campaign_stream(self, df_identifiers, chunks: Iterable[pd.DataFrame],
+                                matches_dir: Optional[str] = None, label: str = "MIS"):
+        """
+        Process campaign data from a stream of MIS chunks and generate summary
+
+        Args:
+            df_identifiers: DataFrame with campaign identifiers
+            chunks: MIS DataFrames in file order, all with the same columns
+            matches_dir: Directory to write matched MIS records to (None keeps only the summary)
+            label: Name of the upload for messages (e.g. the bank)
+
+        Returns:
+            Tuple of (summary_df, matched_mis_view)
+        """
+        self.df_mis_source = None
+        self._upload_token = uuid.uuid4().hex
+        self._columns = None
+        self.status_codes = None
+
+        match_mode = self.bank_config.get("match_mode", DEFAULT_MATCH_MODE)
+        if match_mode not in MATCH_STRATEGIES:
+            st.error(f"❌ Unknown match mode '{match_mode}' in bank configuration")
+            return None, None
+
+        attribution = self.bank_config.get("match_attribution", DEFAULT_MATCH_ATTRIBUTION)
+        if attribution not in MATCH_ATTRIBUTIONS:
+            st.error(f"❌ Unknown match attribution '{attribution}' in bank configuration")
+            return None, None
+
+        identifiers = self._get_identifiers(df_identifiers)
+        date_range = self._stream_date_range(df_identifiers)
+
+        # Partial aggregates: (campaign × status code) counts for all rows and for rows in the date range
+        code_counts = {
+            'all': np.zeros((len(identifiers), NUM_STATUS_CODES)),
+            'in_range': np.zeros((len(identifiers), NUM_STATUS_CODES))
+        }
+        row_counts = {'rows': 0, 'valid_dates': 0, 'in_range': 0}
+        writer = MatchedRecordWriter(matches_dir, label) if matches_dir else None
+        columns = None
+        keys = None
+        date_col = None
+
+        for df_chunk in chunks:
+            df_chunk = normalize_dataframe_columns(df_chunk).reset_index(drop=True)
+
+            if columns is None:
+                columns = list(df_chunk.columns)
+                self._columns = self._find_columns(df_chunk)
+                if not self._columns[0]:
+                    st.error(f"❌ {self.bank_config['identifier_column']} column not found in MIS file")
+                    return None, None
+                keys = self._secondary_keys(df_identifiers, df_chunk)
+                if keys is None:
+                    return None, None
+                self._match_keys = [key[1:] for key in keys]
+                if date_range is not None:
+                    date_col = find_date_column(df_chunk)
+                    if date_col is None:
+                        st.warning("⚠️ No date column found in MIS data, skipping date filtering. Processing all MIS records.")
+
+            match_matrix = self._match_chunk(df_chunk, identifiers, keys, match_mode).attribute(attribution, identifiers)
+            status_codes = self.codebook.encode(df_chunk, *self._columns[1:])
+
+            in_range = np.ones(len(df_chunk), dtype=bool)
+            if date_col is not None:
+                dates = parse_mis_dates(df_chunk[date_col])
+                df_chunk[date_col] = dates  # Matched records carry parsed dates, as after a full load
+                in_range = (dates.notna() & (dates >= date_range[0]) & (dates <= date_range[1])).to_numpy()
+                row_counts['valid_dates'] += int(dates.notna().sum())
+
+            code_counts['all'] += match_matrix.count_codes(status_codes, NUM_STATUS_CODES)
+            kept = in_range[match_matrix.indices]
+            code_counts['in_range'] += MatchMatrix(
+                match_matrix.campaign_positions[kept], match_matrix.indices[kept],
+                match_matrix.num_campaigns, match_matrix.num_rows, match_matrix.data[kept]
+            ).count_codes(status_codes, NUM_STATUS_CODES)
+            row_counts['rows'] += len(df_chunk)
+            row_counts['in_range'] += int(in_range.sum())
+
+            if writer is not None:
+                writer.write(df_chunk, match_matrix, in_range)
+
+        if row_counts['rows'] == 0:
+            st.warning("⚠️ No MIS data found within the identifiers date range")
+            return None, None
+
+        date_filtered = date_col is not None and self._keep_date_filter(date_col, date_range, row_counts)
+        totals = code_counts['in_range'] if date_filtered else code_counts['all']
+
+        self._warn_missing_ipa_column(pd.DataFrame(columns=columns), *self._columns[2:], totals.sum())
+        buckets = bucket_counts(totals)
+        counts = {
+            'applications': totals.sum(axis=1),
+            'card_out': buckets['card_out'],
+            'declined': buckets['declined'],
+            'ipa_approved': buckets['ipa_approved']
+        }
+        if attribution != "fractional":
+            counts = {name: values.astype(np.int64) for name, values in counts.items()}
+
+        channel_costs = self._channel_costs(df_identifiers)
+        self.df_summary = self._build_summary(df_identifiers, identifiers, counts, channel_costs)
+
+        df_campaigns = self._campaign_attributes(df_identifiers, identifiers)
+        if writer is not None:
+            self.df_matched_mis = writer.finish(columns, df_campaigns, date_filtered, attribution == "fractional")
+        else:
+            self.df_matched_mis = MatchedMISView(
+                pd.DataFrame(columns=columns), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), df_campaigns
+            )
+        return self.df_summary, self.df_matched_mis
+
+    def _match_chunk(self, df_chunk, identifiers, keys, match_mode) -> MatchMatrix:
+        """
+        Match all identifier rows against one chunk, applying the composite keys
+        """
+        campaign_positions, mis_positions = self._match_pairs(identifiers, df_chunk[self._columns[0]], match_mode)
+        for key_values, key_mis_col, key_mode, blank_matches_any in keys:
+            campaign_positions, mis_positions = filter_pairs_by_key(
+                campaign_positions, mis_positions, key_values, df_chunk[key_mis_col], key_mode, blank_matches_any
+            )
+        return MatchMatrix(campaign_positions, mis_positions, len(identifiers), len(df_chunk))
+
+    def _stream_date_range(self, df_identifiers):
+        """
+        Get the identifiers date range to filter MIS rows by, or None to keep every row
+        """
+        if self.bank_config.get("skip_mis_date_filter", False):
+            return None
+
+        if 'Date' not in df_identifiers.columns:
+            st.warning("⚠️ No Date column found in identifiers, skipping date filtering")
+            return None
+
+        date_range = self._identifier_date_range(df_identifiers)
+        if date_range is None:
+            st.warning("⚠️ No valid dates found in identifiers, skipping date filtering")
+            return None
+
+        st.info(f"📅 Filtering MIS data from {date_range[0].strftime('%d-%m-%Y')} to {date_range[1].strftime('%d-%m-%Y')}")
+        return date_range
+
+    def _keep_date_filter(self, date_col, date_range, row_counts) -> bool:
+        """
+        Decide on the whole file whether the date filter applies (same fallbacks as a full load)
+        """
+        if row_counts['valid_dates'] == 0:
+            st.warning(f"⚠️ Could not parse dates in column '{date_col}'. Processing all MIS records.")
+            return False
+
+        original_count = row_counts['rows']
+        filtered_count = row_counts['in_range']
+
+        # If we filtered out too many records (>95%), warn and use all data
+        if filtered_count < original_count * 0.05 and filtered_count < 100:
+            st.warning(f"⚠️ Date filtering removed {original_count - filtered_count:,} records. This may indicate a date format mismatch. Processing all MIS records.")
+            st.info(f"📊 Date range in identifiers: {date_range[0].strftime('%d-%m-%Y')} to {date_range[1].strftime('%d-%m-%Y')}")
+            return False
+
+        st.success(f"✅ Filtered {filtered_count:,} records out of {original_count:,} from MIS data based on identifier dates")
+        return True
+
+
+def process_mis_stream(uploaded_file, df_identifiers, bank_config, label: str = "MIS",
+                       chunk_rows: int = STREAMING_CHUNK_ROWS, matches_dir: Optional[str] = STREAMED_MATCHES_DIR):
+    """
+    Process a large CSV or .xlsb MIS upload as a stream of chunks
+
+    Args:
+        uploaded_file: File object of the CSV or workbook
+        df_identifiers: DataFrame with campaign identifiers
+        bank_config: Bank-specific configuration dictionary
+        label: Name of the upload for messages (e.g. the bank)
+        chunk_rows: Rows per chunk
+        matches_dir: Directory to write matched MIS records to (None keeps only the summary)
+
+    Returns:
+        Tuple of (StreamingCampaignDataProcessor, summary_df, matched_mis_view)
+    """
+    uploaded_file.seek(0)
+    processor = StreamingCampaignDataProcessor(bank_config)
+    select_columns = mis_column_selector(bank_config)
+    if uploaded_file.name.lower().endswith('.xlsb'):
+        chunks = iter_mis_xlsb_chunks(
+            uploaded_file, chunk_rows, sheet_name=bank_config.get('sheet_name', 0),
+            select_columns=select_columns, header_keywords=bank_config["identifier_column"]
+        )
+    else:
+        chunks = iter_mis_csv_chunks(uploaded_file, chunk_rows, select_columns=select_columns)
+    df_summary, matched_view = processor.process_campaign_stream(df_identifiers, chunks, matches_dir, label)
+    return processor, df_summary, matched_view
@@ -0,0 +1,68 @@
+"""
+Parity checks for the vectorized campaign metrics
+
+The reference is the per-campaign calculate_metrics the dashboard used before
+it was vectorized, fed the same types it got then: float sheet values, a
+Python int application count and NumPy integer IPA and card out counts
+(Scapia's card-issued rule counted IPA with len(), a Python int).
+"""
+
+import numpy as np
+import pytest
+
+from utils.helpers import calculate_metrics, round_array
+
+
+def per_campaign_metrics(delivered, clicks, read_count, cost_per_unit, applications,
+                         ipa_approved, card_out):
+    """
+    Metrics of one campaign exactly as the per-campaign loop computed them
+    """
+    metrics = {}
+    metrics['ctr'] = round((clicks / delivered * 100), 2) if delivered > 0 else 0
+    metrics['read_rate'] = round((read_count / delivered * 100), 2) if delivered > 0 else 0
+    metrics['total_cost'] = round(delivered * cost_per_unit, 2)
+    metrics['cpc'] = round((metrics['total_cost'] / clicks), 2) if clicks > 0 else 0
+    metrics['cost_per_app'] = round((metrics['total_cost'] / applications), 2) if applications > 0 else 0
+    metrics['cost_per_ipa'] = round((metrics['total_cost'] / ipa_approved), 2) if ipa_approved > 0 else 0
+    metrics['cost_per_card'] = round((metrics['total_cost'] / card_out), 2) if card_out > 0 else 0
+    metrics['app_to_ipa_rate'] = round((ipa_approved / applications * 100), 2) if applications > 0 else 0
+    metrics['ipa_to_card_rate'] = round((card_out / ipa_approved * 100), 2) if ipa_approved > 0 else 0
+    metrics['app_to_card_rate'] = round((card_out / applications * 100), 2) if applications > 0 else 0
+    return metrics
+
+
+@pytest.mark.parametrize("python_int_ipa", [False, True], ids=["status_counts", "card_issued_rule"])
+@pytest.mark.parametrize("seed", range(3))
+def test_metrics_match_per_campaign_rounding(seed, python_int_ipa):
+    rng = np.random.default_rng(seed)
+    num_campaigns = 50_000
+    delivered = rng.integers(0, 10_000, num_campaigns).astype(float)
+    clicks = rng.integers(0, 500, num_campaigns).astype(float)
+    read_count = rng.integers(0, 2_000, num_campaigns).astype(float)
+    cost_per_unit = rng.choice([0.10, 0.085, 0.115, 0.80, 0.05], num_campaigns)
+    applications = rng.integers(0, 300, num_campaigns)
+    ipa_approved = rng.integers(0, 100, num_campaigns)
+    card_out = rng.integers(0, 50, num_campaigns)
+
+    # 629 * 0.085 rounds to 53.47 with round() but to 53.46 with np.round
+    delivered[0], cost_per_unit[0] = 629.0, 0.085
+
+    metrics = calculate_metrics(
+        delivered, clicks, read_count, cost_per_unit, applications, ipa_approved, card_out,
+        ipa_round=round_array if python_int_ipa else np.round
+    )
+
+    for i in range(num_campaigns):
+        expected = per_campaign_metrics(
+            float(delivered[i]), float(clicks[i]), float(read_count[i]), float(cost_per_unit[i]),
+            int(applications[i]), int(ipa_approved[i]) if python_int_ipa else ipa_approved[i], card_out[i]
+        )
+        for name, value in expected.items():
+            assert metrics[name][i] == value, (name, i, metrics[name][i], value)
+
+
+def test_scalar_metrics_are_floats():
+    metrics = calculate_metrics(629, 5, 1, 0.085, 3, np.int64(2), np.int64(1))
+    assert metrics['total_cost'] == 53.47
+    assert all(isinstance(value, float) for value in metrics.values())
@@ -7,14 +7,18 @@ from .helpers import (
     normalize_dataframe_columns,
     load_google_sheet,
     load_excel_file,
+    read_mis_file,
     format_currency,
     format_percentage,
     format_number,
     safe_division,
-    create_date_filters,
-    get_status_counts
+    safe_division_array,
+    round_array,
+    create_date_filters
 )
 
+from .workbook import WorkbookProbe
+
 from .image_handler import (
     get_extrape_logo,
     get_bank_logo,
@@ -28,12 +32,15 @@ __all__ = [
     'normalize_dataframe_columns',
     'load_google_sheet',
     'load_excel_file',
+    'read_mis_file',
     'format_currency',
     'format_percentage',
     'format_number',
     'safe_division',
+    'safe_division_array',
+    'round_array',
     'create_date_filters',
-    'get_status_counts',
+    'WorkbookProbe',
     'get_extrape_logo',
     'get_bank_logo',
     'get_all_bank_logos'
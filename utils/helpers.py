@@ -3,10 +3,39 @@ Helper utility functions for campaign dashboard
 Contains reusable functions for data manipulation and calculations
 """
 
+import importlib.util
+import zipfile
+import numpy as np
 import pandas as pd
 import streamlit as st
-from config.bank_config import CAMPAIGN_COSTS
-from typing import Optional, Union, List, Dict, Any
+from config.bank_config import CAMPAIGN_COSTS, CATEGORY_MAX_UNIQUE_RATIO, EXCEL_READER
+from typing import Optional, Union, List, Dict, Any, Iterable, Callable
+
+# Arrow-backed strings that keep NaN for missing values, like the object columns they replace
+try:
+    TEXT_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+except TypeError:  # pandas < 2.3
+    TEXT_DTYPE = pd.StringDtype("pyarrow")
+
+# Whole-number floats below this are exact in float32
+FLOAT32_EXACT_LIMIT = 2 ** 24
+
+# Per-format Excel engines used when calamine is not available
+EXCEL_ENGINES = {'xls': 'xlrd', 'xlsb': 'pyxlsb'}  # Anything else (xlsx, xlsm) is read with openpyxl
+
+# pandas reads every Excel format through calamine from 2.2 when python-calamine is installed
+CALAMINE_AVAILABLE = (
+    importlib.util.find_spec("python_calamine") is not None
+    and tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+)
+
+# Common date column names in MIS files (the first column containing any of them is the MIS date)
+MIS_DATE_COLUMN_PATTERNS = [
+    'date', 'application_date', 'app_date', 'created_date',
+    'submission_date', 'lead_date', 'application date',
+    'created date', 'app date', 'lead date', 'timestamp',
+    'created_at', 'application_timestamp', 'login date'
+]
 
 
 def find_column(df, keywords):
@@ -43,6 +72,24 @@ def find_column(df, keywords):
     return None
 
 
+def find_date_column(df):
+    """
+    Find the MIS date column: the first column whose name contains a MIS_DATE_COLUMN_PATTERNS entry
+
+    Args:
+        df: DataFrame to search
+
+    Returns:
+        Column name if found, None otherwise
+    """
+    for col in df.columns:
+        col_lower = str(col).lower().strip()
+        for pattern in MIS_DATE_COLUMN_PATTERNS:
+            if pattern in col_lower:
+                return col
+    return None
+
+
 @st.cache_data
 def get_channel_cost(channel: str, costs_dict: Optional[Dict[str, float]] = None) -> float:
     """
@@ -74,9 +121,12 @@ def get_channel_cost(channel: str, costs_dict: Optional[Dict[str, float]] = None
 
 
 def calculate_metrics(delivered, clicks, read_count, cost_per_unit, applications,
-                      ipa_approved, card_out):
+                      ipa_approved, card_out, ipa_round=np.round):
     """
-    Calculate campaign performance metrics
+    Calculate campaign performance metrics (vectorized)
+
+    All arguments may be scalars or equal-length arrays (one value per campaign),
+    so the metrics for every campaign are computed in a single pass.
 
     Args:
         delivered: Number of messages delivered
@@ -86,28 +136,40 @@ def calculate_metrics(delivered, clicks, read_count, cost_per_unit, applications
         applications: Number of applications
         ipa_approved: IPA approved count
         card_out: Card out count
+        ipa_round: Rounding of Cost per IPA and the application to IPA rate (round_array
+            where IPA counts used to be Python ints rather than NumPy integers)
 
     Returns:
-        Dictionary of calculated metrics
+        Dictionary of calculated metrics (floats for scalar inputs, arrays otherwise)
     """
+    delivered = np.asarray(delivered, dtype=float)
+    clicks = np.asarray(clicks, dtype=float)
+    read_count = np.asarray(read_count, dtype=float)
+    applications = np.asarray(applications, dtype=float)
+    ipa_approved = np.asarray(ipa_approved, dtype=float)
+    card_out = np.asarray(card_out, dtype=float)
+
     metrics = {}
 
     # CTR and Read Rate
-    metrics['ctr'] = round((clicks / delivered * 100), 2) if delivered > 0 else 0
-    metrics['read_rate'] = round((read_count / delivered * 100), 2) if delivered > 0 else 0
+    metrics['ctr'] = round_array(safe_division_array(clicks, delivered) * 100, 2)
+    metrics['read_rate'] = round_array(safe_division_array(read_count, delivered) * 100, 2)
 
     # Cost metrics
-    metrics['total_cost'] = round(delivered * cost_per_unit, 2)
-    metrics['cpc'] = round((metrics['total_cost'] / clicks), 2) if clicks > 0 else 0
-    metrics['cost_per_app'] = round((metrics['total_cost'] / applications), 2) if applications > 0 else 0
-    metrics['cost_per_ipa'] = round((metrics['total_cost'] / ipa_approved), 2) if ipa_approved > 0 else 0
-    metrics['cost_per_card'] = round((metrics['total_cost'] / card_out), 2) if card_out > 0 else 0
+    metrics['total_cost'] = round_array(delivered * np.asarray(cost_per_unit, dtype=float), 2)
+    metrics['cpc'] = round_array(safe_division_array(metrics['total_cost'], clicks), 2)
+    metrics['cost_per_app'] = round_array(safe_division_array(metrics['total_cost'], applications), 2)
+    # IPA and card out counts were NumPy integers, so these were rounded with np.round
+    metrics['cost_per_ipa'] = ipa_round(safe_division_array(metrics['total_cost'], ipa_approved), 2)
+    metrics['cost_per_card'] = np.round(safe_division_array(metrics['total_cost'], card_out), 2)
 
     # Conversion rates
-    metrics['app_to_ipa_rate'] = round((ipa_approved / applications * 100), 2) if applications > 0 else 0
-    metrics['ipa_to_card_rate'] = round((card_out / ipa_approved * 100), 2) if ipa_approved > 0 else 0
-    metrics['app_to_card_rate'] = round((card_out / applications * 100), 2) if applications > 0 else 0
+    metrics['app_to_ipa_rate'] = ipa_round(safe_division_array(ipa_approved, applications) * 100, 2)
+    metrics['ipa_to_card_rate'] = np.round(safe_division_array(card_out, ipa_approved) * 100, 2)
+    metrics['app_to_card_rate'] = np.round(safe_division_array(card_out, applications) * 100, 2)
 
+    if delivered.ndim == 0:
+        return {name: float(value) for name, value in metrics.items()}
     return metrics
 
 
@@ -137,6 +199,60 @@ def normalize_dataframe_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def compact_dtypes(df: pd.DataFrame, category_columns: Optional[Iterable[str]] = None,
+                   downcast: bool = True) -> pd.DataFrame:
+    """
+    Convert a DataFrame to compact dtypes for holding in the session
+
+    Text columns become Arrow-backed strings, or categoricals when few of their
+    values are distinct (status columns), and numeric columns the smallest
+    dtype that holds their values exactly. Mixed Excel columns (numbers and
+    text) are held as text.
+
+    Args:
+        df: DataFrame to convert
+        category_columns: Text columns to hold as categoricals (None to pick them by cardinality)
+        downcast: Downcast integer and whole-number float columns
+
+    Returns:
+        DataFrame with compact dtypes (unconverted columns are shared with df)
+    """
+    df = df.copy(deep=False)
+    category_columns = None if category_columns is None else set(category_columns)
+
+    for position, column in enumerate(df.columns):
+        values = df.iloc[:, position]
+
+        if pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+            inferred = pd.api.types.infer_dtype(values, skipna=True)
+            if inferred.startswith("mixed"):
+                values = values.where(values.isna(), values.astype(str))
+            elif inferred not in ("string", "empty"):
+                continue  # Dates, decimals and other Python objects stay as they are
+
+            if category_columns is None:
+                as_category = values.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(values)
+            else:
+                as_category = column in category_columns
+            values = values.astype(TEXT_DTYPE)
+            df.isetitem(position, values.astype("category") if as_category else values)
+
+        elif downcast and pd.api.types.is_integer_dtype(values.dtype):
+            df.isetitem(position, pd.to_numeric(values, downcast="integer"))
+
+        elif downcast and pd.api.types.is_float_dtype(values.dtype) and values.dtype.itemsize > 4:
+            present = values.dropna()
+            if ((present % 1) == 0).all() and (len(present) == 0 or present.abs().max() < FLOAT32_EXACT_LIMIT):
+                df.isetitem(position, values.astype(np.float32))
+
+    return df
+
+
+def memory_usage_bytes(df: pd.DataFrame) -> int:
+    """Deep memory usage of a DataFrame in bytes (text values included)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_google_sheet(url: str) -> Optional[pd.DataFrame]:
     """
@@ -157,36 +273,231 @@ def load_google_sheet(url: str) -> Optional[pd.DataFrame]:
         return None
 
 
-def load_excel_file(file, sheet_name=0):
+def excel_engine(file_extension: str, reader: str = EXCEL_READER) -> str:
     """
-    Load Excel or CSV file with automatic format detection
+    Choose the pandas Excel engine for a file
 
     Args:
-        file: File object
+        file_extension: Lowercase file extension without the dot
+        reader: "auto" (calamine when installed) or "default" (per-format engines)
+
+    Returns:
+        Engine name for pd.read_excel / pd.ExcelFile
+    """
+    if reader == "auto" and CALAMINE_AVAILABLE:
+        return 'calamine'
+    return EXCEL_ENGINES.get(file_extension, 'openpyxl')
+
+
+def _selected_positions(header: pd.Index, select_columns: Callable[[List], List]) -> List[int]:
+    """Positions of the header columns picked by a column selector"""
+    selected = set(select_columns(list(header)))
+    return [position for position, col in enumerate(header) if col in selected]
+
+
+def read_mis_file(
+    file, sheet_name=0, select_columns: Optional[Callable[[List], List]] = None, reader: str = EXCEL_READER,
+    header_keywords=None
+) -> pd.DataFrame:
+    """
+    Read an Excel or CSV file, choosing the engine from the file extension (see excel_engine)
+
+    Workbooks are probed first (see WorkbookProbe): the sheet is matched to
+    sheet_name and the header row located from the first rows, so a missing
+    sheet or column fails before the expensive parse.
+
+    With a column selector, the header row is read first and only the
+    selected columns are parsed; they keep the names a full read gives them
+    (duplicate headers included, e.g. "Disposition.1").
+
+    Args:
+        file: File object with a name attribute
         sheet_name: Sheet name or index (only for Excel files)
+        select_columns: Optional function picking the columns to parse from the header's column names
+        reader: Excel reader selection, "auto" or "default" (see EXCEL_READER)
+        header_keywords: Keywords of a column the workbook header row must contain (None to use the first row)
 
     Returns:
-        DataFrame or None if error
+        DataFrame
+
+    Raises:
+        Exception: Whatever the underlying reader raises
     """
-    try:
-        file_extension = file.name.split('.')[-1].lower()
+    file_extension = file.name.split('.')[-1].lower()
 
-        # Handle CSV files
-        if file_extension == 'csv':
+    # Handle CSV files
+    if file_extension == 'csv':
+        if select_columns is None:
             df = pd.read_csv(file)
-            df.columns = df.columns.str.strip()
-            return df
-
-        # Handle Excel files
-        if file_extension == 'xls':
-            engine = 'xlrd'
-        elif file_extension == 'xlsb':
-            engine = 'pyxlsb'
         else:
-            engine = 'openpyxl'
-
-        df = pd.read_excel(file, sheet_name=sheet_name, engine=engine)
+            header = pd.read_csv(file, nrows=0).columns
+            file.seek(0)
+            positions = _selected_positions(header, select_columns)
+            df = pd.read_csv(file, usecols=positions)
+            df.columns = header[positions]
+        df.columns = df.columns.str.strip()
         return df
+
+    # Handle Excel files: find the sheet and header row from the first rows before parsing the sheet
+    from utils.workbook import WorkbookProbe
+
+    with WorkbookProbe(file, file_extension) as probe:
+        sheet_name, header_row = probe.resolve_sheet(sheet_name, header_keywords)
+    file.seek(0)
+
+    engine = excel_engine(file_extension, reader)
+    if select_columns is None:
+        return pd.read_excel(file, sheet_name=sheet_name, header=header_row, engine=engine)
+
+    # Open the workbook once for both the header row and the selected columns
+    with pd.ExcelFile(file, engine=engine) as workbook:
+        header = workbook.parse(sheet_name, header=header_row, nrows=0).columns
+        positions = _selected_positions(header, select_columns)
+        df = workbook.parse(sheet_name, header=header_row, usecols=positions)
+    df.columns = header[positions]
+    return df
+
+
+def iter_mis_csv_chunks(
+    file, chunk_rows: int, select_columns: Optional[Callable[[List], List]] = None
+) -> Iterable[pd.DataFrame]:
+    """
+    Read a CSV MIS file as a stream of DataFrames of at most chunk_rows rows
+
+    Args:
+        file: File object of the CSV
+        chunk_rows: Rows per chunk
+        select_columns: Optional function picking the columns to parse from the header's column names
+
+    Yields:
+        DataFrames with the columns (and names) read_mis_file would give
+    """
+    header = None
+    positions = None
+    if select_columns is not None:
+        header = pd.read_csv(file, nrows=0).columns
+        file.seek(0)
+        positions = _selected_positions(header, select_columns)
+
+    with pd.read_csv(file, chunksize=chunk_rows, usecols=positions) as reader:
+        for chunk in reader:
+            if positions is not None:
+                chunk.columns = header[positions]
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+
+
+def iter_mis_xlsb_chunks(
+    file, chunk_rows: int, sheet_name=0, select_columns: Optional[Callable[[List], List]] = None,
+    header_keywords=None
+) -> Iterable[pd.DataFrame]:
+    """
+    Read the MIS sheet of an .xlsb workbook as a stream of DataFrames of at most chunk_rows rows
+
+    Sheet rows come from pyxlsb's row iterator, as in read_excel, streamed
+    out of the zip archive (see open_xlsb_sheet), and only the cells of the
+    selected columns are kept, so neither the unpacked sheet nor an object
+    frame of every column is held. Each chunk is typed by pandas' TextParser,
+    the step read_excel ends with, so chunks hold the values read_mis_file
+    would give (dates stay Excel serial numbers, since .xlsb cells do not
+    mark dates).
+    Without a column selector every column of the sheet's recorded used range
+    is kept: columns right of the header that are blank in every row come
+    out all-NaN, where read_excel drops them.
+
+    Args:
+        file: Binary file object of the workbook
+        chunk_rows: Rows per chunk
+        sheet_name: Sheet name or index (matched like read_mis_file)
+        select_columns: Optional function picking the columns to parse from the header's column names
+        header_keywords: Keywords of a column the header row must contain (None to use the first row)
+
+    Yields:
+        DataFrames with the columns (and names) read_mis_file would give
+    """
+    import pyxlsb
+    from pandas.io.parsers import TextParser
+    from utils.workbook import WorkbookProbe, open_xlsb_sheet
+
+    with WorkbookProbe(file, 'xlsb') as probe:
+        sheet_name, header_row = probe.resolve_sheet(sheet_name, header_keywords)
+        probed_rows = probe.head(sheet_name)
+    file.seek(0)
+
+    # Header names as read_excel makes them ("Unnamed: 3", "Disposition.1"): rows up to the
+    # first non-blank one at or after the header row, trimmed and padded to a common width.
+    # Probed rows span the sheet's used range, so cells right of the header get "Unnamed" names
+    sheet_width = max((len(row) for row in probed_rows), default=0)
+    head = []
+    for row in probed_rows:
+        row = [_xlsb_value(value) for value in row]
+        while row and row[-1] == "":
+            row.pop()
+        head.append(row)
+        if row and len(head) > header_row:
+            break
+    if not any(head):
+        return
+    header_width = max(len(row) for row in head)
+    width = sheet_width if select_columns is None else header_width
+    head = [row + [""] * (width - len(row)) for row in head]
+    header = TextParser(head, header=header_row).read().columns
+
+    positions = list(range(len(header))) if select_columns is None else _selected_positions(header, select_columns)
+    columns = header[positions]
+
+    def typed_chunk(rows):
+        chunk = TextParser(rows, header=None, skip_blank_lines=False).read()
+        chunk.columns = columns
+        return chunk
+
+    rows = []
+    previous_row = header_row
+    archive = zipfile.ZipFile(file)
+    with pyxlsb.Workbook(fp=archive) as book, open_xlsb_sheet(archive, book, sheet_name) as sheet:
+        # Sparse rows skip rows without cells; each row is a list of cells as wide as the used range
+        for row in sheet.rows(sparse=True):
+            row_number = row[0].r
+            if row_number <= header_row or all(cell.v is None or cell.v == "" for cell in row):
+                continue  # Blank rows are kept only if data follows: read_excel drops trailing ones
+
+            rows.extend([""] * len(positions) for _ in range(row_number - previous_row - 1))
+            previous_row = row_number
+            rows.append([_xlsb_value(row[position].v) for position in positions])
+            while len(rows) >= chunk_rows:
+                yield typed_chunk(rows[:chunk_rows])
+                rows = rows[chunk_rows:]
+
+    if rows:
+        yield typed_chunk(rows)
+
+
+def _xlsb_value(value):
+    """An .xlsb cell value as read_excel passes it on ("" for blanks, whole floats as int)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def load_excel_file(file, sheet_name=0, select_columns=None, header_keywords=None):
+    """
+    Load Excel or CSV file with automatic format detection
+
+    Args:
+        file: File object
+        sheet_name: Sheet name or index (only for Excel files)
+        select_columns: Optional function picking the columns to parse from the header's column names
+        header_keywords: Keywords of a column the workbook header row must contain
+
+    Returns:
+        DataFrame or None if error
+    """
+    try:
+        return read_mis_file(
+            file, sheet_name=sheet_name, select_columns=select_columns, header_keywords=header_keywords
+        )
     except Exception as e:
         st.error(f"❌ Error loading file: {e}")
         return None
@@ -228,6 +539,55 @@ def safe_division(numerator, denominator, default=0, decimals=2):
         return default
 
 
+def safe_division_array(numerator, denominator, default=0.0):
+    """
+    Element-wise division that returns a default where the denominator is not positive
+
+    Args:
+        numerator: Array (or scalar) to divide
+        denominator: Array (or scalar) to divide by
+        default: Value used where the denominator is zero, negative or NaN
+
+    Returns:
+        Float array with the division results
+    """
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    )
+    result = np.full(numerator.shape, default, dtype=float)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def round_array(values, decimals: int = 2):
+    """
+    Element-wise rounding with the results of Python's round()
+
+    np.round scales by 10**decimals before rounding, so values within an ulp
+    of a tie can round the other way (629 * 0.085 gives 53.46 where round()
+    gives 53.47). Those few values are rounded with round() itself.
+
+    Args:
+        values: Array (or scalar) to round
+        decimals: Number of decimal places
+
+    Returns:
+        Float array of rounded values
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 0:
+        return np.asarray(round(float(values), decimals))
+
+    rounded = np.round(values, decimals)
+    scaled = np.abs(values) * 10.0 ** decimals
+    with np.errstate(invalid='ignore'):  # inf and NaN are never near a tie
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(scaled)
+    if near_tie.any():
+        # float(): round() on a NumPy float is np.round again
+        rounded[near_tie] = [round(float(value), decimals) for value in values[near_tie]]
+    return rounded
+
+
 def create_date_filters(df, date_column, date_format=None):
     """
     Create date range filters for dashboard
@@ -265,23 +625,3 @@ def create_date_filters(df, date_column, date_format=None):
 
     return filters
 
-
-def get_status_counts(df, status_column, status_list):
-    """
-    Count occurrences of specific statuses
-
-    Args:
-        df: DataFrame
-        status_column: Column containing status
-        status_list: List of statuses to count
-
-    Returns:
-        Count of matching statuses
-    """
-    if status_column not in df.columns:
-        return 0
-
-    status_values = df[status_column].astype(str).str.strip().str.upper()
-    status_list_upper = [s.upper() for s in status_list]
-
-    return status_values.isin(status_list_upper).sum()
@@ -0,0 +1,247 @@
+"""
+Workbook probe module
+Lists the sheets of an uploaded workbook and finds the MIS sheet and header row
+from sheet metadata and the first rows only, before the full parse; also opens
+.xlsb sheets for streamed reading
+"""
+
+import difflib
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from utils.helpers import find_column
+
+# Rows scanned from the top of a sheet for the header row (title and blank rows above it are skipped)
+HEADER_SCAN_ROWS = 20
+
+# Minimum similarity for a sheet name to stand in for the configured one ("App details " for "App Details")
+SHEET_NAME_CUTOFF = 0.6
+
+# Read buffer of .xlsb sheets streamed out of the zip archive (pyxlsb reads records a few bytes at a time)
+XLSB_BUFFER_BYTES = 1024 ** 2
+
+
+class WorkbookProbe:
+    """
+    Sheet names, dimensions and leading rows of a workbook, read without loading its cells
+
+    .xlsx/.xlsm workbooks are opened in openpyxl's read-only mode and .xlsb
+    workbooks with pyxlsb (see open_xlsb_sheet), both streaming just the rows
+    asked for; .xls
+    workbooks are opened on demand with xlrd, which loads a sheet only when
+    it is looked at. Use as a context manager; the file position is left
+    wherever the probe stopped, so seek back before parsing.
+    """
+
+    def __init__(self, file, file_extension: str):
+        """
+        Open a workbook for probing
+
+        Args:
+            file: Binary file object of the workbook
+            file_extension: Lowercase file extension without the dot
+        """
+        self.file_extension = file_extension
+        self._head_rows: Dict[str, List[List]] = {}
+
+        if file_extension == 'xls':
+            import xlrd
+            self._book = xlrd.open_workbook(file_contents=file.read(), on_demand=True)
+            self.sheet_names = self._book.sheet_names()
+        elif file_extension == 'xlsb':
+            import pyxlsb
+            self._archive = zipfile.ZipFile(file)
+            self._book = pyxlsb.Workbook(fp=self._archive)
+            self.sheet_names = list(self._book.sheets)
+        else:
+            import openpyxl
+            self._book = openpyxl.load_workbook(file, read_only=True, data_only=True)
+            self.sheet_names = list(self._book.sheetnames)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the workbook"""
+        if self.file_extension == 'xls':
+            self._book.release_resources()
+        else:
+            self._book.close()
+
+    def dimensions(self, sheet: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get the size of a sheet as recorded in the workbook (not counted from its cells)
+
+        Args:
+            sheet: Sheet name
+
+        Returns:
+            Tuple of (rows, columns), None where the workbook does not record it
+        """
+        if self.file_extension == 'xls':
+            xls_sheet = self._book.sheet_by_name(sheet)
+            return xls_sheet.nrows, xls_sheet.ncols
+        if self.file_extension == 'xlsb':
+            with open_xlsb_sheet(self._archive, self._book, sheet) as xlsb_sheet:
+                dimension = xlsb_sheet.dimension
+            return (dimension.h, dimension.w) if dimension else (None, None)
+        worksheet = self._book[sheet]
+        return worksheet.max_row, worksheet.max_column
+
+    def head(self, sheet: str) -> List[List]:
+        """
+        Get the first HEADER_SCAN_ROWS rows of a sheet, blank rows included
+
+        Args:
+            sheet: Sheet name
+
+        Returns:
+            List of rows (lists of cell values)
+        """
+        if sheet not in self._head_rows:
+            self._head_rows[sheet] = self._read_head(sheet)
+        return self._head_rows[sheet]
+
+    def _read_head(self, sheet: str) -> List[List]:
+        if self.file_extension == 'xls':
+            xls_sheet = self._book.sheet_by_name(sheet)
+            return [xls_sheet.row_values(row) for row in range(min(xls_sheet.nrows, HEADER_SCAN_ROWS))]
+
+        rows = []
+        if self.file_extension == 'xlsb':
+            with open_xlsb_sheet(self._archive, self._book, sheet) as xlsb_sheet:
+                for row in xlsb_sheet.rows(sparse=False):
+                    rows.append([cell.v for cell in row])
+                    if len(rows) == HEADER_SCAN_ROWS:
+                        break
+            return rows
+
+        for row in self._book[sheet].iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True):
+            rows.append(list(row))
+        return rows
+
+    def summary(self) -> str:
+        """Describe the sheets of the workbook for error messages, e.g. 'Dump' (5,000 x 40)"""
+        described = []
+        for sheet in self.sheet_names:
+            num_rows, num_columns = self.dimensions(sheet)
+            size = f" ({num_rows:,} x {num_columns:,})" if num_rows is not None and num_columns is not None else ""
+            described.append(f"'{sheet}'{size}")
+        return ", ".join(described)
+
+    def find_header_row(self, sheet: str, keywords) -> Optional[int]:
+        """
+        Find the header row of a sheet: the first scanned row naming a column that matches the keywords
+
+        Args:
+            sheet: Sheet name
+            keywords: String or list of keywords, matched like find_column
+
+        Returns:
+            0-based sheet row index (pandas' header argument), or None if no scanned row matches
+        """
+        for position, row in enumerate(self.head(sheet)):
+            names = [str(value).strip() for value in row if value is not None and str(value).strip()]
+            if names and find_column(pd.DataFrame(columns=names), keywords) is not None:
+                return position
+        return None
+
+    def resolve_sheet(self, sheet_name: Union[str, int] = 0, header_keywords=None) -> Tuple[str, int]:
+        """
+        Pick the MIS sheet and its header row
+
+        A configured sheet name is matched exactly, then ignoring case and
+        surrounding spaces, then by close spelling; failing those, the first
+        sheet with a header row matching header_keywords is used.
+
+        Args:
+            sheet_name: Configured sheet name, or sheet index
+            header_keywords: Keywords of a column the header row must contain (None for the first row)
+
+        Returns:
+            Tuple of (sheet name, 0-based header row index)
+
+        Raises:
+            ValueError: If no sheet or header row matches; the message lists the workbook's sheets
+        """
+        if isinstance(sheet_name, int):
+            if not 0 <= sheet_name < len(self.sheet_names):
+                raise ValueError(f"Workbook has no sheet {sheet_name}; sheets: {self.summary()}")
+            sheet = self.sheet_names[sheet_name]
+        else:
+            sheet = self._match_sheet_name(sheet_name)
+            if sheet is None and header_keywords is not None:
+                sheet = next(
+                    (name for name in self.sheet_names if self.find_header_row(name, header_keywords) is not None),
+                    None
+                )
+            if sheet is None:
+                raise ValueError(f"Sheet '{sheet_name}' not found; sheets: {self.summary()}")
+
+        if header_keywords is None:
+            return sheet, 0
+
+        header_row = self.find_header_row(sheet, header_keywords)
+        if header_row is None:
+            raise ValueError(
+                f"Column '{header_keywords}' not found in the first {HEADER_SCAN_ROWS} rows of sheet '{sheet}'; "
+                f"sheets: {self.summary()}"
+            )
+        return sheet, header_row
+
+    def _match_sheet_name(self, sheet_name: str) -> Optional[str]:
+        """Find a sheet by exact, case-insensitive or close name"""
+        if sheet_name in self.sheet_names:
+            return sheet_name
+
+        normalized = {name.strip().casefold(): name for name in self.sheet_names}
+        wanted = sheet_name.strip().casefold()
+        if wanted in normalized:
+            return normalized[wanted]
+
+        close = difflib.get_close_matches(wanted, list(normalized), n=1, cutoff=SHEET_NAME_CUTOFF)
+        return normalized[close[0]] if close else None
+
+
+def open_xlsb_sheet(archive: zipfile.ZipFile, book, sheet_name: str):
+    """
+    Open a sheet of an .xlsb workbook as a pyxlsb Worksheet reading straight from the zip archive
+
+    pyxlsb's Workbook.get_sheet() copies the whole decompressed sheet into a
+    temporary file, through memory, before a record is read. The Worksheet
+    returned here reads the zip member itself instead, so records are
+    decompressed as pyxlsb reads them and only the rows iterated are unpacked.
+
+    Args:
+        archive: Zip archive of the workbook
+        book: pyxlsb Workbook opened on archive (for its shared strings)
+        sheet_name: Sheet name as listed by book.sheets
+
+    Returns:
+        pyxlsb Worksheet (use as a context manager)
+    """
+    from pyxlsb import BIFF12Reader, Worksheet, biff12
+
+    # Resolve the sheet's zip member the way get_sheet() does: workbook.bin names the relationship
+    with archive.open('xl/_rels/workbook.bin.rels') as part:
+        targets = {relation.attrib['Id']: relation.attrib['Target'] for relation in ET.parse(part).getroot()}
+    relation_ids = {}
+    with archive.open('xl/workbook.bin') as part:
+        for record_id, record in BIFF12Reader(fp=part):
+            if record_id == biff12.SHEET:
+                relation_ids[record.name] = record.rId
+            elif record_id == biff12.SHEETS_END:
+                break
+    if sheet_name not in relation_ids:
+        raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+
+    target = targets[relation_ids[sheet_name]].split('/')
+    part = io.BufferedReader(archive.open(f"xl/{target[0]}/{target[-1]}"), XLSB_BUFFER_BYTES)
+    return Worksheet(name=sheet_name, fp=part, stringtable=book.stringtable)